@@ -0,0 +1,33 @@
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from core.metrics import AUTHENTICATIONS, CACHE_LOOKUPS, inc
+from core.routers import read_from_primary
+from core.token_cache import cache_token, get_cached_token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication backed by core.token_cache.
+
+    A cache hit authenticates without the Token + Specialist query; misses fall back to the
+    usual lookup and cache the result. Inactive users and unknown keys are never cached.
+    """
+
+    def authenticate_credentials(self, key):
+        token = get_cached_token(key)
+        if token is not None:
+            inc(CACHE_LOOKUPS, 'token', 'hit')
+            inc(AUTHENTICATIONS, 'token', 'success')
+            return token.user, token
+        inc(CACHE_LOOKUPS, 'token', 'miss')
+        try:
+            # a token issued moments ago may not be replicated yet
+            with read_from_primary():
+                user, token = super().authenticate_credentials(key)
+        except AuthenticationFailed:
+            inc(AUTHENTICATIONS, 'token', 'failure')
+            raise
+        inc(AUTHENTICATIONS, 'token', 'success')
+        cache_token(token)
+        return user, token
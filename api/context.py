@@ -0,0 +1,57 @@
+from django.db.models import Exists, OuterRef
+
+from core.models import Offer, Project, Specialist
+from core.models.specialist import SpecialistOwnProject
+
+
+class RequestContext:
+    """
+    Rows and ownership facts one request is about, each loaded at most once.
+
+    Permissions, validators, mixins and views of the same request share the instance returned
+    by `get_request_context`, so checking and then using a project/recipient/offer doesn't
+    query it again.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._projects: dict[int, Project | None] = {}
+        self._specialists: dict[int, Specialist | None] = {}
+        self._offers: dict[int, Offer | None] = {}
+
+    def get_project(self, project_id: int) -> Project | None:
+        'Project annotated with `is_owned_by_user`: it is in own_projects of the request user'
+        if project_id not in self._projects:
+            user_ownership = SpecialistOwnProject.objects.filter(
+                specialist_id=self.user.pk, own_project_id=OuterRef('pk')
+            )
+            self._projects[project_id] = Project.objects \
+                .annotate(is_owned_by_user=Exists(user_ownership)) \
+                .filter(pk=project_id).first()
+        return self._projects[project_id]
+
+    def get_specialist(self, specialist_id: int) -> Specialist | None:
+        if specialist_id == self.user.pk:
+            return self.user
+        if specialist_id not in self._specialists:
+            self._specialists[specialist_id] = Specialist.objects.filter(pk=specialist_id).first()
+        return self._specialists[specialist_id]
+
+    def get_offer(self, offer_id: int) -> Offer | None:
+        'Offer with its sender, recipient and project'
+        if offer_id not in self._offers:
+            self._offers[offer_id] = Offer.objects \
+                .select_related('sender', 'recipient', 'project') \
+                .filter(pk=offer_id).first()
+        return self._offers[offer_id]
+
+    def user_owns_project(self, project_id: int) -> bool:
+        project = self.get_project(project_id)
+        return project is not None and project.is_owned_by_user
+
+
+def get_request_context(request) -> RequestContext:
+    context = getattr(request, 'ownership_context', None)
+    if context is None:
+        context = request.ownership_context = RequestContext(user=request.user)
+    return context
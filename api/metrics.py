@@ -0,0 +1,48 @@
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from api.urls import URL_PATTERN_NAME
+from core.metrics import REQUEST_DURATION, REQUEST_QUERIES, REQUESTS, RESPONSE_SIZE, inc, observe
+
+URL_NAMES = frozenset(value for name, value in vars(URL_PATTERN_NAME).items() if name.isupper())
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    'Latency, response size, query count and status of the requests to the named API urls'
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryCounter()
+        started_at = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            response = self.get_response(request)
+        duration = perf_counter() - started_at
+
+        url_name = request.resolver_match and request.resolver_match.url_name
+        if url_name in URL_NAMES:
+            method = request.method
+            observe(REQUEST_DURATION, duration, url_name, method)
+            observe(REQUEST_QUERIES, queries.count, url_name, method)
+            if not response.streaming:
+                observe(RESPONSE_SIZE, len(response.content), url_name, method)
+            inc(REQUESTS, url_name, method, str(response.status_code))
+        return response
@@ -1,19 +1,38 @@
+import hashlib
+from datetime import datetime
+from typing import Callable
+
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.exceptions import ValidationError
+from rest_framework.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED
+
+from api.context import get_request_context
 from api.serializers.offer import OfferCreationSerializer
-from api.validators import validate_offer_creation_data, validate_offer_response_data
-from core.models import Specialist, Project, Offer
-from core.models.choices import OfferType
+from api.validators import (
+    validate_choice,
+    validate_count_param,
+    validate_limit,
+    validate_offer_creation_data,
+    validate_offer_response_data,
+    validate_skill_param,
+)
+from core.catalog import get_catalog
+from core.leaderboard import EVERYONE, Scope, get_leaderboards
+from core.models import Offer
+from core.offers import accept_offer, respond_to_offer
 
 
 class OfferMixin:
     def create_offer(self, request, offer_type: str) -> dict:
-        validate_offer_creation_data(data=request.data)
+        context = get_request_context(request)
+        validate_offer_creation_data(data=request.data, context=context)
         self.check_object_permissions(request=request, obj=request.user)
-        recipient = Specialist.objects.get(pk=request.data['recipient_id'])
-        project = Project.objects.get(pk=request.data['project_id'])
         offer, _ = Offer.objects.get_or_create(
             sender=request.user,
-            recipient=recipient,
-            project=project,
+            recipient=context.get_specialist(request.data['recipient_id']),
+            project=context.get_project(request.data['project_id']),
             type=offer_type,
         )
         return OfferCreationSerializer(offer).data
@@ -23,36 +42,102 @@ class OfferMixin:
         self.check_object_permissions(request=request, obj=request.user)
         response = request.data['response']
 
-        successful_response_actions = {
-            OfferType.ADD_TO_TEAM: self._add_to_team,
-            OfferType.JOIN_TO_TEAM: self._join_to_team,
-            OfferType.GIVE_OWNERSHIP: self._give_ownership,
-            OfferType.GET_OWNERSHIP: self._get_ownership,
-        }
-
-        if response is False:
-            Offer.objects.filter(pk=offer_id).update(response=response)
+        offer = get_request_context(request).get_offer(offer_id)
+        if response:
+            answered = accept_offer(offer=offer)
         else:
-            offer = Offer.objects.get(pk=offer_id)
-            action = successful_response_actions[offer.type]
-            action(offer=offer)
-
-    def _add_to_team(self, offer: Offer):
-        offer.recipient.current_project = offer.project
-        offer.recipient.save()
-        offer.recipient.projects.add(offer.project)
-        offer.project.team.add(offer.recipient)
-
-    def _join_to_team(self, offer: Offer):
-        offer.sender.current_project = offer.project
-        offer.sender.save()
-        offer.sender.projects.add(offer.project)
-        offer.project.team.add(offer.sender)
-
-    def _give_ownership(self, offer: Offer):
-        offer.sender.own_projects.remove(offer.project)
-        offer.recipient.own_projects.add(offer.project)
-
-    def _get_ownership(self, offer: Offer):
-        offer.sender.own_projects.add(offer.project)
-        offer.recipient.own_projects.remove(offer.project)
+            answered = respond_to_offer(offer=offer, response=response)
+        if not answered:
+            raise ValidationError({"detail": f"offer with id {offer_id} is answered already"})
+
+
+class SkillsMixin:
+    """
+    Adding and deletion of languages/technologies by their names.
+
+    Names are resolved through the in-memory catalog and diffed against the current ids as sets,
+    so the query count doesn't depend on the payload size.
+    """
+
+    def add_skills(self, skills, names: list) -> None:
+        ids_for_adding = self._resolve_skill_ids(model=skills.model, names=names) \
+            - self._current_skill_ids(skills=skills)
+        if ids_for_adding:
+            skills.add(*ids_for_adding)
+
+    def remove_skills(self, skills, names: list) -> None:
+        ids_for_deletion = self._resolve_skill_ids(model=skills.model, names=names) \
+            & self._current_skill_ids(skills=skills)
+        if ids_for_deletion:
+            skills.remove(*ids_for_deletion)
+
+    def _resolve_skill_ids(self, model, names: list) -> set[int]:
+        return get_catalog().section(model).resolve(names)
+
+    def _current_skill_ids(self, skills) -> set[int]:
+        return set(skills.values_list('id', flat=True))
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET with strong ETags and Last-Modified.
+
+    Validators are derived from version data only (see core.versions), so a request whose
+    If-None-Match/If-Modified-Since still match gets 304 before anything is serialized.
+    """
+
+    def conditional_response(self, request, version_key: tuple, last_modified: datetime,
+                             build_response: Callable[[], HttpResponseBase]) -> HttpResponseBase:
+        etag = self.get_etag(request=request, version_key=version_key)
+        timestamp = int(last_modified.timestamp())
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = build_response()
+        if response.status_code in (HTTP_200_OK, HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(timestamp)
+            patch_vary_headers(response, ('Accept',))
+        return response
+
+    def get_etag(self, request, version_key: tuple) -> str:
+        representation = (*version_key, request.get_full_path(), request.accepted_media_type)
+        return quote_etag(hashlib.sha1(repr(representation).encode()).hexdigest())
+
+
+class LeaderboardMixin:
+    """
+    Rating leaderboards of core.leaderboard scoped by query params: the label param of the view
+    (direction or project type), a language and a technology name. Scopes combine, no scope
+    ranks everyone.
+    """
+    leaderboard_name: str
+    label_param: str
+    label_choices: list
+
+    def get_scopes(self, request) -> list[Scope]:
+        params = request.query_params
+        scopes = []
+        label = validate_choice(params.get(self.label_param), self.label_choices, self.label_param)
+        if label is not None:
+            scopes.append(('label', label))
+        for section, param in (('languages', 'language'), ('technologies', 'technology')):
+            skill_id = validate_skill_param(params.get(param), section, param)
+            if skill_id is not None:
+                scopes.append((section, skill_id))
+        return scopes or [EVERYONE]
+
+    def get_top(self, request) -> list[tuple[int, int, int]]:
+        'Page of (rank, entity_id, rating) selected by the limit and offset params'
+        scopes = self.get_scopes(request)
+        limit = validate_limit(request.query_params.get('limit'))
+        offset = validate_count_param(request.query_params.get('offset'), 'offset') or 0
+        leaderboards = get_leaderboards()
+        with leaderboards.lock:
+            return getattr(leaderboards, self.leaderboard_name).top(scopes, limit, offset)
+
+    def get_rank(self, request, entity_id: int) -> tuple[int, int] | None:
+        scopes = self.get_scopes(request)
+        leaderboards = get_leaderboards()
+        with leaderboards.lock:
+            return getattr(leaderboards, self.leaderboard_name).rank(entity_id, scopes)
@@ -0,0 +1,192 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from core.search import search
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a composite (field, id) key, rating by default.
+
+    Every page is fetched with a `WHERE key > last_key ORDER BY key LIMIT n` query, so deep
+    pages cost the same as the first one. The cursor is an opaque token that carries the
+    ordering and the key of the last row on the page: its id and the value of the first field
+    of the ordering, unless that field is the id.
+    """
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    page_size_query_param = 'page_size'
+    page_size = 50
+    max_page_size = 100
+
+    ORDERINGS = {
+        'id': ('id',),
+        '-id': ('-id',),
+        'rating': ('rating', 'id'),
+        '-rating': ('-rating', '-id'),
+    }
+    default_ordering = 'id'
+
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None) -> list:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        self.ordering = cursor['o'] if cursor else self.get_ordering(request)
+
+        queryset = queryset.order_by(*self.ORDERINGS[self.ordering])
+        if cursor:
+            queryset = queryset.filter(self._position_filter(cursor))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(data=OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_page_size(self, request) -> int:
+        page_size = request.query_params.get(self.page_size_query_param)
+        if page_size is None:
+            return self.page_size
+        if not page_size.isdigit() or int(page_size) < 1:
+            raise ValidationError({
+                "detail": f"invalid param {self.page_size_query_param}, it must be positive int"
+            })
+        return min(int(page_size), self.max_page_size)
+
+    def get_ordering(self, request) -> str:
+        ordering = request.query_params.get(self.ordering_query_param, self.default_ordering)
+        if ordering not in self.ORDERINGS:
+            raise ValidationError({
+                "detail": f"invalid param {self.ordering_query_param}, "
+                          f"it must be one of {tuple(self.ORDERINGS)}"
+            })
+        return ordering
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        cursor = self.encode_cursor(self.get_next_position())
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.ordering_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def encode_cursor(self, position: dict) -> str:
+        raw = json.dumps(position, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, request) -> dict | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            position = json.loads(raw)
+        except (binascii.Error, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, dict) or not self.is_valid_position(position):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def get_next_position(self) -> dict:
+        last = self.page[-1]
+        position = {'o': self.ordering, 'i': last['id'] if isinstance(last, dict) else last.id}
+        key_field = self.get_key_field(self.ordering)
+        if key_field is not None:
+            position['k'] = last[key_field] if isinstance(last, dict) else getattr(last, key_field)
+        return position
+
+    def is_valid_position(self, position: dict) -> bool:
+        if position.get('o') not in self.ORDERINGS or type(position.get('i')) is not int:
+            return False
+        return self.get_key_field(position['o']) is None or type(position.get('k')) is int
+
+    @classmethod
+    def get_key_columns(cls) -> tuple[str, ...]:
+        'Columns of every ordering, rows of `.values()` querysets have to include them'
+        return tuple(dict.fromkeys(
+            field.lstrip('-') for fields in cls.ORDERINGS.values() for field in fields
+        ))
+
+    def get_key_field(self, ordering: str) -> str | None:
+        'Field ordering rows before the id, None for orderings by id only'
+        fields = self.ORDERINGS[ordering]
+        return fields[0].lstrip('-') if len(fields) > 1 else None
+
+    def _position_filter(self, cursor: dict) -> Q:
+        lookup = 'lt' if cursor['o'].startswith('-') else 'gt'
+        key_field = self.get_key_field(cursor['o'])
+        if key_field is None:
+            return Q(**{f'id__{lookup}': cursor['i']})
+        return Q(**{f'{key_field}__{lookup}': cursor['k']}) \
+            | Q(**{key_field: cursor['k'], f'id__{lookup}': cursor['i']})
+
+
+class ProjectsKeysetPagination(KeysetPagination):
+    'Keyset pagination of projects, which can be ordered by team size as well'
+    ORDERINGS = {
+        **KeysetPagination.ORDERINGS,
+        'team_count': ('team_count', 'id'),
+        '-team_count': ('-team_count', '-id'),
+    }
+
+
+class SpecialistsKeysetPagination(KeysetPagination):
+    'Keyset pagination of specialists, which can be ordered by the number of owned projects'
+    ORDERINGS = {
+        **KeysetPagination.ORDERINGS,
+        'own_projects_count': ('own_projects_count', 'id'),
+        '-own_projects_count': ('-own_projects_count', '-id'),
+    }
+
+
+class IdKeysetPagination(KeysetPagination):
+    'Keyset pagination over id only, newest rows first by default'
+    ORDERINGS = {
+        '-id': ('-id',),
+        'id': ('id',),
+    }
+    default_ordering = '-id'
+
+
+class SearchPagination(KeysetPagination):
+    'Keyset pagination over the (rank, id) order of full-text search results'
+
+    def paginate_search(self, index_name: str, query: str, filters: dict, request) -> list[int]:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        rows = search(
+            index_name=index_name,
+            query=query,
+            filters=filters,
+            limit=self.page_size + 1,
+            after=(cursor['r'], cursor['i']) if cursor else None,
+        )
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return [row_id for row_id, _ in self.page]
+
+    def get_next_position(self) -> dict:
+        row_id, rank = self.page[-1]
+        return {'i': row_id, 'r': rank}
+
+    def is_valid_position(self, position: dict) -> bool:
+        return type(position.get('i')) is int and type(position.get('r')) is float
@@ -1,9 +1,10 @@
 from dataclasses import dataclass
 
+from django.conf import settings
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import BasePermission
 
-from core.models import Offer, Project
+from api.context import get_request_context
 
 
 @dataclass
@@ -13,6 +14,7 @@ class ERROR_MESSAGE:
     IS_NOT_RECIPIENT = "you cannot sent the offer to himself"
     RECIPIENT_IS_NOT_PROJECT_OWNER = "this recipient doesn't own the project"
     IS_NOT_TEAM_MEMBER = "you are the team member already"
+    IS_INTERNAL_REQUEST = "this endpoint is available from the internal network only"
 
 
 class IsProjectOwner(BasePermission):
@@ -20,7 +22,7 @@ class IsProjectOwner(BasePermission):
 
     def has_permission(self, request, view):
         project_id = request.parser_context['kwargs']['project_id']
-        return request.user.own_projects.filter(pk=project_id).exists()
+        return get_request_context(request).user_owns_project(project_id)
 
 
 class IsRecipient(BasePermission):
@@ -28,11 +30,8 @@ class IsRecipient(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         offer_id = request.parser_context['kwargs']['offer_id']
-        try:
-            offer = Offer.objects.get(pk=offer_id)
-            return obj.id == offer.recipient.id
-        except Offer.DoesNotExist:
-            return False
+        offer = get_request_context(request).get_offer(offer_id)
+        return offer is not None and obj.id == offer.recipient_id
 
 
 class IsNotRecipient(BasePermission):
@@ -48,9 +47,7 @@ class SenderIsProjectOwner(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         project_id = request.data['project_id']
-        print(obj.own_projects.filter(pk=project_id))
-        is_owner = obj.own_projects.filter(pk=project_id).exists()
-        return is_owner
+        return get_request_context(request).user_owns_project(project_id)
 
 
 class RecipientIsProjectOwner(BasePermission):
@@ -59,11 +56,10 @@ class RecipientIsProjectOwner(BasePermission):
     def has_object_permission(self, request, view, obj):
         project_id = request.data['project_id']
         recipient_id = request.data['recipient_id']
-        try:
-            project = Project.objects.get(pk=project_id)
-            return project.owner.id == recipient_id
-        except Project.DoesNotExist:
+        project = get_request_context(request).get_project(project_id)
+        if project is None:
             raise ValidationError({"detail": f"project with id {project_id} does not exist"})
+        return project.owner_id == recipient_id
 
 
 class IsNotTeamMember(BasePermission):
@@ -71,6 +67,11 @@ class IsNotTeamMember(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         project_id = request.data['project_id']
-        if obj.current_project:
-            return obj.current_project.id != project_id
-        return True
+        return obj.current_project_id != project_id
+
+
+class IsInternalRequest(BasePermission):
+    message = ERROR_MESSAGE.IS_INTERNAL_REQUEST
+
+    def has_permission(self, request, view):
+        return request.META.get('REMOTE_ADDR') in getattr(settings, 'INTERNAL_IPS', ())
@@ -0,0 +1,174 @@
+"""
+Opt-in per-request profiling of the API views.
+
+`ProfilingMiddleware` profiles a sampled share of the requests (PROFILING_SAMPLE_RATE, 0 turns
+the middleware off) that are handled by a view from `api.views` and records:
+
+    sql        number and time of the queries on every database connection
+    serialize  time spent in serializers, outermost call only
+    render     time spent in renderers
+    total      time of the whole request below the middleware
+    alloc      peak of traced memory, only with PROFILING_TRACE_MEMORY
+
+The metrics are sent back in a `Server-Timing` header, and requests at least
+PROFILING_THRESHOLD_MS long are appended as JSON lines to the rotating PROFILING_LOG_FILE.
+Requests that aren't sampled only pay for one `random()` call.
+"""
+import json
+import logging
+import time
+import tracemalloc
+from contextlib import ExitStack
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+from random import random
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework import serializers
+
+SECTIONS = ('serialize', 'render')
+
+_current_profile: ContextVar['RequestProfile | None'] = ContextVar('profile', default=None)
+
+
+@dataclass
+class RequestProfile:
+    method: str
+    path: str
+    view: str | None = None
+    status: int | None = None
+    total_ms: float = 0
+    sql_count: int = 0
+    sql_ms: float = 0
+    sections_ms: dict[str, float] = field(default_factory=lambda: dict.fromkeys(SECTIONS, 0))
+    alloc_peak_kb: float | None = None
+    _depth: dict[str, int] = field(default_factory=lambda: dict.fromkeys(SECTIONS, 0))
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_count += 1
+            self.sql_ms += (time.perf_counter() - started_at) * 1000
+
+    def server_timing(self) -> str:
+        metrics = [f'sql;desc="{self.sql_count} queries";dur={self.sql_ms:.1f}']
+        metrics.extend(f'{name};dur={ms:.1f}' for name, ms in self.sections_ms.items())
+        metrics.append(f'total;dur={self.total_ms:.1f}')
+        if self.alloc_peak_kb is not None:
+            metrics.append(f'alloc;desc="{self.alloc_peak_kb:.0f}KB"')
+        return ', '.join(metrics)
+
+    def as_record(self) -> dict:
+        record = asdict(self)
+        record.pop('_depth')
+        for name, ms in record.pop('sections_ms').items():
+            record[f'{name}_ms'] = ms
+        return {key: round(value, 2) if isinstance(value, float) else value
+                for key, value in record.items()}
+
+
+def profiled(section: str):
+    'Add the time of the decorated function to a section of the current profile, if any'
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            profile = _current_profile.get()
+            if profile is None or profile._depth[section]:
+                return function(*args, **kwargs)
+            profile._depth[section] += 1
+            started_at = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profile._depth[section] -= 1
+                profile.sections_ms[section] += (time.perf_counter() - started_at) * 1000
+        return wrapper
+    return decorator
+
+
+def install_serializer_hooks() -> None:
+    'Time `to_representation` of all DRF serializers, nested ones count towards the outermost'
+    for serializer_class in (serializers.Serializer, serializers.ListSerializer):
+        method = serializer_class.to_representation
+        if not getattr(method, 'is_profiled', False):
+            method = profiled('serialize')(method)
+            method.is_profiled = True
+            serializer_class.to_representation = method
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0)
+        if not self.sample_rate:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold_ms = getattr(settings, 'PROFILING_THRESHOLD_MS', 0)
+        self.trace_memory = getattr(settings, 'PROFILING_TRACE_MEMORY', False)
+        self.log = _profiling_log()
+        install_serializer_hooks()
+
+    def __call__(self, request):
+        if random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = RequestProfile(method=request.method, path=request.path)
+        token = _current_profile.set(profile)
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+        started_at = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile.execute_wrapper))
+                response = self.get_response(request)
+        finally:
+            profile.total_ms = (time.perf_counter() - started_at) * 1000
+            if self.trace_memory:
+                profile.alloc_peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+            if started_tracing:
+                tracemalloc.stop()
+            _current_profile.reset(token)
+
+        if profile.view is None:
+            return response
+        profile.status = response.status_code
+        response['Server-Timing'] = profile.server_timing()
+        if profile.total_ms >= self.threshold_ms:
+            self.log.info(json.dumps(profile.as_record()))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = _current_profile.get()
+        view_class = getattr(view_func, 'cls', None)
+        if profile is not None and view_class is not None \
+                and view_class.__module__.startswith('api.views'):
+            profile.view = view_class.__name__
+
+
+def _profiling_log() -> logging.Logger:
+    'Logger writing bare messages to the rotating PROFILING_LOG_FILE'
+    log = logging.getLogger(f'{__name__}.requests')
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    for handler in list(log.handlers):
+        log.removeHandler(handler)
+        handler.close()
+    path = getattr(settings, 'PROFILING_LOG_FILE', None)
+    if path:
+        handler = RotatingFileHandler(
+            path,
+            maxBytes=getattr(settings, 'PROFILING_LOG_MAX_BYTES', 10 * 2 ** 20),
+            backupCount=getattr(settings, 'PROFILING_LOG_BACKUP_COUNT', 3),
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        log.addHandler(handler)
+    return log
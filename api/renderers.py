@@ -0,0 +1,133 @@
+"""
+camelCase JSON renderer with a precomputed key mapping.
+
+Output is identical to `djangorestframework_camel_case.render.CamelCaseJSONRenderer`, but keys
+are looked up in a snake -> camel mapping built once from the serializer classes instead of
+running a regex over every key of every response. orjson is used for encoding when installed.
+"""
+import pkgutil
+import re
+from functools import lru_cache
+from importlib import import_module
+
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from djangorestframework_camel_case.settings import api_settings as camel_case_settings
+from djangorestframework_camel_case.util import camelize, camelize_re, underscore_to_camel
+from rest_framework import serializers
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+from api.profiling import profiled
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+SCALARS = (str, int, float, bool, type(None))
+
+CAMEL_KEYS: dict[str, str] = {}
+
+
+def camel_key(key: str) -> str:
+    camel = CAMEL_KEYS.get(key)
+    if camel is None:
+        camel = _camel_key(key)
+    return camel
+
+
+@lru_cache(maxsize=4096)
+def _camel_key(key: str) -> str:
+    return re.sub(camelize_re, underscore_to_camel, key) if '_' in key else key
+
+
+def register_serializer_keys(serializer_class: type[serializers.BaseSerializer]) -> None:
+    'Add the camelCase names of all (nested) fields of the serializer to CAMEL_KEYS'
+    fields = [serializer_class()]
+    while fields:
+        field = fields.pop()
+        if isinstance(field, serializers.ListSerializer):
+            fields.append(field.child)
+        elif isinstance(field, serializers.Serializer):
+            for name, nested_field in field.fields.items():
+                CAMEL_KEYS[name] = _camel_key(name)
+                fields.append(nested_field)
+
+
+def register_all_serializer_keys() -> None:
+    'Register every serializer class defined in api.serializers'
+    package = import_module('api.serializers')
+    for module in pkgutil.iter_modules(package.__path__, prefix=f'{package.__name__}.'):
+        import_module(module.name)
+
+    classes = [serializers.Serializer]
+    while classes:
+        serializer_class = classes.pop()
+        classes.extend(serializer_class.__subclasses__())
+        if serializer_class.__module__.startswith(package.__name__):
+            register_serializer_keys(serializer_class)
+
+
+def fast_camelize(data):
+    'Same result as `djangorestframework_camel_case.util.camelize` without options'
+    if isinstance(data, dict):
+        return {
+            camel_key(key) if type(key) is str else _convert_key(key): fast_camelize(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, (list, tuple)):
+        return [item if type(item) in SCALARS else fast_camelize(item) for item in data]
+    if type(data) in SCALARS:
+        return data
+    return camelize(data)
+
+
+def _convert_key(key):
+    if isinstance(key, Promise):
+        key = force_str(key)
+    return camel_key(key) if isinstance(key, str) else key
+
+
+class CamelCaseJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement of the camel case package renderer.
+
+    Falls back to the package behaviour when it is configured with ignore_fields/ignore_keys,
+    and to the stdlib encoder whenever orjson cannot produce the same bytes (indented output,
+    non-compact separators, ASCII-only output, values orjson refuses to encode).
+    """
+    json_underscoreize = camel_case_settings.JSON_UNDERSCOREIZE
+
+    @profiled('render')
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        options = self.json_underscoreize
+        if options.get('ignore_fields') or options.get('ignore_keys'):
+            data = camelize(data, **options)
+        else:
+            data = fast_camelize(data)
+
+        if data is None or orjson is None or not self.compact or self.ensure_ascii \
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except (orjson.JSONEncodeError, TypeError):
+            return super().render(data, accepted_media_type, renderer_context)
+        return content.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class PrometheusTextRenderer(BaseRenderer):
+    'Passes through text already in the Prometheus exposition format'
+    media_type = 'text/plain'
+    format = 'txt'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):
+            # error responses
+            data = ''.join(f'{key}: {value}\n' for key, value in data.items())
+        return data.encode(self.charset)
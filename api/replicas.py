@@ -0,0 +1,87 @@
+"""
+Replica reads with read-your-writes stickiness.
+
+Safe requests to views with `read_from_replica = True` read from a healthy replica picked by
+core.routers, unless the client wrote something in the last REPLICA_PIN_SECONDS. Responses to
+unsafe requests pin the client to the primary with the PIN_COOKIE cookie and, for clients that
+don't keep cookies, by their Authorization header: in the memory of this process and in a
+PrimaryPin row, so a read served by another worker is pinned too at the cost of a primary key
+lookup. Rows are kept only for authenticated writes, one per token, and are overwritten rather
+than deleted.
+"""
+import hashlib
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+from rest_framework.permissions import SAFE_METHODS
+
+from core.models import PrimaryPin
+from core.routers import choose_replica, get_replicas, read_from_primary, route_reads_to
+
+PIN_COOKIE = 'primary_pin'
+# pins kept before expired ones are dropped
+MAX_PINS = 10000
+
+# sha256 of the Authorization header -> monotonic time the pin expires at
+_pins: dict[str, float] = {}
+
+
+class ReplicaMiddleware:
+    def __init__(self, get_response):
+        if not get_replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with read_from_primary():
+            response = self.get_response(request)
+        if request.method not in SAFE_METHODS:
+            pin_to_primary(request, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if request.method in SAFE_METHODS and getattr(view_class, 'read_from_replica', False) \
+                and not is_pinned(request):
+            route_reads_to(choose_replica())
+
+
+def pin_to_primary(request, response) -> None:
+    seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+    response.set_cookie(PIN_COOKIE, '1', max_age=seconds, httponly=True, samesite='Lax')
+    authorization = request.META.get('HTTP_AUTHORIZATION')
+    if authorization:
+        now = time.monotonic()
+        if len(_pins) >= MAX_PINS:
+            for key, expires_at in list(_pins.items()):
+                if expires_at <= now:
+                    del _pins[key]
+        key = _pin_key(authorization)
+        _pins[key] = now + seconds
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            expires_at = timezone.now() + timedelta(seconds=seconds)
+            PrimaryPin.objects.bulk_create(
+                [PrimaryPin(key=key, expires_at=expires_at)],
+                update_conflicts=True, unique_fields=['key'], update_fields=['expires_at'],
+            )
+
+
+def is_pinned(request) -> bool:
+    if PIN_COOKIE in request.COOKIES:
+        return True
+    authorization = request.META.get('HTTP_AUTHORIZATION')
+    if not authorization:
+        return False
+    key = _pin_key(authorization)
+    if _pins.get(key, 0) > time.monotonic():
+        return True
+    # called within `read_from_primary`, the row written by another worker is visible
+    return PrimaryPin.objects.filter(key=key, expires_at__gt=timezone.now()).exists()
+
+
+def _pin_key(authorization: str) -> str:
+    return hashlib.sha256(authorization.encode()).hexdigest()
@@ -0,0 +1,23 @@
+from rest_framework.response import Response
+
+
+class PrerenderedResponse(Response):
+    """
+    Response that carries JSON content rendered ahead of time.
+
+    The prerendered bytes are used when the client negotiated plain JSON, any other renderer
+    (e.g. the browsable API) renders `data` as usual.
+    """
+
+    def __init__(self, data, json_content: bytes, **kwargs):
+        super().__init__(data=data, **kwargs)
+        self.json_content = json_content
+
+    @property
+    def rendered_content(self):
+        renderer = getattr(self, 'accepted_renderer', None)
+        if renderer is None or renderer.format != 'json' \
+                or self.accepted_media_type != renderer.media_type:
+            return super().rendered_content
+        self['Content-Type'] = self.content_type or renderer.media_type
+        return self.json_content
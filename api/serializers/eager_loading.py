@@ -0,0 +1,43 @@
+from django.db.models import Prefetch, QuerySet
+
+
+class EagerLoadingMixin:
+    """
+    Serializer owns the query plan for the relations it renders.
+
+    Declare `select_related` and `prefetch_related` in Meta and build querysets with
+    `setup_eager_loading` so views can't drift out of sync with serializer fields. Given the
+    fields of a sparse fieldset, only the columns and relations those fields render are loaded;
+    Meta `field_sources` maps fields that aren't model fields to the model fields they read.
+    """
+
+    @classmethod
+    def setup_eager_loading(cls, queryset: QuerySet, fields: tuple | None = None) -> QuerySet:
+        select_related = getattr(cls.Meta, 'select_related', ())
+        prefetch_related = getattr(cls.Meta, 'prefetch_related', ())
+        if fields is not None:
+            select_related = [relation for relation in select_related if relation in fields]
+            prefetch_related = [prefetch for prefetch in prefetch_related
+                                if _prefetch_field(prefetch) in fields]
+            queryset = queryset.only(*cls.get_columns(fields))
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    @classmethod
+    def get_columns(cls, fields: tuple) -> list[str]:
+        'Concrete model fields read by the serializer fields, m2m relations are prefetched'
+        model_fields = {field.name: field for field in cls.Meta.model._meta.concrete_fields}
+        sources = getattr(cls.Meta, 'field_sources', {})
+        columns = ['id']
+        for name in fields:
+            columns.extend(source for source in sources.get(name, (name,))
+                           if source in model_fields and source not in columns)
+        return columns
+
+
+def _prefetch_field(prefetch: Prefetch | str) -> str:
+    lookup = prefetch.prefetch_through if isinstance(prefetch, Prefetch) else prefetch
+    return lookup.split('__')[0]
@@ -0,0 +1,12 @@
+class SparseFieldsetMixin:
+    """
+    Serializer rendering a subset of its fields, the `fields` argument.
+
+    Pair it with EagerLoadingMixin so the query loads that subset only.
+    """
+
+    def __init__(self, *args, fields: tuple | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
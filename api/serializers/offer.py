@@ -7,3 +7,9 @@ class OfferCreationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Offer
         fields = ('id', 'sender', 'recipient', 'project', 'type',)
+
+
+class OfferSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Offer
+        fields = ('id', 'sender', 'recipient', 'project', 'type', 'response',)
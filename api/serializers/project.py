@@ -1,17 +1,21 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
-from core.models import Project, Specialist
+from api.serializers.eager_loading import EagerLoadingMixin
+from api.serializers.fieldsets import SparseFieldsetMixin
+from core.models import Project, Specialist, Language, Technology
 from core.models.choices import ProjectType
 
 
-class ProjectSpecialistSerializer(serializers.ModelSerializer):
+class ProjectSpecialistSerializer(SparseFieldsetMixin, EagerLoadingMixin,
+                                  serializers.ModelSerializer):
     class Meta:
         model = Specialist
         fields = ('id', 'nickname', 'github_nickname', 'direction', 'rating', 'github',)
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer):
     languages = serializers.SlugRelatedField(slug_field='name', read_only=True, many=True)
     technologies = serializers.SlugRelatedField(slug_field='name', read_only=True, many=True)
     team = ProjectSpecialistSerializer(many=True, read_only=True)
@@ -20,8 +24,16 @@ class ProjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = ('id', 'name', 'github_name', 'description', 'version', 'type', 'start_date',
-                  'rating', 'github', 'languages', 'technologies', 'team', 'owner',)
+                  'rating', 'github', 'languages', 'technologies', 'team', 'owner', 'team_count',
+                  'languages_count', 'technologies_count',)
+        read_only_fields = ('team_count', 'languages_count', 'technologies_count',)
         depth = 1
+        select_related = ('owner',)
+        prefetch_related = (
+            Prefetch('languages', queryset=Language.objects.order_by('id')),
+            Prefetch('technologies', queryset=Technology.objects.order_by('id')),
+            Prefetch('team', queryset=Specialist.objects.order_by('id')),
+        )
 
 
 class ProjectCreationSerializer(serializers.ModelSerializer):
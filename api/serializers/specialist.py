@@ -1,22 +1,40 @@
-from datetime import date
+from datetime import date, datetime, time
 
 from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
-from core.models import Specialist, Project
+from api.serializers.eager_loading import EagerLoadingMixin
+from api.serializers.fieldsets import SparseFieldsetMixin
+from core.models import Specialist, Project, Language, Technology
 from core.models.choices import Direction
 
 SpecialistModel = get_user_model()
 
 
-class SpecialistProjectSerializer(serializers.ModelSerializer):
+def full_years(born_date: date) -> int:
+    current_date = date.today()
+    if current_date.month < born_date.month:
+        return current_date.year - born_date.year - 1
+    elif current_date.month == born_date.month and current_date.day < born_date.day:
+        return current_date.year - born_date.year - 1
+    return current_date.year - born_date.year
+
+
+def ages_changed_at() -> datetime:
+    'Start of the current day, `age` of specialists may differ from the one served yesterday'
+    return datetime.combine(date.today(), time.min).astimezone()
+
+
+class SpecialistProjectSerializer(SparseFieldsetMixin, EagerLoadingMixin,
+                                  serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = ('id', 'name', 'github_name', 'version', 'type', 'rating', 'github',)
 
 
-class SpecialistSerializer(serializers.ModelSerializer):
+class SpecialistSerializer(SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer):
     languages = serializers.SlugRelatedField(slug_field='name', read_only=True, many=True)
     technologies = serializers.SlugRelatedField(slug_field='name', read_only=True, many=True)
     current_project = SpecialistProjectSerializer(read_only=True)
@@ -28,22 +46,25 @@ class SpecialistSerializer(serializers.ModelSerializer):
         model = Specialist
         fields = ('id', 'nickname', 'github_nickname', 'direction', 'rating', 'languages',
                   'technologies', 'current_project', 'projects', 'own_projects', 'email', 'github',
-                  'name', 'surname', 'age', 'country', 'city', 'about',)
+                  'name', 'surname', 'age', 'country', 'city', 'about', 'projects_count',
+                  'own_projects_count', 'languages_count', 'technologies_count',)
+        read_only_fields = ('projects_count', 'own_projects_count', 'languages_count',
+                            'technologies_count',)
         depth = 1
+        field_sources = {'age': ('born_date',)}
+        select_related = ('current_project',)
+        prefetch_related = (
+            Prefetch('languages', queryset=Language.objects.order_by('id')),
+            Prefetch('technologies', queryset=Technology.objects.order_by('id')),
+            Prefetch('projects', queryset=Project.objects.order_by('id')),
+            Prefetch('own_projects', queryset=Project.objects.order_by('id')),
+        )
 
     def get_age(self, obj) -> int | None:
         if obj.born_date:
-            return self._full_years(born_date=obj.born_date)
+            return full_years(born_date=obj.born_date)
         return None
 
-    def _full_years(self, born_date: date) -> int:
-        current_date = date.today()
-        if current_date.month < born_date.month:
-            return current_date.year - born_date.year - 1
-        elif current_date.month == born_date.month and current_date.day < born_date.day:
-            return current_date.year - born_date.year - 1
-        return current_date.year - born_date.year
-
 
 class SpecialistCreationSerializer(serializers.ModelSerializer):
     class Meta:
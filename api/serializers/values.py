@@ -0,0 +1,180 @@
+"""
+Read path for list endpoints built on `.values()` rows instead of model instances.
+
+The output is identical to ProjectSerializer/SpecialistSerializer: same keys in the same
+order, same value representation, related rows ordered by id. Catalog names come from the
+in-memory catalog; nested projects and specialists are joined into the entity and through
+table rows, so a list costs one query per relation regardless of its size.
+"""
+from collections import defaultdict
+from operator import itemgetter
+from typing import Callable
+
+from api.profiling import profiled
+from api.serializers.project import ProjectSerializer, ProjectSpecialistSerializer
+from api.serializers.specialist import (
+    SpecialistProjectSerializer,
+    SpecialistSerializer,
+    full_years,
+)
+from core.catalog import get_catalog, invalidate_catalog
+from core.models.project import ProjectLanguage, ProjectTechnology, ProjectTeam
+from core.models.specialist import (
+    SpecialistLanguage,
+    SpecialistOwnProject,
+    SpecialistProject,
+    SpecialistTechnology,
+)
+
+PROJECT_SPECIALIST_FIELDS = ProjectSpecialistSerializer.Meta.fields
+SPECIALIST_PROJECT_FIELDS = SpecialistProjectSerializer.Meta.fields
+PROJECT_FIELDS = ProjectSerializer.Meta.fields
+SPECIALIST_FIELDS = SpecialistSerializer.Meta.fields
+
+# field -> columns it is rendered from, fields that are missing are columns themselves and
+# m2m relations are read from their through tables by id
+PROJECT_COLUMNS = {
+    'languages': (),
+    'technologies': (),
+    'team': (),
+    'owner': tuple(f'owner__{field}' for field in PROJECT_SPECIALIST_FIELDS),
+}
+SPECIALIST_COLUMNS = {
+    'languages': (),
+    'technologies': (),
+    'projects': (),
+    'own_projects': (),
+    'current_project': tuple(f'current_project__{field}' for field in SPECIALIST_PROJECT_FIELDS),
+    'age': ('born_date',),
+}
+
+
+def _values(fields: tuple, columns: dict) -> tuple:
+    values = ['id']
+    for field in fields:
+        values.extend(column for column in columns.get(field, (field,)) if column not in values)
+    return tuple(values)
+
+
+def project_values(fields: tuple | None = None) -> tuple:
+    'Columns of the `.values()` rows `serialize_projects` renders the fields from, None for all'
+    return _values(PROJECT_FIELDS if fields is None else fields, PROJECT_COLUMNS)
+
+
+def specialist_values(fields: tuple | None = None) -> tuple:
+    'Columns of the `.values()` rows `serialize_specialists` renders the fields from, None for all'
+    return _values(SPECIALIST_FIELDS if fields is None else fields, SPECIALIST_COLUMNS)
+
+
+PROJECT_VALUES = project_values()
+SPECIALIST_VALUES = specialist_values()
+
+
+@profiled('serialize')
+def serialize_projects(rows: list[dict], fields: tuple | None = None) -> list[dict]:
+    """
+    Same output as ProjectSerializer(many=True, fields=fields) for rows of
+    `.values(*project_values(fields))`, relations that aren't rendered aren't queried
+    """
+    fields = PROJECT_FIELDS if fields is None else fields
+    ids = [row['id'] for row in rows]
+    related = {}
+    if 'languages' in fields:
+        related['languages'] = _related_names(
+            ProjectLanguage, 'project_id', 'language_id', ids, 'languages'
+        )
+    if 'technologies' in fields:
+        related['technologies'] = _related_names(
+            ProjectTechnology, 'project_id', 'technology_id', ids, 'technologies'
+        )
+    if 'team' in fields:
+        related['team'] = _related_rows(
+            ProjectTeam, 'project_id', 'specialist', PROJECT_SPECIALIST_FIELDS, ids
+        )
+    renderers = {
+        'start_date': lambda row: row['start_date'].isoformat() if row['start_date'] else None,
+        'owner': lambda row: _nested(row, 'owner', PROJECT_SPECIALIST_FIELDS),
+    }
+    return _render(rows, fields, related, renderers)
+
+
+@profiled('serialize')
+def serialize_specialists(rows: list[dict], fields: tuple | None = None) -> list[dict]:
+    """
+    Same output as SpecialistSerializer(many=True, fields=fields) for rows of
+    `.values(*specialist_values(fields))`, relations that aren't rendered aren't queried
+    """
+    fields = SPECIALIST_FIELDS if fields is None else fields
+    ids = [row['id'] for row in rows]
+    related = {}
+    if 'languages' in fields:
+        related['languages'] = _related_names(
+            SpecialistLanguage, 'specialist_id', 'language_id', ids, 'languages'
+        )
+    if 'technologies' in fields:
+        related['technologies'] = _related_names(
+            SpecialistTechnology, 'specialist_id', 'technology_id', ids, 'technologies'
+        )
+    if 'projects' in fields:
+        related['projects'] = _related_rows(
+            SpecialistProject, 'specialist_id', 'project', SPECIALIST_PROJECT_FIELDS, ids
+        )
+    if 'own_projects' in fields:
+        related['own_projects'] = _related_rows(
+            SpecialistOwnProject, 'specialist_id', 'own_project', SPECIALIST_PROJECT_FIELDS, ids
+        )
+    renderers = {
+        'current_project': lambda row: _nested(row, 'current_project', SPECIALIST_PROJECT_FIELDS),
+        'age': lambda row: full_years(born_date=row['born_date']) if row['born_date'] else None,
+    }
+    return _render(rows, fields, related, renderers)
+
+
+def _render(rows: list[dict], fields: tuple, related: dict[str, dict],
+            renderers: dict[str, Callable]) -> list[dict]:
+    'Rows as dicts of the fields: related rows by id, rendered values or plain columns'
+    getters = []
+    for field in fields:
+        if field in related:
+            getters.append((field, lambda row, items=related[field]: items.get(row['id'], [])))
+        elif field in renderers:
+            getters.append((field, renderers[field]))
+        else:
+            getters.append((field, itemgetter(field)))
+    return [{field: getter(row) for field, getter in getters} for row in rows]
+
+
+def _related_ids(through, source_field: str, target_field: str, ids: list) -> dict[int, list]:
+    related = defaultdict(list)
+    rows = through.objects.filter(**{f'{source_field}__in': ids}) \
+        .order_by(target_field).values_list(source_field, target_field)
+    for source_id, target_id in rows:
+        related[source_id].append(target_id)
+    return related
+
+
+def _related_names(through, source_field: str, target_field: str, ids: list,
+                   section: str) -> dict[int, list]:
+    related = _related_ids(through, source_field, target_field, ids)
+    names = getattr(get_catalog(), section).names_by_id
+    if any(target_id not in names for target_ids in related.values() for target_id in target_ids):
+        invalidate_catalog()
+        names = getattr(get_catalog(), section).names_by_id
+    return {source_id: [names[target_id] for target_id in target_ids]
+            for source_id, target_ids in related.items()}
+
+
+def _related_rows(through, source_field: str, target: str, fields: tuple,
+                  ids: list) -> dict[int, list]:
+    related = defaultdict(list)
+    rows = through.objects.filter(**{f'{source_field}__in': ids}).order_by(f'{target}_id') \
+        .values_list(source_field, *(f'{target}__{field}' for field in fields))
+    for source_id, *values in rows:
+        related[source_id].append(dict(zip(fields, values)))
+    return related
+
+
+def _nested(row: dict, relation: str, fields: tuple) -> dict | None:
+    if row[f'{relation}__id'] is None:
+        return None
+    return {field: row[f'{relation}__{field}'] for field in fields}
@@ -12,7 +12,11 @@ from api.views.project import (
     ProjectTechnologiesAddingApiView,
     ProjectTechnologiesDeletionApiView,
     ProjectDeletionApiView,
-    ProjectTakePartApiView
+    ProjectTakePartApiView,
+    ProjectMatchingSpecialistsApiView,
+    ProjectsSearchApiView,
+    ProjectsLeaderboardApiView,
+    ProjectRankApiView,
 )
 from api.views.specialist import (
     SpecialistsListApiView,
@@ -26,6 +30,10 @@ from api.views.specialist import (
     SpecialistTechnologiesAddingApiView,
     SpecialistTechnologiesDeletionApiView,
     SpecialistDeletionApiView,
+    SpecialistMatchingProjectsApiView,
+    SpecialistsSearchApiView,
+    SpecialistsLeaderboardApiView,
+    SpecialistRankApiView,
 )
 from api.views.offer import (
     OfferAddingToTeamApiView,
@@ -33,6 +41,9 @@ from api.views.offer import (
     OfferGivingOwnershipApiView,
     OfferGettingOwnershipApiView,
     OfferResponseApiView,
+    OffersInboxApiView,
+    OffersOutboxApiView,
+    OffersPendingCountApiView,
 )
 from api.views.technology import LanguagesListApiView, TechnologiesListApiView
 
@@ -53,6 +64,10 @@ class URL_PATTERN_NAME:
     REMOVE_SPECIALIST_LANGUAGES = 'REMOVE_SPECIALIST_LANGUAGES'
     ADD_TECHNOLOGIES_TO_SPECIALIST = 'ADD_TECHNOLOGIES_TO_SPECIALIST'
     REMOVE_SPECIALIST_TECHNOLOGIES = 'REMOVE_SPECIALIST_TECHNOLOGIES'
+    MATCHING_PROJECTS = 'MATCHING_PROJECTS'
+    SEARCH_SPECIALISTS = 'SEARCH_SPECIALISTS'
+    SPECIALISTS_LEADERBOARD = 'SPECIALISTS_LEADERBOARD'
+    SPECIALIST_RANK = 'SPECIALIST_RANK'
 
     PROJECTS = 'PROJECTS'
     RETRIEVE_PROJECT = 'RETRIEVE_PROJECT'
@@ -64,12 +79,19 @@ class URL_PATTERN_NAME:
     ADD_TECHNOLOGIES_TO_PROJECT = 'ADD_TECHNOLOGIES_TO_PROJECT'
     REMOVE_PROJECT_TECHNOLOGIES = 'REMOVE_PROJECT_TECHNOLOGIES'
     TAKE_PART_IN_THE_PROJECT = 'TAKE_PART_IN_THE_PROJECT'
+    MATCHING_SPECIALISTS = 'MATCHING_SPECIALISTS'
+    SEARCH_PROJECTS = 'SEARCH_PROJECTS'
+    PROJECTS_LEADERBOARD = 'PROJECTS_LEADERBOARD'
+    PROJECT_RANK = 'PROJECT_RANK'
 
     ADD_TO_TEAM = 'ADD_TO_TEAM'
     JOIN_TO_TEAM = 'JOIN_TO_TEAM'
     GIVE_OWNERSHIP = 'GIVE_OWNERSHIP'
     GET_OWNERSHIP = 'GET_OWNERSHIP'
     RESPONSE_TO_OFFER = 'RESPONSE_TO_OFFER'
+    INBOX_OFFERS = 'INBOX_OFFERS'
+    OUTBOX_OFFERS = 'OUTBOX_OFFERS'
+    PENDING_OFFERS_COUNT = 'PENDING_OFFERS_COUNT'
 
 
 urlpatterns = [
@@ -126,6 +148,26 @@ urlpatterns = [
         SpecialistTechnologiesDeletionApiView.as_view(),
         name=URL_PATTERN_NAME.REMOVE_SPECIALIST_TECHNOLOGIES
     ),
+    path(
+        'specialists/<int:specialist_id>/matching_projects',
+        SpecialistMatchingProjectsApiView.as_view(),
+        name=URL_PATTERN_NAME.MATCHING_PROJECTS
+    ),
+    path(
+        'specialists/search',
+        SpecialistsSearchApiView.as_view(),
+        name=URL_PATTERN_NAME.SEARCH_SPECIALISTS
+    ),
+    path(
+        'specialists/leaderboard',
+        SpecialistsLeaderboardApiView.as_view(),
+        name=URL_PATTERN_NAME.SPECIALISTS_LEADERBOARD
+    ),
+    path(
+        'specialists/<int:specialist_id>/rank',
+        SpecialistRankApiView.as_view(),
+        name=URL_PATTERN_NAME.SPECIALIST_RANK
+    ),
 
     path('projects/', ProjectsListApiView.as_view(), name=URL_PATTERN_NAME.PROJECTS),
     path(
@@ -173,6 +215,26 @@ urlpatterns = [
         ProjectTakePartApiView.as_view(),
         name=URL_PATTERN_NAME.TAKE_PART_IN_THE_PROJECT
     ),
+    path(
+        'projects/<int:project_id>/matching_specialists',
+        ProjectMatchingSpecialistsApiView.as_view(),
+        name=URL_PATTERN_NAME.MATCHING_SPECIALISTS
+    ),
+    path(
+        'projects/search',
+        ProjectsSearchApiView.as_view(),
+        name=URL_PATTERN_NAME.SEARCH_PROJECTS
+    ),
+    path(
+        'projects/leaderboard',
+        ProjectsLeaderboardApiView.as_view(),
+        name=URL_PATTERN_NAME.PROJECTS_LEADERBOARD
+    ),
+    path(
+        'projects/<int:project_id>/rank',
+        ProjectRankApiView.as_view(),
+        name=URL_PATTERN_NAME.PROJECT_RANK
+    ),
 
     path(
         'offers/add_to_team',
@@ -199,4 +261,11 @@ urlpatterns = [
         OfferResponseApiView.as_view(),
         name=URL_PATTERN_NAME.RESPONSE_TO_OFFER
     ),
+    path('offers/inbox', OffersInboxApiView.as_view(), name=URL_PATTERN_NAME.INBOX_OFFERS),
+    path('offers/outbox', OffersOutboxApiView.as_view(), name=URL_PATTERN_NAME.OUTBOX_OFFERS),
+    path(
+        'offers/pending_count',
+        OffersPendingCountApiView.as_view(),
+        name=URL_PATTERN_NAME.PENDING_OFFERS_COUNT
+    ),
 ]
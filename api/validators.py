@@ -1,6 +1,9 @@
+from djangorestframework_camel_case.util import camel_to_underscore
 from rest_framework.validators import ValidationError
 
-from core.models import Project, Specialist
+from api.context import RequestContext
+from core.catalog import get_catalog
+from core.facets import SkillFacet
 
 
 def validate_password(password: str, min_length: int = 8, max_length: int = 30) -> bool:
@@ -11,18 +14,16 @@ def validate_password(password: str, min_length: int = 8, max_length: int = 30)
     })
 
 
-def validate_offer_creation_data(data: dict) -> None:
+def validate_offer_creation_data(data: dict, context: RequestContext) -> None:
     project_id, recipient_id = data.get('project_id'), data.get('recipient_id')
     if type(project_id) is not int:
         raise ValidationError({"detail": "invalid required param project_id, it must be int"})
     if type(recipient_id) is not int:
         raise ValidationError({"detail": "invalid required param recipient_id, it must be int"})
 
-    project = Project.objects.filter(pk=project_id).exists()
-    if project is False:
+    if context.get_project(project_id) is None:
         raise ValidationError({"detail": f"project with id {project_id} doesn't exist"})
-    recipient = Specialist.objects.filter(pk=recipient_id).exists()
-    if recipient is False:
+    if context.get_specialist(recipient_id) is None:
         raise ValidationError({"detail": f"recipient with id {recipient_id} doesn't exist"})
 
 
@@ -30,3 +31,117 @@ def validate_offer_response_data(data: dict) -> None:
     response = data.get('response')
     if type(response) is not bool:
         raise ValidationError({"detail": "invalid required param response, it must be bool"})
+
+
+def validate_limit(limit: str | None, default: int = 20, max_limit: int = 100) -> int:
+    if limit is None:
+        return default
+    if not limit.isdigit() or int(limit) < 1:
+        raise ValidationError({"detail": "invalid param limit, it must be positive int"})
+    return min(int(limit), max_limit)
+
+
+def validate_id_param(value: str | None, param: str) -> int | None:
+    if value is None:
+        return None
+    if not value.isdigit() or int(value) < 1:
+        raise ValidationError({"detail": f"invalid param {param}, it must be positive int"})
+    return int(value)
+
+
+def validate_count_param(value: str | None, param: str) -> int | None:
+    if value is None:
+        return None
+    if not value.isdigit():
+        raise ValidationError({"detail": f"invalid param {param}, it must be non-negative int"})
+    return int(value)
+
+
+def validate_count_range(params, field: str) -> dict:
+    'Lookups of the min_<field>/max_<field> params, both bounds included'
+    lookups = {}
+    for bound, lookup in (('min', 'gte'), ('max', 'lte')):
+        value = validate_count_param(params.get(f'{bound}_{field}'), f'{bound}_{field}')
+        if value is not None:
+            lookups[f'{field}__{lookup}'] = value
+    return lookups
+
+
+def validate_choice(value: str | None, choices: list, param: str) -> str | None:
+    if value is None or value.upper() in choices:
+        return value and value.upper()
+    raise ValidationError({"detail": f"invalid param {param}, it must be one of {choices}"})
+
+
+def validate_skill_param(value: str | None, section: str, param: str) -> int | None:
+    'Catalog id of the language or technology name'
+    if value is None:
+        return None
+    skill_ids = getattr(get_catalog(), section).resolve([value])
+    if not skill_ids:
+        raise ValidationError({"detail": f"invalid param {param}, {value} is not in the catalog"})
+    return skill_ids.pop()
+
+
+def validate_fields_param(params, available: tuple) -> tuple | None:
+    """
+    Fields selected with the comma separated `fields` or `exclude` param, in the order of
+    `available`, never empty. None when neither is given, the full representation is requested.
+    """
+    fields, exclude = params.get('fields'), params.get('exclude')
+    if fields is None and exclude is None:
+        return None
+    if fields is not None and exclude is not None:
+        raise ValidationError({"detail": "params fields and exclude can't be combined"})
+    param = 'fields' if fields is not None else 'exclude'
+    names = {camel_to_underscore(name.strip()) for name in params[param].split(',') if name.strip()}
+    unknown = names - set(available)
+    if unknown:
+        raise ValidationError({
+            "detail": f"invalid param {param}, unknown fields {sorted(unknown)}, "
+                      f"it must be a subset of {available}"
+        })
+    selected = tuple(name for name in available if (name in names) == (param == 'fields'))
+    if not selected:
+        raise ValidationError({
+            "detail": f"invalid param {param}, it must leave at least one field"
+        })
+    return selected
+
+
+def validate_facet_filters(params, facets: tuple) -> dict[str, list]:
+    'Comma separated values of the facet params by facet name, skill names become catalog ids'
+    selected = {}
+    for facet in facets:
+        value = params.get(facet.name)
+        if value is None:
+            continue
+        values = [item.strip() for item in value.split(',') if item.strip()]
+        if isinstance(facet, SkillFacet):
+            values = [validate_skill_param(item, facet.section, facet.name) for item in values]
+        elif facet.choices is not None:
+            values = [validate_choice(item, list(facet.choices), facet.name) for item in values]
+        if not values:
+            raise ValidationError({"detail": f"invalid param {facet.name}, it must be non-empty"})
+        selected[facet.name] = values
+    return selected
+
+
+def validate_facets_param(params, facets: tuple) -> list[str]:
+    'Facet names to count, the comma separated `facets` param'
+    value = params.get('facets')
+    if value is None:
+        return []
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    available = [facet.name for facet in facets]
+    if not set(names) <= set(available):
+        raise ValidationError({
+            "detail": f"invalid param facets, it must be a subset of {available}"
+        })
+    return names
+
+
+def validate_search_query(query: str | None) -> str:
+    if query and query.strip():
+        return query
+    raise ValidationError({"detail": "invalid required param q, it must be non-empty string"})
@@ -0,0 +1,16 @@
+from rest_framework.response import Response
+from rest_framework.status import HTTP_200_OK
+from rest_framework.views import APIView
+
+from api.permissions import IsInternalRequest
+from api.renderers import PrometheusTextRenderer
+from core.metrics import CONTENT_TYPE, render_metrics
+
+
+class MetricsApiView(APIView):
+    authentication_classes = []
+    permission_classes = [IsInternalRequest]
+    renderer_classes = [PrometheusTextRenderer]
+
+    def get(self, request):
+        return Response(status=HTTP_200_OK, data=render_metrics(), content_type=CONTENT_TYPE)
@@ -1,9 +1,10 @@
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.status import HTTP_201_CREATED, HTTP_200_OK
 
+from api.authentication import CachedTokenAuthentication
+from api.pagination import IdKeysetPagination
 from api.permissions import (
     IsRecipient,
     IsNotRecipient,
@@ -11,13 +12,19 @@ from api.permissions import (
     IsNotTeamMember,
     RecipientIsProjectOwner,
 )
+from api.serializers.offer import OfferSerializer
+from api.validators import validate_choice, validate_id_param
+from core.models import Offer, Specialist
 from core.models.choices import OfferType
 from api.mixins import OfferMixin
 
+# offer state query param -> Offer.response
+OFFER_STATES = {'PENDING': None, 'ACCEPTED': True, 'DECLINED': False}
+
 
 class OfferAddingToTeamApiView(OfferMixin, APIView):
     permission_classes = [IsAuthenticated, IsNotRecipient, SenderIsProjectOwner]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def post(self, request):
         created_offer = self.create_offer(request=request, offer_type=OfferType.ADD_TO_TEAM)
@@ -26,7 +33,7 @@ class OfferAddingToTeamApiView(OfferMixin, APIView):
 
 class OfferJoiningToTeamApiView(OfferMixin, APIView):
     permission_classes = [IsAuthenticated, IsNotRecipient, RecipientIsProjectOwner, IsNotTeamMember]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def post(self, request):
         created_offer = self.create_offer(request=request, offer_type=OfferType.JOIN_TO_TEAM)
@@ -35,7 +42,7 @@ class OfferJoiningToTeamApiView(OfferMixin, APIView):
 
 class OfferGivingOwnershipApiView(OfferMixin, APIView):
     permission_classes = [IsAuthenticated, IsNotRecipient, SenderIsProjectOwner]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def post(self, request):
         created_offer = self.create_offer(request=request, offer_type=OfferType.GIVE_OWNERSHIP)
@@ -44,7 +51,7 @@ class OfferGivingOwnershipApiView(OfferMixin, APIView):
 
 class OfferGettingOwnershipApiView(OfferMixin, APIView):
     permission_classes = [IsAuthenticated, IsNotRecipient, RecipientIsProjectOwner]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def post(self, request):
         created_offer = self.create_offer(request=request, offer_type=OfferType.GET_OWNERSHIP)
@@ -53,8 +60,72 @@ class OfferGettingOwnershipApiView(OfferMixin, APIView):
 
 class OfferResponseApiView(OfferMixin, APIView):
     permission_classes = [IsAuthenticated, IsRecipient]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def patch(self, request, offer_id: int):
         self.response_to_offer(request=request, offer_id=offer_id)
         return Response(status=HTTP_200_OK)
+
+
+class OffersListApiView(APIView):
+    """
+    Offers of the request user, filtered by type, project and state.
+
+    Rows are read through the (participant, response, id) indexes of core.Offer, so a page costs
+    one index range scan whatever the total number of offers is.
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CachedTokenAuthentication]
+    pagination_class = IdKeysetPagination
+    participant = None
+
+    def get(self, request):
+        offers = Offer.objects.filter(**{self.participant: request.user}) \
+            .filter(**self.get_filters(request)) \
+            .only(*OfferSerializer.Meta.fields)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(offers, request, view=self)
+        return paginator.get_paginated_response(OfferSerializer(page, many=True).data)
+
+    def get_filters(self, request) -> dict:
+        params = request.query_params
+        filters = {}
+
+        offer_type = validate_choice(params.get('type'), choices=OfferType.values, param='type')
+        if offer_type is not None:
+            filters['type'] = offer_type
+
+        project_id = validate_id_param(value=params.get('project'), param='project')
+        if project_id is not None:
+            filters['project_id'] = project_id
+
+        state = validate_choice(params.get('state'), choices=list(OFFER_STATES), param='state')
+        if state is not None:
+            response = OFFER_STATES[state]
+            if response is None:
+                filters['response__isnull'] = True
+            else:
+                filters['response'] = response
+        return filters
+
+
+class OffersInboxApiView(OffersListApiView):
+    participant = 'recipient'
+
+
+class OffersOutboxApiView(OffersListApiView):
+    participant = 'sender'
+
+
+class OffersPendingCountApiView(APIView):
+    'Pending offers of the request user, read from the counters maintained by core.offers'
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def get(self, request):
+        counters = Specialist.objects.filter(pk=request.user.pk) \
+            .values('inbox_pending_count', 'outbox_pending_count').get()
+        return Response(status=HTTP_200_OK, data={
+            'inbox': counters['inbox_pending_count'],
+            'outbox': counters['outbox_pending_count'],
+        })
@@ -1,5 +1,4 @@
 from django.db import transaction
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.status import (
@@ -10,37 +9,187 @@ from rest_framework.status import (
 )
 from rest_framework.views import APIView
 
+from api.authentication import CachedTokenAuthentication
+from api.context import get_request_context
+from api.mixins import ConditionalGetMixin, LeaderboardMixin, SkillsMixin
+from api.pagination import ProjectsKeysetPagination, SearchPagination
 from api.permissions import IsProjectOwner
+from api.serializers.specialist import SpecialistProjectSerializer
+from api.serializers.values import PROJECT_FIELDS, project_values, serialize_projects
 from api.serializers.project import (
     ProjectSerializer,
     ProjectCreationSerializer,
     ProjectUpdatingSerializer,
+    ProjectSpecialistSerializer,
 )
-from core.models import Project, Specialist, Language, Technology
+from api.validators import (
+    validate_choice,
+    validate_count_range,
+    validate_facet_filters,
+    validate_facets_param,
+    validate_fields_param,
+    validate_limit,
+    validate_search_query,
+)
+from core.facets import PROJECT_FACETS, count_facets, filter_facets
+from core.matching import match_specialists
+from core.models import Project, Specialist
+from core.models.choices import Direction, ProjectType
+from core.versions import PROJECTS, get_collection_version
 
 
-class ProjectsListApiView(APIView):
-    def get(self, request):
-        projects = Project.objects.filter(is_private=False) \
-            .prefetch_related('languages', 'technologies', 'team')
-        serializer = ProjectSerializer(projects, many=True)
-        return Response(status=HTTP_200_OK, data=serializer.data)
+class ProjectsListApiView(ConditionalGetMixin, APIView):
+    read_from_replica = True
+    pagination_class = ProjectsKeysetPagination
 
-
-class ProjectRetrieveApiView(APIView):
+    def get(self, request):
+        version, updated_at = get_collection_version(PROJECTS)
+        return self.conditional_response(
+            request=request,
+            version_key=(PROJECTS, version),
+            last_modified=updated_at,
+            build_response=lambda: self.list(request),
+        )
+
+    def list(self, request):
+        params = request.query_params
+        fields = validate_fields_param(params, PROJECT_FIELDS)
+        selected = validate_facet_filters(params, PROJECT_FACETS)
+        facet_names = validate_facets_param(params, PROJECT_FACETS)
+        projects = Project.objects.filter(
+            is_private=False,
+            **validate_count_range(params, 'team_count'),
+            **validate_count_range(params, 'rating'),
+        )
+        facets = count_facets(projects, PROJECT_FACETS, selected, facet_names)
+
+        paginator = self.pagination_class()
+        columns = dict.fromkeys((*project_values(fields), *paginator.get_key_columns()))
+        page = paginator.paginate_queryset(
+            filter_facets(projects, PROJECT_FACETS, selected).values(*columns), request, view=self
+        )
+        response = paginator.get_paginated_response(serialize_projects(page, fields))
+        if facet_names:
+            response.data['facets'] = facets
+        return response
+
+
+class ProjectRetrieveApiView(ConditionalGetMixin, APIView):
     def get(self, request, project_id: int):
+        updated_at = Project.objects.filter(pk=project_id) \
+            .values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            return Response(status=HTTP_404_NOT_FOUND)
+        return self.conditional_response(
+            request=request,
+            version_key=(PROJECTS, project_id, updated_at),
+            last_modified=updated_at,
+            build_response=lambda: self.retrieve(request, project_id),
+        )
+
+    def retrieve(self, request, project_id: int):
+        fields = validate_fields_param(request.query_params, PROJECT_FIELDS)
         try:
-            project = Project.objects.prefetch_related('languages', 'technologies', 'team') \
+            project = ProjectSerializer.setup_eager_loading(Project.objects, fields) \
                 .get(pk=project_id)
         except Project.DoesNotExist:
             return Response(status=HTTP_404_NOT_FOUND)
-        serializer = ProjectSerializer(project)
+        serializer = ProjectSerializer(project, fields=fields)
         return Response(status=HTTP_200_OK, data=serializer.data)
 
 
+class ProjectsSearchApiView(APIView):
+    pagination_class = SearchPagination
+
+    def get(self, request):
+        fields = validate_fields_param(
+            request.query_params, SpecialistProjectSerializer.Meta.fields
+        )
+        filters = {
+            'type': validate_choice(request.query_params.get('type'), ProjectType.values, 'type'),
+            # private entities are never searchable, whoever asks
+            'is_private': False,
+        }
+        paginator = self.pagination_class()
+        project_ids = paginator.paginate_search(
+            index_name='projects',
+            query=validate_search_query(request.query_params.get('q')),
+            filters=filters,
+            request=request,
+        )
+        projects = SpecialistProjectSerializer.setup_eager_loading(Project.objects, fields) \
+            .in_bulk(project_ids)
+        serializer = SpecialistProjectSerializer(
+            [projects[project_id] for project_id in project_ids if project_id in projects],
+            many=True,
+            fields=fields,
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+
+class ProjectMatchingSpecialistsApiView(APIView):
+    'Specialists whose languages and technologies fit the project stack'
+
+    def get(self, request, project_id: int):
+        fields = validate_fields_param(
+            request.query_params, ProjectSpecialistSerializer.Meta.fields
+        )
+        if not Project.objects.filter(pk=project_id).exists():
+            return Response(status=HTTP_404_NOT_FOUND)
+        matches = match_specialists(
+            project_id=project_id,
+            limit=validate_limit(request.query_params.get('limit')),
+            direction=validate_choice(
+                request.query_params.get('direction'), Direction.values, 'direction'
+            ),
+        )
+        specialists = ProjectSpecialistSerializer.setup_eager_loading(Specialist.objects, fields) \
+            .in_bulk([specialist_id for specialist_id, _ in matches])
+        response_data = [
+            {
+                **ProjectSpecialistSerializer(specialists[specialist_id], fields=fields).data,
+                'overlap': overlap,
+            }
+            for specialist_id, overlap in matches if specialist_id in specialists
+        ]
+        return Response(status=HTTP_200_OK, data=response_data)
+
+
+class ProjectsLeaderboardApiView(LeaderboardMixin, APIView):
+    'Top rated public projects, overall or by type, language and technology'
+    leaderboard_name = 'projects'
+    label_param, label_choices = 'type', ProjectType.values
+
+    def get(self, request):
+        fields = validate_fields_param(
+            request.query_params, SpecialistProjectSerializer.Meta.fields
+        )
+        top = self.get_top(request)
+        projects = SpecialistProjectSerializer.setup_eager_loading(Project.objects, fields) \
+            .in_bulk([project_id for _, project_id, _ in top])
+        response_data = [
+            {'rank': rank, **SpecialistProjectSerializer(projects[project_id], fields=fields).data}
+            for rank, project_id, _ in top if project_id in projects
+        ]
+        return Response(status=HTTP_200_OK, data=response_data)
+
+
+class ProjectRankApiView(LeaderboardMixin, APIView):
+    'Position of a public project in the leaderboard of the requested scope'
+    leaderboard_name = 'projects'
+    label_param, label_choices = 'type', ProjectType.values
+
+    def get(self, request, project_id: int):
+        position = self.get_rank(request, project_id)
+        if position is None:
+            return Response(status=HTTP_404_NOT_FOUND)
+        rank, total = position
+        return Response(status=HTTP_200_OK, data={'id': project_id, 'rank': rank, 'total': total})
+
+
 class ProjectCreationApiView(APIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def post(self, request):
         serializer = ProjectCreationSerializer(data=request.data)
@@ -58,114 +207,89 @@ class ProjectCreationApiView(APIView):
 
 class ProjectUpdatingApiView(APIView):
     permission_classes = [IsAuthenticated, IsProjectOwner]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def patch(self, request, project_id: int):
-        project = Project.objects.get(pk=project_id)
+        project = get_request_context(request).get_project(project_id)
         serializer = ProjectUpdatingSerializer(instance=project, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(status=HTTP_200_OK)
 
 
-class ProjectLanguagesAddingApiView(APIView):
+class ProjectLanguagesAddingApiView(SkillsMixin, APIView):
     permission_classes = [IsAuthenticated, IsProjectOwner]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def patch(self, request, project_id: int):
         languages_from_body = request.data.get('languages')
         if languages_from_body:
-            new_languages = [Language.objects.filter(name__iexact=lang).first()
-                             for lang in languages_from_body]
-            project = Project.objects.get(pk=project_id)
-            exists_languages = project.languages.all()
-            languages_for_adding = [language for language in filter(
-                lambda lang: lang and lang not in exists_languages,
-                new_languages)]
-            project.languages.add(*languages_for_adding)
+            project = get_request_context(request).get_project(project_id)
+            self.add_skills(skills=project.languages, names=languages_from_body)
             return Response(status=HTTP_200_OK)
         return Response(status=HTTP_400_BAD_REQUEST)
 
 
-class ProjectLanguagesDeletionApiView(APIView):
+class ProjectLanguagesDeletionApiView(SkillsMixin, APIView):
     permission_classes = [IsAuthenticated, IsProjectOwner]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def patch(self, request, project_id: int):
         languages_from_body = request.data.get('languages')
         if languages_from_body:
-            supposed_languages = [Language.objects.filter(name__iexact=lang).first()
-                                  for lang in languages_from_body]
-            project = Project.objects.get(pk=project_id)
-            exists_languages = project.languages.all()
-            languages_for_deletion = [language for language in
-                                      filter(lambda lang: lang in exists_languages,
-                                             supposed_languages)]
-            project.languages.remove(*languages_for_deletion)
+            project = get_request_context(request).get_project(project_id)
+            self.remove_skills(skills=project.languages, names=languages_from_body)
             return Response(status=HTTP_200_OK)
         return Response(status=HTTP_400_BAD_REQUEST)
 
 
-class ProjectTechnologiesAddingApiView(APIView):
+class ProjectTechnologiesAddingApiView(SkillsMixin, APIView):
     permission_classes = [IsAuthenticated, IsProjectOwner]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def patch(self, request, project_id: int):
         technologies_from_body = request.data.get('technologies')
         if technologies_from_body:
-            new_technologies = [Technology.objects.filter(name__iexact=lang).first()
-                                for lang in technologies_from_body]
-            project = Project.objects.get(pk=project_id)
-            exists_technologies = project.technologies.all()
-            technologies_for_adding = [technology for technology in
-                                       filter(lambda tech: tech and tech not in exists_technologies,
-                                              new_technologies)]
-            project.technologies.add(*technologies_for_adding)
+            project = get_request_context(request).get_project(project_id)
+            self.add_skills(skills=project.technologies, names=technologies_from_body)
             return Response(status=HTTP_200_OK)
         return Response(status=HTTP_400_BAD_REQUEST)
 
 
-class ProjectTechnologiesDeletionApiView(APIView):
+class ProjectTechnologiesDeletionApiView(SkillsMixin, APIView):
     permission_classes = [IsAuthenticated, IsProjectOwner]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def patch(self, request, project_id: int):
         technologies_from_body = request.data.get('technologies')
         if technologies_from_body:
-            supposed_technologies = [Technology.objects.filter(name__iexact=lang).first()
-                                     for lang in technologies_from_body]
-            project = Project.objects.get(pk=project_id)
-            exists_technologies = project.technologies.all()
-            technologies_for_deletion = [technology for technology in
-                                         filter(lambda tech: tech in exists_technologies,
-                                                supposed_technologies)]
-            project.technologies.remove(*technologies_for_deletion)
+            project = get_request_context(request).get_project(project_id)
+            self.remove_skills(skills=project.technologies, names=technologies_from_body)
             return Response(status=HTTP_200_OK)
         return Response(status=HTTP_400_BAD_REQUEST)
 
 
 class ProjectDeletionApiView(APIView):
     permission_classes = [IsAuthenticated, IsProjectOwner]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def delete(self, request, project_id: int):
-        try:
-            project_for_delete = Project.objects.get(pk=project_id)
-            response_data = {'deleted_project_pk': project_for_delete.pk}
-            project_for_delete.delete()
-            return Response(status=HTTP_200_OK, data=response_data)
-        except Project.DoesNotExist:
+        project_for_delete = get_request_context(request).get_project(project_id)
+        if project_for_delete is None:
             return Response(status=HTTP_404_NOT_FOUND)
+        response_data = {'deleted_project_pk': project_for_delete.pk}
+        project_for_delete.delete()
+        return Response(status=HTTP_200_OK, data=response_data)
 
 
 class ProjectTakePartApiView(APIView):
     'Take part in one of own_project'
     permission_classes = [IsAuthenticated, IsProjectOwner]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def patch(self, request, project_id: int):
         with transaction.atomic():
-            new_current_project = Project.objects.get(pk=project_id)
+            new_current_project = get_request_context(request).get_project(project_id)
             specialist = request.user
             specialist.current_project = new_current_project
             specialist.projects.add(new_current_project)
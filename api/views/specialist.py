@@ -1,5 +1,5 @@
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.status import (
@@ -10,35 +10,197 @@ from rest_framework.status import (
 )
 from rest_framework.views import APIView
 
+from api.authentication import CachedTokenAuthentication
+from api.mixins import ConditionalGetMixin, LeaderboardMixin, SkillsMixin
+from api.pagination import SpecialistsKeysetPagination, SearchPagination
 from api.serializers.specialist import (
     SpecialistSerializer,
+    SpecialistProjectSerializer,
     SpecialistCreationSerializer,
     SpecialistAuthenticationSerializer,
     SpecialistUpdatingSerializer,
+    ages_changed_at,
 )
-from api.validators import validate_password
-from core.models import Specialist, Language, Technology
+from api.serializers.project import ProjectSpecialistSerializer
+from api.serializers.values import SPECIALIST_FIELDS, serialize_specialists, specialist_values
+from api.validators import (
+    validate_password,
+    validate_choice,
+    validate_count_range,
+    validate_facet_filters,
+    validate_facets_param,
+    validate_fields_param,
+    validate_limit,
+    validate_search_query,
+)
+from core.facets import SPECIALIST_FACETS, count_facets, filter_facets
+from core.matching import match_projects
+from core.metrics import AUTHENTICATIONS, inc
+from core.models import Specialist, Project
+from core.models.choices import Direction, ProjectType
+from core.versions import SPECIALISTS, get_collection_version
+
 
+class SpecialistsListApiView(ConditionalGetMixin, APIView):
+    read_from_replica = True
+    pagination_class = SpecialistsKeysetPagination
 
-class SpecialistsListApiView(APIView):
     def get(self, request):
-        specialists = Specialist.objects.prefetch_related('languages', 'technologies', 'projects')
-        serializer = SpecialistSerializer(specialists, many=True)
-        return Response(status=HTTP_200_OK, data=serializer.data)
+        version, updated_at = get_collection_version(SPECIALISTS)
+        ages_date = ages_changed_at()
+        return self.conditional_response(
+            request=request,
+            version_key=(SPECIALISTS, version, ages_date),
+            last_modified=max(updated_at, ages_date),
+            build_response=lambda: self.list(request),
+        )
 
+    def list(self, request):
+        params = request.query_params
+        fields = validate_fields_param(params, SPECIALIST_FIELDS)
+        selected = validate_facet_filters(params, SPECIALIST_FACETS)
+        facet_names = validate_facets_param(params, SPECIALIST_FACETS)
+        specialists = Specialist.objects.filter(
+            **validate_count_range(params, 'own_projects_count'),
+            **validate_count_range(params, 'rating'),
+        )
+        facets = count_facets(specialists, SPECIALIST_FACETS, selected, facet_names)
+
+        paginator = self.pagination_class()
+        columns = dict.fromkeys((*specialist_values(fields), *paginator.get_key_columns()))
+        page = paginator.paginate_queryset(
+            filter_facets(specialists, SPECIALIST_FACETS, selected).values(*columns),
+            request,
+            view=self,
+        )
+        response = paginator.get_paginated_response(serialize_specialists(page, fields))
+        if facet_names:
+            response.data['facets'] = facets
+        return response
 
-class SpecialistRetrieveApiView(APIView):
+
+class SpecialistRetrieveApiView(ConditionalGetMixin, APIView):
     def get(self, request, specialist_id: str):
+        updated_at = Specialist.objects.filter(pk=specialist_id) \
+            .values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            return Response(status=HTTP_404_NOT_FOUND)
+        ages_date = ages_changed_at()
+        return self.conditional_response(
+            request=request,
+            version_key=(SPECIALISTS, specialist_id, updated_at, ages_date),
+            last_modified=max(updated_at, ages_date),
+            build_response=lambda: self.retrieve(request, specialist_id),
+        )
+
+    def retrieve(self, request, specialist_id: str):
+        fields = validate_fields_param(request.query_params, SPECIALIST_FIELDS)
         try:
-            specialist = Specialist.objects.prefetch_related(
-                'languages', 'technologies', 'projects'
-            ).get(pk=specialist_id)
+            specialist = SpecialistSerializer.setup_eager_loading(Specialist.objects, fields) \
+                .get(pk=specialist_id)
         except Specialist.DoesNotExist:
             return Response(status=HTTP_404_NOT_FOUND)
-        serializer = SpecialistSerializer(specialist)
+        serializer = SpecialistSerializer(specialist, fields=fields)
         return Response(status=HTTP_200_OK, data=serializer.data)
 
 
+class SpecialistsSearchApiView(APIView):
+    pagination_class = SearchPagination
+
+    def get(self, request):
+        fields = validate_fields_param(
+            request.query_params, ProjectSpecialistSerializer.Meta.fields
+        )
+        filters = {
+            'direction': validate_choice(
+                request.query_params.get('direction'), Direction.values, 'direction'
+            ),
+            # private entities are never searchable, whoever asks
+            'is_private': False,
+        }
+        paginator = self.pagination_class()
+        specialist_ids = paginator.paginate_search(
+            index_name='specialists',
+            query=validate_search_query(request.query_params.get('q')),
+            filters=filters,
+            request=request,
+        )
+        specialists = ProjectSpecialistSerializer.setup_eager_loading(Specialist.objects, fields) \
+            .in_bulk(specialist_ids)
+        serializer = ProjectSpecialistSerializer(
+            [specialists[specialist_id] for specialist_id in specialist_ids
+             if specialist_id in specialists],
+            many=True,
+            fields=fields,
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+
+class SpecialistMatchingProjectsApiView(APIView):
+    'Public projects whose stack fits the specialist languages and technologies'
+
+    def get(self, request, specialist_id: int):
+        fields = validate_fields_param(
+            request.query_params, SpecialistProjectSerializer.Meta.fields
+        )
+        if not Specialist.objects.filter(pk=specialist_id).exists():
+            return Response(status=HTTP_404_NOT_FOUND)
+        matches = match_projects(
+            specialist_id=specialist_id,
+            limit=validate_limit(request.query_params.get('limit')),
+            project_type=validate_choice(
+                request.query_params.get('type'), ProjectType.values, 'type'
+            ),
+        )
+        projects = SpecialistProjectSerializer.setup_eager_loading(Project.objects, fields) \
+            .in_bulk([project_id for project_id, _ in matches])
+        response_data = [
+            {
+                **SpecialistProjectSerializer(projects[project_id], fields=fields).data,
+                'overlap': overlap,
+            }
+            for project_id, overlap in matches if project_id in projects
+        ]
+        return Response(status=HTTP_200_OK, data=response_data)
+
+
+class SpecialistsLeaderboardApiView(LeaderboardMixin, APIView):
+    'Top rated specialists, overall or by direction, language and technology'
+    leaderboard_name = 'specialists'
+    label_param, label_choices = 'direction', Direction.values
+
+    def get(self, request):
+        fields = validate_fields_param(
+            request.query_params, ProjectSpecialistSerializer.Meta.fields
+        )
+        top = self.get_top(request)
+        specialists = ProjectSpecialistSerializer.setup_eager_loading(Specialist.objects, fields) \
+            .in_bulk([specialist_id for _, specialist_id, _ in top])
+        response_data = [
+            {
+                'rank': rank,
+                **ProjectSpecialistSerializer(specialists[specialist_id], fields=fields).data,
+            }
+            for rank, specialist_id, _ in top if specialist_id in specialists
+        ]
+        return Response(status=HTTP_200_OK, data=response_data)
+
+
+class SpecialistRankApiView(LeaderboardMixin, APIView):
+    'Position of a specialist in the leaderboard of the requested scope'
+    leaderboard_name = 'specialists'
+    label_param, label_choices = 'direction', Direction.values
+
+    def get(self, request, specialist_id: int):
+        position = self.get_rank(request, specialist_id)
+        if position is None:
+            return Response(status=HTTP_404_NOT_FOUND)
+        rank, total = position
+        return Response(
+            status=HTTP_200_OK, data={'id': specialist_id, 'rank': rank, 'total': total}
+        )
+
+
 class SpecialistCreationApiView(APIView):
     def post(self, request):
         serializer = SpecialistCreationSerializer(data=request.data)
@@ -58,7 +220,9 @@ class SpecialistCreationApiView(APIView):
 class SpecialistAuthenticationApiView(APIView):
     def post(self, request):
         serializer = SpecialistAuthenticationSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        if not serializer.is_valid():
+            inc(AUTHENTICATIONS, 'password', 'failure')
+            raise ValidationError(serializer.errors)
 
         try:
             specialist = Specialist.objects.get(nickname=serializer.validated_data['nickname'])
@@ -66,6 +230,7 @@ class SpecialistAuthenticationApiView(APIView):
             return Response(status=HTTP_404_NOT_FOUND)
 
         token = Token.objects.get(user=specialist)
+        inc(AUTHENTICATIONS, 'password', 'success')
         specialist = SpecialistSerializer(specialist)
         response_data = {
             **specialist.data,
@@ -76,7 +241,7 @@ class SpecialistAuthenticationApiView(APIView):
 
 class SpecialistUpdatingApiView(APIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def patch(self, request):
         serializer = SpecialistUpdatingSerializer(
@@ -91,7 +256,7 @@ class SpecialistUpdatingApiView(APIView):
 
 class SpecialistUpdatingPasswordApiView(APIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def patch(self, request):
         new_password = request.data.get('password')
@@ -103,83 +268,55 @@ class SpecialistUpdatingPasswordApiView(APIView):
         return Response(status=HTTP_400_BAD_REQUEST)
 
 
-class SpecialistLanguagesAddingApiView(APIView):
+class SpecialistLanguagesAddingApiView(SkillsMixin, APIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def patch(self, request):
-        languages_from_body = set(request.data.get('languages'))
+        languages_from_body = request.data.get('languages')
         if languages_from_body:
-            specialist = request.user
-            current_specialist_languages = specialist.languages.all()
-            new_languages = [Language.objects.filter(name__iexact=lang).first()
-                             for lang in languages_from_body]
-            languages_for_adding = [language for language in filter(
-                lambda lang: lang and lang not in current_specialist_languages,
-                new_languages)]
-            specialist.languages.add(*languages_for_adding)
+            self.add_skills(skills=request.user.languages, names=languages_from_body)
         return Response(status=HTTP_200_OK)
 
 
-class SpecialistLanguagesDeletionApiView(APIView):
+class SpecialistLanguagesDeletionApiView(SkillsMixin, APIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def patch(self, request):
-        languages_from_body = set(request.data.get('languages'))
+        languages_from_body = request.data.get('languages')
         if languages_from_body:
-            specialist = request.user
-            current_specialist_languages = specialist.languages.all()
-            supposed_languages = [Language.objects.filter(name__iexact=lang).first()
-                                  for lang in languages_from_body]
-            languages_for_deletion = [language for language in
-                                      filter(lambda lang: lang in current_specialist_languages,
-                                             supposed_languages)]
-            specialist.languages.remove(*languages_for_deletion)
+            self.remove_skills(skills=request.user.languages, names=languages_from_body)
         return Response(status=HTTP_200_OK)
 
 
-class SpecialistTechnologiesAddingApiView(APIView):
+class SpecialistTechnologiesAddingApiView(SkillsMixin, APIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def patch(self, request):
-        technologies_from_body = set(request.data.get('technologies'))
+        technologies_from_body = request.data.get('technologies')
         if technologies_from_body:
-            specialist = request.user
-            current_specialist_technologies = specialist.technologies.all()
-            new_technologies = [Technology.objects.filter(name__iexact=tech).first()
-                                for tech in technologies_from_body]
-            technologies_for_adding = [technology for technology in filter(
-                lambda tech: tech and tech not in current_specialist_technologies,
-                new_technologies)]
-            specialist.technologies.add(*technologies_for_adding)
+            self.add_skills(skills=request.user.technologies, names=technologies_from_body)
             return Response(status=HTTP_200_OK)
         return Response(status=HTTP_400_BAD_REQUEST)
 
 
-class SpecialistTechnologiesDeletionApiView(APIView):
+class SpecialistTechnologiesDeletionApiView(SkillsMixin, APIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def patch(self, request):
         technologies_from_body = request.data.get('technologies')
         if technologies_from_body:
-            supposed_technologies = [Technology.objects.filter(name__iexact=lang).first()
-                                     for lang in technologies_from_body]
-            specialist = request.user
-            exists_technologies = specialist.technologies.all()
-            technologies_for_deletion = [technology for technology in
-                                         filter(lambda tech: tech in exists_technologies,
-                                                supposed_technologies)]
-            specialist.technologies.remove(*technologies_for_deletion)
+            self.remove_skills(skills=request.user.technologies, names=technologies_from_body)
             return Response(status=HTTP_200_OK)
         return Response(status=HTTP_400_BAD_REQUEST)
 
 
 class SpecialistDeletionApiView(APIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def delete(self, request):
         specialist = request.user
@@ -1,17 +1,25 @@
-from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.status import HTTP_200_OK
 
-from core.models import Language, Technology
+from api.responses import PrerenderedResponse
+from core.catalog import get_catalog
 
 
 class LanguagesListApiView(APIView):
     def get(self, request):
-        languages = list(Language.objects.all().values_list('name', flat=True))
-        return Response(status=HTTP_200_OK, data=languages)
+        languages = get_catalog().languages
+        return PrerenderedResponse(
+            status=HTTP_200_OK,
+            data=list(languages.items),
+            json_content=languages.content,
+        )
 
 
 class TechnologiesListApiView(APIView):
     def get(self, request):
-        technologies = list(Technology.objects.all().values('name', 'type'))
-        return Response(status=HTTP_200_OK, data=technologies)
+        technologies = get_catalog().technologies
+        return PrerenderedResponse(
+            status=HTTP_200_OK,
+            data=list(technologies.items),
+            json_content=technologies.content,
+        )
@@ -21,6 +21,9 @@ DEBUG = ENV['DEBUG']
 
 ALLOWED_HOSTS = []
 
+# Addresses allowed to read internal endpoints like /metrics
+INTERNAL_IPS = ['127.0.0.1', '::1']
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -38,6 +41,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
+    'api.replicas.ReplicaMiddleware',
+    'api.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -77,9 +83,36 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # connections are reused across requests, so their pragmas run once per connection
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Read replicas of the default database (core.routers): env.json REPLICAS lists their SQLite
+# files, `manage.py sync_replicas` keeps them in sync locally
+DATABASE_REPLICAS = []
+for index, replica_name in enumerate(ENV.get('REPLICAS', []), start=1):
+    DATABASE_REPLICAS.append(f'replica{index}')
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        'NAME': replica_name,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Seconds reads of a client go to the primary after it wrote something
+REPLICA_PIN_SECONDS = 10
+
+# Seconds the result of a replica health check is reused
+REPLICA_HEALTH_CHECK_INTERVAL = 5
+
+# Pragmas run on every new SQLite connection (core.database): the SQLITE_PROFILE profile with
+# SQLITE_PRAGMAS on top of it
+SQLITE_PROFILE = ENV.get('SQLITE_PROFILE', 'production')
+SQLITE_PRAGMAS = {}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -110,7 +143,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny'
     ],
     'DEFAULT_RENDERER_CLASSES': (
-        'djangorestframework_camel_case.render.CamelCaseJSONRenderer',
+        'api.renderers.CamelCaseJSONRenderer',
         'djangorestframework_camel_case.render.CamelCaseBrowsableAPIRenderer',
     ),
     'DEFAULT_PARSER_CLASSES': (
@@ -124,9 +157,63 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.CachedTokenAuthentication',
     ],
     'TEST_REQUEST_DEFAULT_FORMAT': 'json',
 }
 
 CORS_ALLOW_ALL_ORIGINS = True
+
+# Seconds an in-memory catalog snapshot (core.catalog) may live without being rebuilt
+CATALOG_CACHE_TTL = 300
+
+# Seconds the in-memory skills matching index (core.matching) may live without being rebuilt
+MATCHING_INDEX_TTL = 300
+
+# Seconds the in-memory rating leaderboards (core.leaderboard) may live without being rebuilt
+LEADERBOARD_TTL = 300
+
+# Seconds a token -> specialist lookup (core.token_cache) may be served from memory. Changes are
+# invalidated right away in the process making them only, other workers keep authenticating a
+# deleted specialist or token, and see a stale specialist (e.g. current_project), for up to
+# this long
+TOKEN_CACHE_TTL = 5
+
+# Maximum number of cached tokens, least recently used ones are evicted first
+TOKEN_CACHE_SIZE = 10000
+
+# Seconds a job claimed by a worker (core.jobs) stays invisible to other workers, after that
+# it is considered abandoned and claimed again
+JOB_VISIBILITY_TIMEOUT = 300
+
+# Attempts of a failing job, the n-th retry is delayed by JOB_RETRY_DELAY * 2 ** (n - 1) seconds
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_DELAY = 10
+
+# Jobs one `manage.py run_jobs` worker runs at the same time
+JOB_CONCURRENCY = 4
+
+# Seconds an idle worker waits before polling the queue again
+JOB_POLL_INTERVAL = 1
+
+# Share of the API requests profiled by api.profiling.ProfilingMiddleware, 0 turns it off
+PROFILING_SAMPLE_RATE = 0
+
+# Profiled requests at least that many milliseconds long are written to PROFILING_LOG_FILE
+PROFILING_THRESHOLD_MS = 0
+
+# Trace the allocation peak of profiled requests, slows them down a lot
+PROFILING_TRACE_MEMORY = False
+
+# Rotating log of profiled requests, one JSON object per line
+PROFILING_LOG_FILE = BASE_DIR / 'profiling.log'
+PROFILING_LOG_MAX_BYTES = 10 * 2 ** 20
+PROFILING_LOG_BACKUP_COUNT = 3
+
+# Collect the metrics served by /metrics (core.metrics)
+METRICS_ENABLED = True
+
+# Directory the worker processes share their metrics snapshots through, written at most every
+# METRICS_FLUSH_INTERVAL seconds; unset, /metrics shows the serving process only
+METRICS_DIR = ENV.get('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = 5
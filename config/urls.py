@@ -2,9 +2,12 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 
+from api.views.metrics import MetricsApiView
+
 
 urlpatterns = [
     path('api/', include('api.urls')),
+    path('metrics', MetricsApiView.as_view(), name='metrics'),
 ]
 
 if settings.DEBUG:
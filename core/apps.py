@@ -1,6 +1,25 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+
+
+def reinstall_search_triggers(sender, using, **kwargs):
+    from core.search import install_search_triggers
+    install_search_triggers(connection=connections[using])
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        from core.database import apply_sqlite_pragmas, get_sqlite_pragmas
+        apply_sqlite_pragmas(connection.connection, get_sqlite_pragmas())
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from core import signals  # noqa: F401
+        post_migrate.connect(reinstall_search_triggers, sender=self)
+        connection_created.connect(configure_sqlite_connection)
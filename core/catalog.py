@@ -0,0 +1,101 @@
+import json
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+from django.conf import settings
+from django.db import models
+
+from core.metrics import CACHE_LOOKUPS, inc
+from core.models import Language, Technology
+from core.routers import read_from_primary
+
+
+@dataclass(frozen=True)
+class CatalogSection:
+    items: tuple
+    ids_by_name: Mapping[str, int]
+    names_by_id: Mapping[int, str]
+    content: bytes
+
+    def resolve(self, names) -> set[int]:
+        'Map names to catalog ids case-insensitively, unknown names are skipped'
+        return {self.ids_by_name[name.lower()] for name in names
+                if type(name) is str and name.lower() in self.ids_by_name}
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    languages: CatalogSection
+    technologies: CatalogSection
+    built_at: float
+
+    def section(self, model: type[models.Model]) -> CatalogSection:
+        if model is Language:
+            return self.languages
+        if model is Technology:
+            return self.technologies
+        raise LookupError(f'{model.__name__} is not a catalog model')
+
+
+_snapshot: CatalogSnapshot | None = None
+_lock = threading.Lock()
+
+
+def get_catalog() -> CatalogSnapshot:
+    """
+    Return the current catalog snapshot, building it on first access.
+
+    The snapshot is invalidated by signals in this process; CATALOG_CACHE_TTL bounds how long
+    changes made by other worker processes stay invisible.
+    """
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot is None or time.monotonic() - snapshot.built_at > _ttl():
+        with _lock:
+            snapshot = _snapshot
+            if snapshot is None or time.monotonic() - snapshot.built_at > _ttl():
+                # the snapshot serves write paths too, it must not be built from a stale replica
+                with read_from_primary():
+                    snapshot = _snapshot = _build_snapshot()
+                inc(CACHE_LOOKUPS, 'catalog', 'miss')
+                return snapshot
+    inc(CACHE_LOOKUPS, 'catalog', 'hit')
+    return snapshot
+
+
+def invalidate_catalog() -> None:
+    global _snapshot
+    _snapshot = None
+
+
+def _ttl() -> float:
+    return getattr(settings, 'CATALOG_CACHE_TTL', 300)
+
+
+def _build_snapshot() -> CatalogSnapshot:
+    languages = tuple(Language.objects.order_by('id').values_list('id', 'name'))
+    technologies = tuple(Technology.objects.order_by('id').values_list('id', 'name', 'type'))
+    return CatalogSnapshot(
+        languages=_build_section(
+            rows=list(languages),
+            items=tuple(name for _, name in languages),
+        ),
+        technologies=_build_section(
+            rows=[(pk, name) for pk, name, _ in technologies],
+            items=tuple({'name': name, 'type': kind} for _, name, kind in technologies),
+        ),
+        built_at=time.monotonic(),
+    )
+
+
+def _build_section(rows: list[tuple[int, str]], items: tuple) -> CatalogSection:
+    content = json.dumps(items, ensure_ascii=False, separators=(',', ':')).encode()
+    return CatalogSection(
+        items=items,
+        ids_by_name=MappingProxyType({name.lower(): pk for pk, name in rows}),
+        names_by_id=MappingProxyType(dict(rows)),
+        content=content,
+    )
@@ -0,0 +1,95 @@
+"""
+Counter columns of projects and specialists mirroring the rows of their through tables.
+
+Receivers in core.signals shift the counters with F() expressions in the transaction of the
+write: rows added through m2m managers on `post_add`, rows created one by one on `post_save`,
+rows removed through m2m managers on `pre_remove`/`pre_clear`, and rows cascading from a deleted
+project, specialist or skill on its `pre_delete`. Removed rows are uncounted with one grouped
+UPDATE per counter before they are deleted, and the through models have no delete receivers, so
+cascades keep deleting them with one query. Bulk writes and queryset deletes of through rows
+skip the signals and recount the rows they touched with `recount_counters`, which
+`manage.py recount` also uses to repair drift.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.apps import apps as installed_apps
+from django.db.models import Count, F, IntegerField, Model, OuterRef, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from core.jobs import job
+
+
+@dataclass(frozen=True)
+class CounterColumn:
+    # names of core models, resolved through the app registry when the counters are shifted
+    model: str
+    through: str
+    # foreign key of the through model to the row holding the counter
+    owner_field: str
+    column: str
+
+    def through_model(self) -> type[Model]:
+        return installed_apps.get_model('core', self.through)
+
+
+COUNTERS = (
+    CounterColumn('Project', 'ProjectTeam', 'project', 'team_count'),
+    CounterColumn('Project', 'ProjectLanguage', 'project', 'languages_count'),
+    CounterColumn('Project', 'ProjectTechnology', 'project', 'technologies_count'),
+    CounterColumn('Specialist', 'SpecialistProject', 'specialist', 'projects_count'),
+    CounterColumn('Specialist', 'SpecialistOwnProject', 'specialist', 'own_projects_count'),
+    CounterColumn('Specialist', 'SpecialistLanguage', 'specialist', 'languages_count'),
+    CounterColumn('Specialist', 'SpecialistTechnology', 'specialist', 'technologies_count'),
+)
+
+
+def shift_counter(counter: CounterColumn, deltas: dict[int, int]) -> None:
+    'Add deltas to the counters of rows by id, one UPDATE per distinct delta'
+    ids_by_delta = defaultdict(list)
+    for pk, delta in deltas.items():
+        if delta:
+            ids_by_delta[delta].append(pk)
+    model = installed_apps.get_model('core', counter.model)
+    for delta, ids in ids_by_delta.items():
+        model.objects.filter(pk__in=ids).update(**{
+            counter.column: Greatest(F(counter.column) + delta, Value(0)),
+        })
+
+
+def uncount_rows(counter: CounterColumn, rows: QuerySet) -> None:
+    'Subtract the through rows of the queryset from the counters of their owners, one UPDATE'
+    model = installed_apps.get_model('core', counter.model)
+    counts = rows.filter(**{counter.owner_field: OuterRef('pk')}).order_by() \
+        .values(counter.owner_field).annotate(count=Count('id')).values('count')
+    model.objects.filter(pk__in=rows.values(counter.owner_field)).update(**{
+        counter.column: Greatest(
+            F(counter.column) - Subquery(counts, output_field=IntegerField()), Value(0)
+        ),
+    })
+
+
+@job('recount_counters')
+def recount_counters(model: str | None = None, ids: list[int] | None = None) -> int:
+    """
+    Set the counters of all projects and specialists, or of the ids of one model, from the
+    through tables. Returns the number of updated rows.
+    """
+    updated = 0
+    for model_name in ('Project', 'Specialist'):
+        if model is not None and model != model_name:
+            continue
+        queryset = installed_apps.get_model('core', model_name).objects.all()
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        updated += queryset.update(**{
+            counter.column: _count(counter.through_model(), counter.owner_field)
+            for counter in COUNTERS if counter.model == model_name
+        })
+    return updated
+
+
+def _count(through: type[Model], owner_field: str) -> Coalesce:
+    counts = through.objects.filter(**{owner_field: OuterRef('pk')}).order_by() \
+        .values(owner_field).annotate(count=Count('id')).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
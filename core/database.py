@@ -0,0 +1,41 @@
+"""
+SQLite connection profiles.
+
+Out of the box SQLite keeps a rollback journal, so a committing writer locks out every reader,
+fsyncs on every commit, fails at once with `database is locked` when another connection holds
+the write lock and caches 2MB of pages. A profile is a set of pragmas run on every new
+connection by the `connection_created` hook in core.apps; with persistent connections
+(CONN_MAX_AGE) that happens once per connection, not per request.
+"""
+from django.conf import settings
+
+SQLITE_PROFILES = {
+    # library defaults, kept for comparison in benchmarks
+    'default': {},
+    'production': {
+        # readers and the writer don't block each other, the journal file stays in place
+        'journal_mode': 'WAL',
+        # in WAL mode fsync only at checkpoints: a power loss may drop the last commits, but
+        # never corrupts the database
+        'synchronous': 'NORMAL',
+        # milliseconds a connection waits for the write lock before `database is locked`
+        'busy_timeout': 20000,
+        # read the database through a memory map instead of read() calls
+        'mmap_size': 256 * 2 ** 20,
+        # page cache per connection, negative values are KiB
+        'cache_size': -64 * 2 ** 10,
+        'temp_store': 'MEMORY',
+    },
+}
+
+
+def get_sqlite_pragmas() -> dict:
+    'Pragmas of SQLITE_PROFILE with SQLITE_PRAGMAS on top of them'
+    profile = getattr(settings, 'SQLITE_PROFILE', 'default')
+    return {**SQLITE_PROFILES[profile], **getattr(settings, 'SQLITE_PRAGMAS', {})}
+
+
+def apply_sqlite_pragmas(connection, pragmas: dict) -> None:
+    'Run the pragmas on a DB-API sqlite3 connection'
+    for name, value in pragmas.items():
+        connection.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,93 @@
+"""
+Faceted filtering of the project and specialist lists.
+
+A facet is a column of the entity (type, direction, country, city) or a skill through table
+(languages, technologies). Filters are ANDed across facets and ORed within one. Counts of a facet
+come from one grouped query over the entities matching every other filter, so selecting a value
+doesn't hide the alternatives of the same facet. Column facets are backed by (column, id)
+indexes, which SQLite scans without touching the table rows, skill facets by the through table
+constraints.
+"""
+from dataclasses import dataclass
+
+from django.db.models import Count, Exists, Model, OuterRef, Q, QuerySet
+
+from core.catalog import get_catalog
+from core.models.choices import Direction, ProjectType
+from core.models.project import ProjectLanguage, ProjectTechnology
+from core.models.specialist import SpecialistLanguage, SpecialistTechnology
+
+
+@dataclass(frozen=True)
+class ColumnFacet:
+    name: str
+    # allowed values, None for free text columns
+    choices: tuple | None = None
+
+    def condition(self, values: list) -> Q:
+        return Q(**{f'{self.name}__in': values})
+
+    def counts(self, queryset: QuerySet) -> dict[str, int]:
+        rows = queryset.order_by().values_list(self.name).annotate(count=Count('id'))
+        return {value: count for value, count in rows if value}
+
+
+@dataclass(frozen=True)
+class SkillFacet:
+    name: str
+    # catalog section of the skills, values are catalog ids
+    section: str
+    through: type[Model]
+    entity_field: str
+    skill_field: str
+
+    def condition(self, values: list) -> Q:
+        return Q(Exists(self.through.objects.filter(**{
+            self.entity_field: OuterRef('pk'), f'{self.skill_field}__in': values,
+        })))
+
+    def counts(self, queryset: QuerySet) -> dict[str, int]:
+        rows = self.through.objects \
+            .filter(**{f'{self.entity_field}__in': queryset.order_by().values('pk')}) \
+            .order_by().values_list(f'{self.skill_field}_id').annotate(count=Count('id'))
+        names = getattr(get_catalog(), self.section).names_by_id
+        return {names[skill_id]: count for skill_id, count in rows if skill_id in names}
+
+
+PROJECT_FACETS = (
+    ColumnFacet('type', choices=tuple(ProjectType.values)),
+    SkillFacet('language', 'languages', ProjectLanguage, 'project', 'language'),
+    SkillFacet('technology', 'technologies', ProjectTechnology, 'project', 'technology'),
+)
+SPECIALIST_FACETS = (
+    ColumnFacet('direction', choices=tuple(Direction.values)),
+    SkillFacet('language', 'languages', SpecialistLanguage, 'specialist', 'language'),
+    SkillFacet('technology', 'technologies', SpecialistTechnology, 'specialist', 'technology'),
+    ColumnFacet('country'),
+    ColumnFacet('city'),
+)
+
+
+def filter_facets(queryset: QuerySet, facets: tuple, selected: dict[str, list]) -> QuerySet:
+    'Entities having one of the selected values of every facet'
+    for facet in facets:
+        if facet.name in selected:
+            queryset = queryset.filter(facet.condition(selected[facet.name]))
+    return queryset
+
+
+def count_facets(queryset: QuerySet, facets: tuple, selected: dict[str, list],
+                 names: list[str]) -> dict[str, list[dict]]:
+    """
+    {'value', 'count'} items of the named facets, most frequent values first, each counted under
+    the selected values of the other facets. Values are items rather than keys, the camel case
+    renderer would rewrite keys like `New_York`.
+    """
+    counts = {}
+    for facet in facets:
+        if facet.name in names:
+            others = {name: values for name, values in selected.items() if name != facet.name}
+            value_counts = facet.counts(filter_facets(queryset, facets, others))
+            ordered = sorted(value_counts.items(), key=lambda item: (-item[1], item[0]))
+            counts[facet.name] = [{'value': value, 'count': count} for value, count in ordered]
+    return counts
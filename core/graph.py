@@ -0,0 +1,347 @@
+"""
+Streaming export and import of the specialist/project/offer graph as NDJSON records.
+
+Every record names its `model` and references other records by natural keys (specialist
+nickname, project name, skill name); specialists come first, then projects with all their
+relations, then offers. Both directions
+work on batches of `batch_size` rows, so memory use doesn't depend on the size of the graph:
+exported batches are read with keyset queries, imported batches resolve the natural keys they
+reference with one query per model and are written with `bulk_create`.
+
+Importing merges into existing rows by natural key; bulk writes skip model signals, so derived
+state (pending offer counters, collection versions, the matching index) is refreshed once at
+the end of `import_graph`.
+"""
+import json
+from collections import Counter, defaultdict
+from itertools import groupby, islice
+from typing import IO, Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Model
+from rest_framework.authtoken.models import Token
+
+from core.catalog import get_catalog
+from core.counters import recount_counters
+from core.leaderboard import invalidate_leaderboards
+from core.matching import invalidate_matching_index
+from core.models import Offer, Project, Specialist
+from core.models.project import ProjectLanguage, ProjectTeam, ProjectTechnology
+from core.models.specialist import (
+    SpecialistLanguage,
+    SpecialistOwnProject,
+    SpecialistProject,
+    SpecialistTechnology,
+)
+from core.offers import recount_pending_offers
+from core.versions import PROJECTS, SPECIALISTS, bump_collections
+
+BATCH_SIZE = 2000
+
+SPECIALIST_FIELDS = (
+    'nickname', 'github_nickname', 'password', 'direction', 'rating', 'name', 'surname',
+    'born_date', 'about', 'country', 'city', 'email', 'github', 'is_private',
+)
+PROJECT_FIELDS = (
+    'name', 'github_name', 'description', 'version', 'type', 'is_private', 'start_date',
+    'rating', 'github',
+)
+OFFER_FIELDS = ('type', 'response')
+
+
+def export_graph(batch_size: int = BATCH_SIZE) -> Iterator[dict]:
+    yield from _export_specialists(batch_size)
+    yield from _export_projects(batch_size)
+    yield from _export_offers(batch_size)
+
+
+def import_graph(records: Iterable[dict], batch_size: int = BATCH_SIZE) -> Counter:
+    """
+    Write the records in one transaction, returns the number of rows per model sent to the
+    database.
+    """
+    counts = Counter()
+    importers = {
+        'specialist': _import_specialists,
+        'project': _import_projects,
+        'offer': _import_offers,
+    }
+    with transaction.atomic():
+        for model, group in groupby(records, key=lambda record: record['model']):
+            if model not in importers:
+                raise ValueError(f'unknown record model {model}')
+            for batch in _chunks(group, batch_size):
+                counts.update(importers[model](batch))
+
+        refresh_derived_state()
+    return counts
+
+
+def refresh_derived_state() -> None:
+    'Bring state maintained by model signals up to date after bulk writes, which skip them'
+    recount_pending_offers()
+    recount_counters()
+    bump_collections(PROJECTS, SPECIALISTS)
+    transaction.on_commit(invalidate_matching_index)
+    invalidate_matching_index()
+    transaction.on_commit(invalidate_leaderboards)
+    invalidate_leaderboards()
+
+
+def write_ndjson(records: Iterable[dict], file: IO[str]) -> int:
+    count = 0
+    for record in records:
+        file.write(json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+def read_ndjson(file: IO[str]) -> Iterator[dict]:
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            raise ValueError(f'invalid record on line {line_number}: {error}')
+
+
+def update_column(model: type[Model], field_name: str, values: list[tuple[int, object]]) -> None:
+    """
+    Set a column of many rows by id with one executemany, which unlike `bulk_update` doesn't
+    compile a CASE expression over the whole batch.
+    """
+    if not values:
+        return
+    field = model._meta.get_field(field_name)
+    quote = connection.ops.quote_name
+    sql = f'UPDATE {quote(model._meta.db_table)} SET {quote(field.column)} = %s ' \
+          f'WHERE {quote(model._meta.pk.column)} = %s'
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [
+            (field.get_db_prep_save(value, connection), pk) for pk, value in values
+        ])
+
+
+def _export_specialists(batch_size: int) -> Iterator[dict]:
+    catalog = get_catalog()
+    for rows in _batches(Specialist.objects.values('id', *SPECIALIST_FIELDS), batch_size):
+        ids = [row['id'] for row in rows]
+        languages = _grouped(SpecialistLanguage.objects.filter(specialist_id__in=ids)
+                             .values_list('specialist_id', 'language_id'))
+        technologies = _grouped(SpecialistTechnology.objects.filter(specialist_id__in=ids)
+                                .values_list('specialist_id', 'technology_id'))
+        for row in rows:
+            specialist_id = row.pop('id')
+            yield {
+                'model': 'specialist',
+                **row,
+                'languages': sorted(catalog.languages.names_by_id[pk]
+                                    for pk in languages[specialist_id]),
+                'technologies': sorted(catalog.technologies.names_by_id[pk]
+                                       for pk in technologies[specialist_id]),
+            }
+
+
+def _export_projects(batch_size: int) -> Iterator[dict]:
+    catalog = get_catalog()
+    projects = Project.objects.values('id', 'owner__nickname', *PROJECT_FIELDS)
+    for rows in _batches(projects, batch_size):
+        ids = [row['id'] for row in rows]
+        languages = _grouped(ProjectLanguage.objects.filter(project_id__in=ids)
+                             .values_list('project_id', 'language_id'))
+        technologies = _grouped(ProjectTechnology.objects.filter(project_id__in=ids)
+                                .values_list('project_id', 'technology_id'))
+        relations = {
+            'team': ProjectTeam.objects.filter(project_id__in=ids)
+            .values_list('project_id', 'specialist__nickname'),
+            'members': SpecialistProject.objects.filter(project_id__in=ids)
+            .values_list('project_id', 'specialist__nickname'),
+            'owners': SpecialistOwnProject.objects.filter(own_project_id__in=ids)
+            .values_list('own_project_id', 'specialist__nickname'),
+            'current_members': Specialist.objects.filter(current_project_id__in=ids)
+            .values_list('current_project_id', 'nickname'),
+        }
+        relations = {name: _grouped(pairs) for name, pairs in relations.items()}
+        for row in rows:
+            project_id = row.pop('id')
+            owner = row.pop('owner__nickname')
+            yield {
+                'model': 'project',
+                **row,
+                'owner': owner,
+                'languages': sorted(catalog.languages.names_by_id[pk]
+                                    for pk in languages[project_id]),
+                'technologies': sorted(catalog.technologies.names_by_id[pk]
+                                       for pk in technologies[project_id]),
+                **{name: sorted(related[project_id]) for name, related in relations.items()},
+            }
+
+
+def _export_offers(batch_size: int) -> Iterator[dict]:
+    offers = Offer.objects.values(
+        'id', 'sender__nickname', 'recipient__nickname', 'project__name', *OFFER_FIELDS
+    )
+    for rows in _batches(offers, batch_size):
+        for row in rows:
+            yield {
+                'model': 'offer',
+                'sender': row['sender__nickname'],
+                'recipient': row['recipient__nickname'],
+                'project': row['project__name'],
+                **{field: row[field] for field in OFFER_FIELDS},
+            }
+
+
+def _import_specialists(records: list[dict]) -> Counter:
+    catalog = get_catalog()
+    created = Specialist.objects.bulk_create([
+        Specialist(**{field: record[field] for field in SPECIALIST_FIELDS if field in record})
+        for record in records
+    ], ignore_conflicts=True)
+    ids = _ids(Specialist, 'nickname', {record['nickname'] for record in records})
+    tokens = Token.objects.bulk_create([
+        Token(key=Token.generate_key(), user_id=specialist_id) for specialist_id in ids.values()
+    ], ignore_conflicts=True)
+
+    languages, technologies = [], []
+    for record in records:
+        specialist_id = ids[record['nickname']]
+        languages.extend(
+            SpecialistLanguage(specialist_id=specialist_id, language_id=language_id)
+            for language_id in catalog.languages.resolve(record.get('languages', ()))
+        )
+        technologies.extend(
+            SpecialistTechnology(specialist_id=specialist_id, technology_id=technology_id)
+            for technology_id in catalog.technologies.resolve(record.get('technologies', ()))
+        )
+    return Counter({
+        Specialist: len(created),
+        Token: len(tokens),
+        SpecialistLanguage: len(_create(languages)),
+        SpecialistTechnology: len(_create(technologies)),
+    })
+
+
+def _import_projects(records: list[dict]) -> Counter:
+    catalog = get_catalog()
+    nicknames = set()
+    for record in records:
+        nicknames.add(record['owner'])
+        for relation in ('team', 'members', 'owners', 'current_members'):
+            nicknames.update(record.get(relation, ()))
+    specialist_ids = _ids(Specialist, 'nickname', nicknames)
+    names = {record['name'] for record in records}
+    existing = set(Project.objects.filter(name__in=names).values_list('name', flat=True))
+    new_records = [record for record in records if record['name'] not in existing]
+
+    created = Project.objects.bulk_create([
+        Project(
+            owner_id=specialist_ids[record['owner']],
+            **{field: record[field] for field in PROJECT_FIELDS if field in record},
+        )
+        for record in new_records
+    ], ignore_conflicts=True)
+    project_ids = _ids(Project, 'name', names)
+    # start_date is auto_now_add, bulk_create overwrites it with the current date of the
+    # projects it creates, existing ones keep theirs
+    update_column(Project, 'start_date', [
+        (project_ids[record['name']], record['start_date'])
+        for record in new_records if record.get('start_date')
+    ])
+
+    rows, current_projects = defaultdict(list), []
+    for record in records:
+        project_id = project_ids[record['name']]
+        rows[ProjectLanguage].extend(
+            ProjectLanguage(project_id=project_id, language_id=language_id)
+            for language_id in catalog.languages.resolve(record.get('languages', ()))
+        )
+        rows[ProjectTechnology].extend(
+            ProjectTechnology(project_id=project_id, technology_id=technology_id)
+            for technology_id in catalog.technologies.resolve(record.get('technologies', ()))
+        )
+        rows[ProjectTeam].extend(
+            ProjectTeam(project_id=project_id, specialist_id=specialist_ids[nickname])
+            for nickname in record.get('team', ())
+        )
+        rows[SpecialistProject].extend(
+            SpecialistProject(project_id=project_id, specialist_id=specialist_ids[nickname])
+            for nickname in record.get('members', ())
+        )
+        rows[SpecialistOwnProject].extend(
+            SpecialistOwnProject(own_project_id=project_id, specialist_id=specialist_ids[nickname])
+            for nickname in record.get('owners', ())
+        )
+        current_projects.extend(
+            (specialist_ids[nickname], project_id)
+            for nickname in record.get('current_members', ())
+        )
+
+    update_column(Specialist, 'current_project', current_projects)
+    counts = Counter({model: len(_create(objs)) for model, objs in rows.items()})
+    counts[Project] = len(created)
+    return counts
+
+
+def _import_offers(records: list[dict]) -> Counter:
+    nicknames = {record[key] for record in records for key in ('sender', 'recipient')}
+    specialist_ids = _ids(Specialist, 'nickname', nicknames)
+    project_ids = _ids(Project, 'name', {record['project'] for record in records})
+    # offers have no unique constraint, the natural key (sender, recipient, project, type) is
+    # matched against the offers of the referenced projects
+    existing = set(Offer.objects.filter(project_id__in=project_ids.values())
+                   .values_list('sender_id', 'recipient_id', 'project_id', 'type'))
+    offers = []
+    for record in records:
+        key = (specialist_ids[record['sender']], specialist_ids[record['recipient']],
+               project_ids[record['project']], record['type'])
+        if key in existing:
+            continue
+        existing.add(key)
+        offers.append(Offer(
+            sender_id=key[0],
+            recipient_id=key[1],
+            project_id=key[2],
+            **{field: record[field] for field in OFFER_FIELDS if field in record},
+        ))
+    created = Offer.objects.bulk_create(offers)
+    return Counter({Offer: len(created)})
+
+
+def _batches(queryset, batch_size: int) -> Iterator[list[dict]]:
+    'Rows of a values() queryset in id order, one keyset query per batch'
+    last_id = 0
+    while rows := list(queryset.filter(id__gt=last_id).order_by('id')[:batch_size]):
+        last_id = rows[-1]['id']
+        yield rows
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _grouped(pairs) -> defaultdict[int, list]:
+    grouped = defaultdict(list)
+    for key, value in pairs:
+        grouped[key].append(value)
+    return grouped
+
+
+def _ids(model: type[Model], natural_key: str, values: set) -> dict:
+    'Map natural keys to ids, raises LookupError when any of them is missing'
+    ids = dict(model.objects.filter(**{f'{natural_key}__in': values})
+               .values_list(natural_key, 'id'))
+    missing = values - ids.keys()
+    if missing:
+        raise LookupError(f'{model.__name__} with {natural_key} {sorted(missing)[:5]} not found')
+    return ids
+
+
+def _create(objs: list[Model]) -> list[Model]:
+    if not objs:
+        return []
+    return type(objs[0]).objects.bulk_create(objs, ignore_conflicts=True)
@@ -0,0 +1,119 @@
+"""
+Database-backed job queue.
+
+Jobs are rows of core.Job executed by `manage.py run_jobs` workers, so deferred work needs no
+broker and survives restarts. A worker claims a job with a conditional UPDATE marking it running
+until `locked_until`: workers sharing the table never run the same job twice, and a job of a
+worker that died becomes visible again once that visibility timeout expires. A failing job is
+retried with exponential backoff until it runs out of attempts and stays FAILED for inspection.
+"""
+import logging
+import traceback
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.models import Job
+from core.models.choices import JobStatus
+
+logger = logging.getLogger(__name__)
+
+# job name -> handler called with the payload as keyword arguments
+JOBS: dict[str, Callable] = {}
+
+
+def job(name: str) -> Callable:
+    'Register the decorated function as the handler of jobs with the name'
+    def register(handler: Callable) -> Callable:
+        JOBS[name] = handler
+        return handler
+    return register
+
+
+def enqueue(name: str, payload: dict | None = None, delay: float = 0) -> Job:
+    """
+    Queue a job, it is committed or rolled back together with the current transaction.
+
+    The payload has to be JSON serializable.
+    """
+    if name not in JOBS:
+        raise LookupError(f'unknown job {name}')
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        max_attempts=getattr(settings, 'JOB_MAX_ATTEMPTS', 5),
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def claim_jobs(limit: int) -> list[Job]:
+    'Mark up to `limit` due jobs as running for this worker and return them'
+    now = timezone.now()
+    abandoned = Q(status=JobStatus.RUNNING, locked_until__lt=now)
+    Job.objects.filter(abandoned, attempts__gte=F('max_attempts')) \
+        .update(status=JobStatus.FAILED, locked_until=None, last_error='visibility timeout expired')
+
+    available = Q(status=JobStatus.QUEUED, run_after__lte=now) | abandoned
+    candidates = Job.objects.filter(available).order_by('run_after', 'id') \
+        .values_list('id', flat=True)[:limit]
+    locked_until = now + timedelta(seconds=_visibility_timeout())
+
+    claimed = [
+        job_id for job_id in candidates
+        if Job.objects.filter(available, pk=job_id).update(
+            status=JobStatus.RUNNING, locked_until=locked_until, attempts=F('attempts') + 1
+        )
+    ]
+    return list(Job.objects.filter(pk__in=claimed).order_by('run_after', 'id'))
+
+
+def run_job(claimed_job: Job) -> bool:
+    """
+    Run a claimed job, returns whether it succeeded.
+
+    The handler and the removal of the job share a transaction, so a succeeded job is never
+    retried and a failed one leaves no partial writes behind.
+    """
+    try:
+        with transaction.atomic():
+            JOBS[claimed_job.name](**claimed_job.payload)
+            Job.objects.filter(pk=claimed_job.pk).delete()
+    except Exception:
+        logger.exception(f'Job {claimed_job} failed on attempt {claimed_job.attempts}')
+        _fail(claimed_job, error=traceback.format_exc())
+        return False
+    return True
+
+
+def run_pending_jobs() -> int:
+    'Run due jobs one by one in the current thread until there are none, returns their number'
+    count = 0
+    while claimed := claim_jobs(limit=1):
+        run_job(claimed[0])
+        count += 1
+    return count
+
+
+def _fail(claimed_job: Job, error: str) -> None:
+    if claimed_job.attempts >= claimed_job.max_attempts:
+        changes = {'status': JobStatus.FAILED}
+    else:
+        delay = _retry_delay() * 2 ** (claimed_job.attempts - 1)
+        changes = {
+            'status': JobStatus.QUEUED,
+            'run_after': timezone.now() + timedelta(seconds=delay),
+        }
+    Job.objects.filter(pk=claimed_job.pk, status=JobStatus.RUNNING) \
+        .update(locked_until=None, last_error=error, **changes)
+
+
+def _visibility_timeout() -> float:
+    return getattr(settings, 'JOB_VISIBILITY_TIMEOUT', 300)
+
+
+def _retry_delay() -> float:
+    return getattr(settings, 'JOB_RETRY_DELAY', 10)
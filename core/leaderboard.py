@@ -0,0 +1,257 @@
+"""
+In-memory rating leaderboards of specialists and projects.
+
+Every scope (everyone, a direction or project type, a language, a technology) keeps its members
+in a list sorted by (-rating, -id), the order of `ordering=-rating` lists, so the top of a board
+is a slice and the rank of a member is a binary search instead of a `COUNT(*) WHERE rating > x`
+query per request. Boards are built from a scan of the rating indexes in that order and then
+kept up to date by signals in core.signals: a rating change moves the member within its boards,
+a skill change adds it to or removes it from one board.
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterator
+
+from django.conf import settings
+
+from core.matching import SECTIONS, THROUGH_MODELS
+from core.metrics import CACHE_LOOKUPS, inc
+from core.models import Project, Specialist
+
+# ('all', None), ('label', direction or project type), ('languages', id) or ('technologies', id)
+Scope = tuple[str, str | int | None]
+EVERYONE: Scope = ('all', None)
+
+
+@dataclass
+class Board:
+    keys: list[tuple[int, int]] = field(default_factory=list)
+
+    def add(self, entity_id: int, rating: int) -> None:
+        insort(self.keys, (-rating, -entity_id))
+
+    def remove(self, entity_id: int, rating: int) -> None:
+        position = self._find(entity_id, rating)
+        if position is not None:
+            del self.keys[position]
+
+    def rank(self, entity_id: int, rating: int) -> int | None:
+        position = self._find(entity_id, rating)
+        return None if position is None else position + 1
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        'Members as (entity_id, rating), best first'
+        return ((-entity_id, -rating) for rating, entity_id in self.keys)
+
+    def _find(self, entity_id: int, rating: int) -> int | None:
+        key = (-rating, -entity_id)
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            return position
+        return None
+
+
+@dataclass
+class LeaderEntry:
+    rating: int = 0
+    label: str = ''
+    languages: set[int] = field(default_factory=set)
+    technologies: set[int] = field(default_factory=set)
+    # private projects are not ranked
+    is_private: bool = False
+    owner_id: int | None = None
+
+    def scopes(self) -> Iterator[Scope]:
+        yield EVERYONE
+        if self.label:
+            yield 'label', self.label
+        for section in SECTIONS:
+            for skill_id in getattr(self, section):
+                yield section, skill_id
+
+    def in_scope(self, scope: Scope) -> bool:
+        kind, value = scope
+        if kind == 'all':
+            return True
+        if kind == 'label':
+            return self.label == value
+        return value in getattr(self, kind)
+
+
+@dataclass
+class Leaderboard:
+    entries: dict[int, LeaderEntry] = field(default_factory=dict)
+    boards: defaultdict[Scope, Board] = field(default_factory=lambda: defaultdict(Board))
+
+    def update_entity(self, entity_id: int, **attrs) -> None:
+        entry = self.entries.setdefault(entity_id, LeaderEntry())
+        self._unlist(entity_id, entry)
+        for name, value in attrs.items():
+            setattr(entry, name, value)
+        self._list(entity_id, entry)
+
+    def remove_entity(self, entity_id: int) -> None:
+        entry = self.entries.pop(entity_id, None)
+        if entry is not None:
+            self._unlist(entity_id, entry)
+
+    def add_skills(self, entity_id: int, section: str, skill_ids) -> None:
+        entry = self.entries.setdefault(entity_id, LeaderEntry())
+        for skill_id in set(skill_ids) - getattr(entry, section):
+            getattr(entry, section).add(skill_id)
+            if not entry.is_private:
+                self.boards[section, skill_id].add(entity_id, entry.rating)
+
+    def remove_skills(self, entity_id: int, section: str, skill_ids) -> None:
+        entry = self.entries.get(entity_id)
+        if entry is None:
+            return
+        for skill_id in set(skill_ids) & getattr(entry, section):
+            getattr(entry, section).discard(skill_id)
+            if not entry.is_private:
+                self.boards[section, skill_id].remove(entity_id, entry.rating)
+
+    def clear_skills(self, entity_id: int, section: str) -> None:
+        entry = self.entries.get(entity_id)
+        if entry is not None:
+            self.remove_skills(entity_id, section, tuple(getattr(entry, section)))
+
+    def drop_skill(self, section: str, skill_id: int) -> None:
+        self.boards.pop((section, skill_id), None)
+        for entry in self.entries.values():
+            getattr(entry, section).discard(skill_id)
+
+    def top(self, scopes: list[Scope], limit: int, offset: int = 0) -> list[tuple[int, int, int]]:
+        'Up to `limit` (rank, entity_id, rating) of the members of every scope, skipping `offset`'
+        if len(scopes) == 1:
+            keys = self.boards.get(scopes[0], Board()).keys[offset:offset + limit]
+            return [(rank, -entity_id, -rating)
+                    for rank, (rating, entity_id) in enumerate(keys, offset + 1)]
+        members = self._members(scopes)
+        return [
+            (rank, entity_id, rating)
+            for rank, (entity_id, rating) in islice(enumerate(members, 1), offset, offset + limit)
+        ]
+
+    def rank(self, entity_id: int, scopes: list[Scope]) -> tuple[int, int] | None:
+        """
+        (rank, members count) of the entity among the members of every scope, None when it is
+        not one of them.
+
+        A binary search for a single scope; for several scopes the smallest board is walked, the
+        others are checked on the entries.
+        """
+        entry = self.entries.get(entity_id)
+        if entry is None or entry.is_private or not all(entry.in_scope(s) for s in scopes):
+            return None
+        if len(scopes) == 1:
+            board = self.boards.get(scopes[0], Board())
+            return board.rank(entity_id, entry.rating), len(board)
+        rank = total = 0
+        for member_id, _ in self._members(scopes):
+            total += 1
+            if member_id == entity_id:
+                rank = total
+        return rank, total
+
+    def _members(self, scopes: list[Scope]) -> Iterator[tuple[int, int]]:
+        boards = [self.boards.get(scope, Board()) for scope in scopes]
+        smallest = min(boards, key=len)
+        others = [scope for scope, board in zip(scopes, boards) if board is not smallest]
+        for entity_id, rating in smallest:
+            if all(self.entries[entity_id].in_scope(scope) for scope in others):
+                yield entity_id, rating
+
+    def _list(self, entity_id: int, entry: LeaderEntry) -> None:
+        if not entry.is_private:
+            for scope in entry.scopes():
+                self.boards[scope].add(entity_id, entry.rating)
+
+    def _unlist(self, entity_id: int, entry: LeaderEntry) -> None:
+        if not entry.is_private:
+            for scope in entry.scopes():
+                self.boards[scope].remove(entity_id, entry.rating)
+
+
+@dataclass
+class Leaderboards:
+    specialists: Leaderboard
+    projects: Leaderboard
+    built_at: float
+    lock: threading.RLock = field(default_factory=threading.RLock)
+
+
+_leaderboards: Leaderboards | None = None
+_lock = threading.Lock()
+
+
+def get_leaderboards() -> Leaderboards:
+    """
+    Return the leaderboards, building them on first access.
+
+    The boards are kept up to date by signals in this process; LEADERBOARD_TTL bounds how long
+    changes made by other worker processes stay invisible.
+    """
+    global _leaderboards
+    leaderboards = _leaderboards
+    if leaderboards is None or time.monotonic() - leaderboards.built_at > _ttl():
+        with _lock:
+            leaderboards = _leaderboards
+            if leaderboards is None or time.monotonic() - leaderboards.built_at > _ttl():
+                leaderboards = _leaderboards = _build_leaderboards()
+                inc(CACHE_LOOKUPS, 'leaderboards', 'miss')
+                return leaderboards
+    inc(CACHE_LOOKUPS, 'leaderboards', 'hit')
+    return leaderboards
+
+
+def peek_leaderboards() -> Leaderboards | None:
+    'The leaderboards if they are built, used by signals to skip updates nobody reads'
+    return _leaderboards
+
+
+def invalidate_leaderboards() -> None:
+    global _leaderboards
+    _leaderboards = None
+
+
+def _ttl() -> float:
+    return getattr(settings, 'LEADERBOARD_TTL', 300)
+
+
+def _build_leaderboards() -> Leaderboards:
+    skills = {'specialists': defaultdict(dict), 'projects': defaultdict(dict)}
+    for through, (index_name, section, entity_field, skill_field) in THROUGH_MODELS.items():
+        for entity_id, skill_id in through.objects \
+                .values_list(entity_field, skill_field).iterator():
+            skills[index_name][entity_id].setdefault(section, set()).add(skill_id)
+
+    specialists, projects = Leaderboard(), Leaderboard()
+    # rows come in board order from the rating indexes, so boards are filled by appending
+    for specialist_id, rating, direction in Specialist.objects.order_by('-rating', '-id') \
+            .values_list('id', 'rating', 'direction').iterator():
+        entry = LeaderEntry(rating=rating, label=direction,
+                            **skills['specialists'].get(specialist_id, {}))
+        _append(specialists, specialist_id, entry)
+    for is_private in (False, True):
+        for project_id, rating, project_type, owner_id in Project.objects \
+                .filter(is_private=is_private).order_by('-rating', '-id') \
+                .values_list('id', 'rating', 'type', 'owner_id').iterator():
+            entry = LeaderEntry(rating=rating, label=project_type, is_private=is_private,
+                                owner_id=owner_id, **skills['projects'].get(project_id, {}))
+            _append(projects, project_id, entry)
+    return Leaderboards(specialists=specialists, projects=projects, built_at=time.monotonic())
+
+
+def _append(leaderboard: Leaderboard, entity_id: int, entry: LeaderEntry) -> None:
+    leaderboard.entries[entity_id] = entry
+    if not entry.is_private:
+        for scope in entry.scopes():
+            leaderboard.boards[scope].keys.append((-entry.rating, -entity_id))
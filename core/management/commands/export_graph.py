@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from core.graph import BATCH_SIZE, export_graph, write_ndjson
+
+
+class Command(BaseCommand):
+    help = 'Stream specialists, projects and offers as NDJSON records, see core.graph'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='file to write, stdout by default')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, output: str | None, batch_size: int, **options):
+        records = export_graph(batch_size=batch_size)
+        if output is None:
+            write_ndjson(records, file=self.stdout)
+            return
+        with open(output, 'w', encoding='utf-8') as file:
+            count = write_ndjson(records, file=file)
+        self.stdout.write(f'Exported {count} records to {output}')
@@ -0,0 +1,26 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.graph import BATCH_SIZE, import_graph, read_ndjson
+
+
+class Command(BaseCommand):
+    help = 'Load NDJSON records written by export_graph, see core.graph'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--input', help='file to read, stdin by default')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, input: str | None, batch_size: int, **options):
+        try:
+            if input is None:
+                counts = import_graph(read_ndjson(sys.stdin), batch_size=batch_size)
+            else:
+                with open(input, encoding='utf-8') as file:
+                    counts = import_graph(read_ndjson(file), batch_size=batch_size)
+        except (LookupError, ValueError, KeyError) as error:
+            raise CommandError(f'Import failed: {error}')
+
+        for model, count in sorted(counts.items(), key=lambda item: item[0].__name__):
+            self.stdout.write(f'{model.__name__}: {count}')
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.counters import recount_counters
+from core.jobs import enqueue
+from core.offers import recount_pending_offers
+
+
+class Command(BaseCommand):
+    help = 'Recompute counter columns of projects and specialists to repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model', choices=('Project', 'Specialist'), default=None,
+            help='recount only the counters of that model',
+        )
+        parser.add_argument(
+            '--background', action='store_true',
+            help='queue the recount as jobs for `run_jobs` workers instead of running it',
+        )
+
+    def handle(self, *args, model: str | None, background: bool, **options):
+        recount_offers = model in (None, 'Specialist')
+        if background:
+            with transaction.atomic():
+                enqueue('recount_counters', {'model': model})
+                if recount_offers:
+                    enqueue('recount_pending_offers')
+            self.stdout.write('Queued the recount')
+            return
+        with transaction.atomic():
+            updated = recount_counters(model=model)
+            if recount_offers:
+                recount_pending_offers()
+        self.stdout.write(f'Recounted {updated} rows')
@@ -0,0 +1,56 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.jobs import claim_jobs, run_job, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = 'Run queued jobs of core.jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=getattr(settings, 'JOB_CONCURRENCY', 4),
+            help='jobs run at the same time, 1 runs them in the main thread',
+        )
+        parser.add_argument(
+            '--once', action='store_true', help='exit when there are no due jobs left',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=getattr(settings, 'JOB_POLL_INTERVAL', 1),
+            help='seconds an idle worker waits before polling the queue again',
+        )
+
+    def handle(self, *args, concurrency: int, once: bool, poll_interval: float, **options):
+        if concurrency < 1:
+            concurrency = 1
+        while True:
+            count = run_pending_jobs() if concurrency == 1 else self.run_concurrently(concurrency)
+            if count:
+                self.stdout.write(f'Ran {count} jobs')
+            if once:
+                return
+            time.sleep(poll_interval)
+
+    def run_concurrently(self, concurrency: int) -> int:
+        'Keep up to `concurrency` jobs running until the queue has no due jobs'
+        count = 0
+        running = set()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while True:
+                claimed = claim_jobs(limit=concurrency - len(running))
+                running.update(pool.submit(_run_in_thread, job) for job in claimed)
+                count += len(claimed)
+                if not running:
+                    return count
+                _, running = wait(running, return_when=FIRST_COMPLETED)
+
+
+def _run_in_thread(job) -> bool:
+    try:
+        return run_job(job)
+    finally:
+        connection.close()
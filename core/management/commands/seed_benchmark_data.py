@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Specialist
+from core.seeding import Distribution, SeedConfig, seed_graph
+
+# option -> (SeedConfig attribute, type of the distribution values)
+DISTRIBUTION_OPTIONS = {
+    'directions': ('directions', str),
+    'projects_per_owner': ('projects_per_owner', int),
+    'project_types': ('project_types', str),
+    'languages': ('languages_per_entity', int),
+    'technologies': ('technologies_per_entity', int),
+    'team_size': ('team_size', int),
+    'offer_states': ('offer_states', str),
+}
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create a deterministic synthetic graph for load testing, see core.seeding'
+
+    def add_arguments(self, parser):
+        defaults = SeedConfig()
+        parser.add_argument('--specialists', type=int, default=defaults.specialists)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--offers-per-specialist', type=float, default=defaults.offers_per_specialist
+        )
+        parser.add_argument(
+            '--prefix', default=defaults.prefix,
+            help='prefix of nicknames and project names, it must not be used by existing rows',
+        )
+        parser.add_argument('--password', default=defaults.password)
+        parser.add_argument('--batch-size', type=int, default=defaults.batch_size)
+        for option, (attribute, _) in DISTRIBUTION_OPTIONS.items():
+            parser.add_argument(
+                f'--{option.replace("_", "-")}',
+                help=f'value:weight pairs, {_format(getattr(defaults, attribute))} by default',
+            )
+
+    def handle(self, *args, **options):
+        config = SeedConfig(
+            specialists=options['specialists'],
+            offers_per_specialist=options['offers_per_specialist'],
+            prefix=options['prefix'],
+            password=options['password'],
+            batch_size=options['batch_size'],
+        )
+        for option, (attribute, cast) in DISTRIBUTION_OPTIONS.items():
+            if options[option] is None:
+                continue
+            try:
+                setattr(config, attribute, Distribution.parse(options[option], cast=cast))
+            except ValueError as error:
+                raise CommandError(f'--{option.replace("_", "-")}: {error}')
+
+        if Specialist.objects.filter(nickname__startswith=config.prefix).exists():
+            raise CommandError(f'specialists with prefix {config.prefix} exist, use another one')
+
+        started_at = time.perf_counter()
+        counts = seed_graph(config, seed=options['seed'])
+        elapsed = time.perf_counter() - started_at
+
+        for model, count in sorted(counts.items(), key=lambda item: item[0].__name__):
+            self.stdout.write(f'{model.__name__}: {count}')
+        total = sum(counts.values())
+        self.stdout.write(f'Created {total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s)')
+
+
+def _format(distribution: Distribution) -> str:
+    return ','.join(f'{value}:{weight:g}' for value, weight in distribution.weights.items())
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.routers import get_replicas, sync_sqlite_replicas
+
+
+class Command(BaseCommand):
+    help = 'Copy the default SQLite database over the replicas, a local stand-in for replication'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=None,
+            help='keep syncing every that many seconds instead of syncing once',
+        )
+
+    def handle(self, *args, interval: float | None, **options):
+        if not get_replicas():
+            raise CommandError('DATABASE_REPLICAS is empty')
+        while True:
+            started_at = time.perf_counter()
+            synced = sync_sqlite_replicas()
+            self.stdout.write(
+                f'Synced {", ".join(synced)} in {time.perf_counter() - started_at:.2f}s'
+            )
+            if interval is None:
+                return
+            time.sleep(interval)
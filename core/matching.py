@@ -0,0 +1,200 @@
+import heapq
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+from core.metrics import CACHE_LOOKUPS, inc
+from core.models import Project, Specialist
+from core.models.project import ProjectLanguage, ProjectTechnology
+from core.models.specialist import SpecialistLanguage, SpecialistTechnology
+
+SECTIONS = ('languages', 'technologies')
+
+
+@dataclass
+class SkillEntry:
+    'Skill bitsets over catalog ids plus the attributes used for ranking and filtering'
+    languages: int = 0
+    technologies: int = 0
+    rating: int = 0
+    label: str = ''
+    is_private: bool = False
+    owner_id: int | None = None
+
+
+@dataclass
+class SkillIndex:
+    entries: dict[int, SkillEntry] = field(default_factory=dict)
+    postings: dict[str, defaultdict[int, set[int]]] = field(
+        default_factory=lambda: {section: defaultdict(set) for section in SECTIONS}
+    )
+
+    def add_skills(self, entity_id: int, section: str, skill_ids) -> None:
+        entry = self.entries.setdefault(entity_id, SkillEntry())
+        mask = getattr(entry, section)
+        for skill_id in skill_ids:
+            mask |= 1 << skill_id
+            self.postings[section][skill_id].add(entity_id)
+        setattr(entry, section, mask)
+
+    def remove_skills(self, entity_id: int, section: str, skill_ids) -> None:
+        entry = self.entries.get(entity_id)
+        if entry is None:
+            return
+        mask = getattr(entry, section)
+        for skill_id in skill_ids:
+            mask &= ~(1 << skill_id)
+            self.postings[section][skill_id].discard(entity_id)
+        setattr(entry, section, mask)
+
+    def clear_skills(self, entity_id: int, section: str) -> None:
+        entry = self.entries.get(entity_id)
+        if entry is not None:
+            self.remove_skills(entity_id, section, _bits(getattr(entry, section)))
+
+    def drop_skill(self, section: str, skill_id: int) -> None:
+        for entity_id in self.postings[section].pop(skill_id, set()):
+            entry = self.entries[entity_id]
+            setattr(entry, section, getattr(entry, section) & ~(1 << skill_id))
+
+    def update_entity(self, entity_id: int, **attrs) -> None:
+        entry = self.entries.setdefault(entity_id, SkillEntry())
+        for name, value in attrs.items():
+            setattr(entry, name, value)
+
+    def remove_entity(self, entity_id: int) -> None:
+        for section in SECTIONS:
+            self.clear_skills(entity_id, section)
+        self.entries.pop(entity_id, None)
+
+    def rank(self, languages: int, technologies: int, limit: int, label: str | None = None,
+             exclude=frozenset(), include_private: bool = False) -> list[tuple[int, int]]:
+        """
+        Top `limit` (entity_id, overlap) pairs ordered by skills overlap, label match, rating.
+
+        Only entities sharing at least one skill with the query are scored.
+        """
+        candidates = set()
+        for section, mask in (('languages', languages), ('technologies', technologies)):
+            for skill_id in _bits(mask):
+                candidates |= self.postings[section].get(skill_id, set())
+
+        scored = []
+        for entity_id in candidates - set(exclude):
+            entry = self.entries[entity_id]
+            if entry.is_private and not include_private:
+                continue
+            overlap = (languages & entry.languages).bit_count() \
+                + (technologies & entry.technologies).bit_count()
+            scored.append(((overlap, entry.label == label, entry.rating, -entity_id), overlap))
+        top = heapq.nlargest(limit, scored, key=lambda item: item[0])
+        return [(-key[3], overlap) for key, overlap in top]
+
+
+@dataclass
+class MatchingIndex:
+    specialists: SkillIndex
+    projects: SkillIndex
+    built_at: float
+    lock: threading.RLock = field(default_factory=threading.RLock)
+
+
+# Through model -> (index attribute, skills section, entity fk, skill fk)
+THROUGH_MODELS = {
+    SpecialistLanguage: ('specialists', 'languages', 'specialist_id', 'language_id'),
+    SpecialistTechnology: ('specialists', 'technologies', 'specialist_id', 'technology_id'),
+    ProjectLanguage: ('projects', 'languages', 'project_id', 'language_id'),
+    ProjectTechnology: ('projects', 'technologies', 'project_id', 'technology_id'),
+}
+
+_index: MatchingIndex | None = None
+_lock = threading.Lock()
+
+
+def get_matching_index() -> MatchingIndex:
+    """
+    Return the matching index, building it on first access.
+
+    The index is kept up to date by signals in this process; MATCHING_INDEX_TTL bounds how long
+    changes made by other worker processes stay invisible.
+    """
+    global _index
+    index = _index
+    if index is None or time.monotonic() - index.built_at > _ttl():
+        with _lock:
+            index = _index
+            if index is None or time.monotonic() - index.built_at > _ttl():
+                index = _index = _build_index()
+                inc(CACHE_LOOKUPS, 'matching_index', 'miss')
+                return index
+    inc(CACHE_LOOKUPS, 'matching_index', 'hit')
+    return index
+
+
+def peek_matching_index() -> MatchingIndex | None:
+    'The index if it is built, used by signals to skip updates of an index nobody reads'
+    return _index
+
+
+def invalidate_matching_index() -> None:
+    global _index
+    _index = None
+
+
+def match_specialists(project_id: int, limit: int,
+                      direction: str | None = None) -> list[tuple[int, int]]:
+    index = get_matching_index()
+    with index.lock:
+        project = index.projects.entries.get(project_id, SkillEntry())
+        return index.specialists.rank(
+            languages=project.languages,
+            technologies=project.technologies,
+            limit=limit,
+            label=direction,
+            exclude={project.owner_id},
+        )
+
+
+def match_projects(specialist_id: int, limit: int,
+                   project_type: str | None = None) -> list[tuple[int, int]]:
+    index = get_matching_index()
+    with index.lock:
+        specialist = index.specialists.entries.get(specialist_id, SkillEntry())
+        return index.projects.rank(
+            languages=specialist.languages,
+            technologies=specialist.technologies,
+            limit=limit,
+            label=project_type,
+        )
+
+
+def _ttl() -> float:
+    return getattr(settings, 'MATCHING_INDEX_TTL', 300)
+
+
+def _bits(mask: int):
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def _build_index() -> MatchingIndex:
+    specialists, projects = SkillIndex(), SkillIndex()
+    for specialist_id, rating, direction in Specialist.objects \
+            .values_list('id', 'rating', 'direction').iterator():
+        specialists.update_entity(specialist_id, rating=rating, label=direction)
+    for project_id, rating, project_type, is_private, owner_id in Project.objects \
+            .values_list('id', 'rating', 'type', 'is_private', 'owner_id').iterator():
+        projects.update_entity(project_id, rating=rating, label=project_type,
+                               is_private=is_private, owner_id=owner_id)
+
+    indexes = {'specialists': specialists, 'projects': projects}
+    for through, (index_name, section, entity_field, skill_field) in THROUGH_MODELS.items():
+        for entity_id, skill_id in through.objects \
+                .values_list(entity_field, skill_field).iterator():
+            indexes[index_name].add_skills(entity_id, section, (skill_id,))
+    return MatchingIndex(specialists=specialists, projects=projects, built_at=time.monotonic())
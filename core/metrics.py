@@ -0,0 +1,218 @@
+"""
+Counters and histograms aggregated across worker processes without an external collector.
+
+Every process updates its metrics in memory and at most every METRICS_FLUSH_INTERVAL seconds
+(and at exit) writes a snapshot of them to `<pid>-<random suffix>.json` in METRICS_DIR with an
+atomic rename; the suffix keeps a process reusing the pid of an exited one from overwriting it.
+`render_metrics` adds the snapshots of the other processes to the live values of the current one
+and renders them in the Prometheus text exposition format, so any worker can serve the metrics
+of the whole service. Snapshots of exited processes are kept, their counts stay in the totals;
+METRICS_DIR should be emptied when the service is (re)deployed.
+"""
+import atexit
+import json
+import os
+import secrets
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@dataclass(frozen=True)
+class Metric:
+    name: str
+    help: str
+    labels: tuple[str, ...]
+    # upper bounds of the histogram buckets, counters have none
+    buckets: tuple[float, ...] = ()
+
+    @property
+    def type(self) -> str:
+        return 'histogram' if self.buckets else 'counter'
+
+
+REQUEST_DURATION = Metric(
+    'api_request_duration_seconds', 'Time spent handling API requests', ('url_name', 'method'),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+RESPONSE_SIZE = Metric(
+    'api_response_size_bytes', 'Size of API response bodies', ('url_name', 'method'),
+    buckets=(100, 1000, 10 ** 4, 10 ** 5, 10 ** 6),
+)
+REQUEST_QUERIES = Metric(
+    'api_request_queries', 'Database queries per API request', ('url_name', 'method'),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+REQUESTS = Metric(
+    'api_requests_total', 'API requests by response status', ('url_name', 'method', 'status'),
+)
+AUTHENTICATIONS = Metric(
+    'api_authentications_total', 'Authentication attempts', ('method', 'outcome'),
+)
+OFFER_TRANSITIONS = Metric(
+    'offer_transitions_total', 'Committed offer state transitions', ('type', 'state'),
+)
+CACHE_LOOKUPS = Metric(
+    'cache_lookups_total', 'Lookups of the in-process caches', ('cache', 'result'),
+)
+
+METRICS = (
+    REQUEST_DURATION, RESPONSE_SIZE, REQUEST_QUERIES, REQUESTS, AUTHENTICATIONS,
+    OFFER_TRANSITIONS, CACHE_LOOKUPS,
+)
+
+# (metric name, label values) -> [value] for counters,
+# [count of every bucket..., count above the last bucket, sum] for histograms
+_values: dict[tuple[str, tuple[str, ...]], list[float]] = {}
+_lock = threading.Lock()
+_flushed_at = time.monotonic()
+# (pid, snapshot file name) of this process
+_snapshot: tuple[int, str] | None = None
+
+
+def inc(metric: Metric, *labels: str, amount: float = 1) -> None:
+    if not _enabled():
+        return
+    key = (metric.name, labels)
+    with _lock:
+        values = _values.get(key)
+        if values is None:
+            values = _values[key] = [0]
+        values[0] += amount
+    _maybe_flush()
+
+
+def observe(metric: Metric, value: float, *labels: str) -> None:
+    if not _enabled():
+        return
+    key = (metric.name, labels)
+    with _lock:
+        values = _values.get(key)
+        if values is None:
+            values = _values[key] = [0] * (len(metric.buckets) + 2)
+        values[bisect_left(metric.buckets, value)] += 1
+        values[-1] += value
+    _maybe_flush()
+
+
+def flush_metrics() -> None:
+    'Write the snapshot of this process to METRICS_DIR'
+    global _flushed_at
+    directory = _directory()
+    with _lock:
+        _flushed_at = time.monotonic()
+        if directory is None or not _values:
+            return
+        snapshot = [[name, labels, values] for (name, labels), values in _values.items()]
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / _snapshot_name()
+    temporary_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+    temporary_path.write_text(json.dumps(snapshot))
+    os.replace(temporary_path, path)
+
+
+def collect_metrics() -> dict[tuple[str, tuple[str, ...]], list[float]]:
+    'Values of this process added to the snapshots of all the other ones'
+    with _lock:
+        merged = {key: values.copy() for key, values in _values.items()}
+    for name, labels, values in _snapshots():
+        key = (name, tuple(labels))
+        if key in merged:
+            merged[key] = [total + value for total, value in zip(merged[key], values)]
+        else:
+            merged[key] = values
+    return merged
+
+
+def render_metrics() -> str:
+    'All metrics in the Prometheus text exposition format'
+    values = collect_metrics()
+    lines = []
+    for metric in METRICS:
+        lines.append(f'# HELP {metric.name} {metric.help}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        series = sorted((labels, value) for (name, labels), value in values.items()
+                        if name == metric.name)
+        for labels, value in series:
+            label_pairs = list(zip(metric.labels, labels))
+            if not metric.buckets:
+                lines.append(f'{metric.name}{_labels(label_pairs)} {_number(value[0])}')
+                continue
+            cumulative = 0
+            for bound, count in zip((*metric.buckets, '+Inf'), value):
+                cumulative += count
+                bucket_labels = _labels([*label_pairs, ('le', _number(bound))])
+                lines.append(f'{metric.name}_bucket{bucket_labels} {_number(cumulative)}')
+            lines.append(f'{metric.name}_sum{_labels(label_pairs)} {_number(value[-1])}')
+            lines.append(f'{metric.name}_count{_labels(label_pairs)} {_number(cumulative)}')
+    return '\n'.join(lines) + '\n'
+
+
+def reset_metrics() -> None:
+    'Forget the values of this process, forked workers start from zero'
+    with _lock:
+        _values.clear()
+
+
+def _snapshots():
+    directory = _directory()
+    if directory is None or not directory.is_dir():
+        return
+    own_snapshot = _snapshot_name()
+    for path in directory.glob('*.json'):
+        if path.name == own_snapshot:
+            continue
+        try:
+            yield from json.loads(path.read_text())
+        except (OSError, ValueError):
+            # replaced or removed while being read
+            continue
+
+
+def _snapshot_name() -> str:
+    'File name of the snapshot of this process, a forked child picks its own'
+    global _snapshot
+    pid = os.getpid()
+    if _snapshot is None or _snapshot[0] != pid:
+        _snapshot = (pid, f'{pid}-{secrets.token_hex(8)}.json')
+    return _snapshot[1]
+
+
+def _maybe_flush() -> None:
+    if time.monotonic() - _flushed_at >= getattr(settings, 'METRICS_FLUSH_INTERVAL', 5):
+        flush_metrics()
+
+
+def _enabled() -> bool:
+    return getattr(settings, 'METRICS_ENABLED', True)
+
+
+def _directory() -> Path | None:
+    directory = getattr(settings, 'METRICS_DIR', None)
+    return Path(directory) if directory else None
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _number(value) -> str:
+    if isinstance(value, str):
+        return value
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+os.register_at_fork(after_in_child=reset_metrics)
+atexit.register(flush_metrics)
@@ -0,0 +1,21 @@
+# Generated by Django 4.1.4 on 2026-10-18 08:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['is_private', 'rating', 'id'], name='project__rating__index'),
+        ),
+        migrations.AddIndex(
+            model_name='specialist',
+            index=models.Index(fields=['rating', 'id'], name='specialist__rating__index'),
+        ),
+    ]
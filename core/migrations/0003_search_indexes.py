@@ -0,0 +1,58 @@
+from django.db import migrations
+
+# frozen copy of core.search.SEARCH_INDEXES at the time of this migration:
+# FTS table -> (source table, indexed columns)
+SEARCH_TABLES = {
+    'core_project_fts': ('core_project', ('name', 'description')),
+    'core_specialist_fts': ('core_specialist', ('nickname', 'about', 'city', 'country')),
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table, (source_table, fields) in SEARCH_TABLES.items():
+        columns = ', '.join(fields)
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5({columns}, "
+            f"content='{source_table}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+        new_values = ', '.join(f'new.{field}' for field in fields)
+        old_values = ', '.join(f'old.{field}' for field in fields)
+        insert_new = f"INSERT INTO {table}(rowid, {columns}) VALUES (new.id, {new_values});"
+        delete_old = f"INSERT INTO {table}({table}, rowid, {columns}) " \
+                     f"VALUES ('delete', old.id, {old_values});"
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON {source_table} "
+            f"BEGIN {insert_new} END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON {source_table} "
+            f"BEGIN {delete_old} END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF {columns} "
+            f"ON {source_table} BEGIN {delete_old} {insert_new} END"
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table in SEARCH_TABLES:
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {table}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {table}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_rating_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
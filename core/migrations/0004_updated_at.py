@@ -0,0 +1,39 @@
+# Generated by Django 4.1.4 on 2026-10-18 09:20
+
+from django.db import migrations, models
+
+
+def create_collection_versions(apps, schema_editor):
+    CollectionVersion = apps.get_model('core', 'CollectionVersion')
+    CollectionVersion.objects.bulk_create(
+        [CollectionVersion(name=name) for name in ('projects', 'specialists')]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectionVersion',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='specialist',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(create_collection_versions, migrations.RunPython.noop),
+    ]
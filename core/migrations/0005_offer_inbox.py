@@ -0,0 +1,49 @@
+# Generated by Django 4.1.4 on 2026-10-18 09:35
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def recount_pending_offers(apps, schema_editor):
+    'Frozen copy of core.offers.recount_pending_offers at the time of this migration'
+    pending = apps.get_model('core', 'Offer').objects.filter(response__isnull=True)
+
+    def pending_count(participant):
+        counts = pending.filter(**{participant: OuterRef('pk')}).order_by() \
+            .values(participant).annotate(count=Count('id')).values('count')
+        return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+    apps.get_model('core', 'Specialist').objects.update(
+        inbox_pending_count=pending_count('recipient'),
+        outbox_pending_count=pending_count('sender'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='specialist',
+            name='inbox_pending_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='specialist',
+            name='outbox_pending_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['recipient', 'response', 'id'], include=('sender', 'project', 'type'), name='offer__inbox__index'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['sender', 'response', 'id'], include=('recipient', 'project', 'type'), name='offer__outbox__index'),
+        ),
+        migrations.RunPython(recount_pending_offers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 4.1.4 on 2026-10-18 10:50
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# model -> {counter column: (through model, its foreign key to the model)}
+COUNTERS = {
+    'Project': {
+        'team_count': ('ProjectTeam', 'project'),
+        'languages_count': ('ProjectLanguage', 'project'),
+        'technologies_count': ('ProjectTechnology', 'project'),
+    },
+    'Specialist': {
+        'projects_count': ('SpecialistProject', 'specialist'),
+        'own_projects_count': ('SpecialistOwnProject', 'specialist'),
+        'languages_count': ('SpecialistLanguage', 'specialist'),
+        'technologies_count': ('SpecialistTechnology', 'specialist'),
+    },
+}
+
+
+def recount_counters(apps, schema_editor):
+    'Frozen copy of core.counters.recount_counters at the time of this migration'
+    def count(through, owner_field):
+        counts = apps.get_model('core', through).objects.filter(**{owner_field: OuterRef('pk')}) \
+            .order_by().values(owner_field).annotate(count=Count('id')).values('count')
+        return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+    for model_name, columns in COUNTERS.items():
+        apps.get_model('core', model_name).objects.update(**{
+            column: count(*through_field) for column, through_field in columns.items()
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='languages_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='team_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='technologies_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='specialist',
+            name='languages_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='specialist',
+            name='own_projects_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='specialist',
+            name='projects_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='specialist',
+            name='technologies_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['is_private', 'team_count', 'id'], name='project__team_count__index'),
+        ),
+        migrations.AddIndex(
+            model_name='specialist',
+            index=models.Index(fields=['own_projects_count', 'id'], name='specialist__owned__index'),
+        ),
+        migrations.RunPython(recount_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.1.4 on 2026-10-18 11:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['is_private', 'type', 'id'], name='project__type__index'),
+        ),
+        migrations.AddIndex(
+            model_name='specialist',
+            index=models.Index(fields=['direction', 'id'], name='specialist__direction__index'),
+        ),
+        migrations.AddIndex(
+            model_name='specialist',
+            index=models.Index(fields=['country', 'city', 'id'], name='specialist__location__index'),
+        ),
+    ]
@@ -2,3 +2,6 @@ from core.models.technologies import Language, Technology
 from core.models.specialist import Specialist
 from core.models.project import Project
 from core.models.offer import Offer
+from core.models.versions import CollectionVersion
+from core.models.jobs import Job
+from core.models.pins import PrimaryPin
@@ -47,3 +47,10 @@ class OfferType(models.TextChoices):
     ADD_TO_TEAM = ('ADD_TO_TEAM', 'ADD_TO_TEAM')
     GIVE_OWNERSHIP = ('GIVE_OWNERSHIP', 'GIVE_OWNERSHIP')
     GET_OWNERSHIP = ('GET_OWNERSHIP', 'GET_OWNERSHIP')
+
+
+# For core.Job
+class JobStatus(models.TextChoices):
+    QUEUED = ('QUEUED', 'QUEUED')
+    RUNNING = ('RUNNING', 'RUNNING')
+    FAILED = ('FAILED', 'FAILED')
@@ -0,0 +1,25 @@
+from django.db import models
+from django.utils import timezone
+
+from core.models.choices import JobStatus
+
+
+class Job(models.Model):
+    'Unit of deferred work run by `manage.py run_jobs` workers, see core.jobs'
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=JobStatus.choices, default=JobStatus.QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True, default=None)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after', 'id'], name='job__queue__index'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
@@ -17,3 +17,17 @@ class Offer(models.Model):
     project = models.ForeignKey('core.Project', on_delete=models.CASCADE)
     type = models.CharField(max_length=50, choices=OfferType.choices)
     response = models.BooleanField(blank=True, null=True, default=None)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['recipient', 'response', 'id'],
+                include=['sender', 'project', 'type'],
+                name='offer__inbox__index',
+            ),
+            models.Index(
+                fields=['sender', 'response', 'id'],
+                include=['recipient', 'project', 'type'],
+                name='offer__outbox__index',
+            ),
+        ]
@@ -0,0 +1,11 @@
+from django.db import models
+
+
+class PrimaryPin(models.Model):
+    'Token client reading from the primary until `expires_at` after a write, see api.replicas'
+    # sha256 of the Authorization header
+    key = models.CharField(max_length=64, primary_key=True)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.key[:8]} until {self.expires_at}'
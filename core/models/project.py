@@ -17,6 +17,22 @@ class Project(models.Model):
     technologies = models.ManyToManyField('core.Technology', through='ProjectTechnology')
     team = models.ManyToManyField('core.Specialist', through='ProjectTeam')
     owner = models.ForeignKey('core.Specialist', on_delete=models.CASCADE, related_name='owner')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # counters of the through table rows maintained by core.counters
+    team_count = models.PositiveIntegerField(default=0)
+    languages_count = models.PositiveIntegerField(default=0)
+    technologies_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_private', 'rating', 'id'], name='project__rating__index'),
+            models.Index(
+                fields=['is_private', 'team_count', 'id'], name='project__team_count__index'
+            ),
+            # facets of core.facets
+            models.Index(fields=['is_private', 'type', 'id'], name='project__type__index'),
+        ]
 
     def __str__(self):
         return self.name
@@ -57,9 +57,20 @@ class Specialist(AbstractBaseUser, PermissionsMixin):
     email = models.EmailField(null=False, blank=True, default='')
     github = models.URLField(null=False, blank=True, default='')
 
+    # counters maintained by core.offers
+    inbox_pending_count = models.PositiveIntegerField(default=0)
+    outbox_pending_count = models.PositiveIntegerField(default=0)
+
+    # counters of the through table rows maintained by core.counters
+    projects_count = models.PositiveIntegerField(default=0)
+    own_projects_count = models.PositiveIntegerField(default=0)
+    languages_count = models.PositiveIntegerField(default=0)
+    technologies_count = models.PositiveIntegerField(default=0)
+
     # default fields
     last_login = None
     is_private = models.BooleanField(null=False, blank=True, default=False)
+    updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=True)
     is_superuser = models.BooleanField(default=False)
@@ -67,6 +78,17 @@ class Specialist(AbstractBaseUser, PermissionsMixin):
 
     USERNAME_FIELD = 'nickname'
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['rating', 'id'], name='specialist__rating__index'),
+            models.Index(
+                fields=['own_projects_count', 'id'], name='specialist__owned__index'
+            ),
+            # facets of core.facets
+            models.Index(fields=['direction', 'id'], name='specialist__direction__index'),
+            models.Index(fields=['country', 'city', 'id'], name='specialist__location__index'),
+        ]
+
     def __str__(self):
         return self.nickname
 
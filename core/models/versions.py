@@ -0,0 +1,11 @@
+from django.db import models
+
+
+class CollectionVersion(models.Model):
+    'Counter bumped on every change visible in the representation of a collection'
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.name} v{self.version}'
@@ -0,0 +1,122 @@
+"""
+Offer answers and pending offer counters of specialists.
+
+`inbox_pending_count`/`outbox_pending_count` follow offer creation and deletion through signals
+(see core.signals); answering an offer has to go through `respond_to_offer`, which moves it out
+of the pending state with a single conditional UPDATE, or `accept_offer`.
+"""
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+from core.counters import recount_counters
+from core.jobs import job
+from core.metrics import OFFER_TRANSITIONS, inc
+from core.models import Offer, Project, Specialist
+from core.models.choices import OfferType
+from core.models.project import ProjectTeam
+from core.models.specialist import SpecialistOwnProject, SpecialistProject
+from core.versions import touch
+
+
+def respond_to_offer(offer: Offer, response: bool) -> bool:
+    'Answer a pending offer, returns False when it has been answered already'
+    answered = Offer.objects.filter(pk=offer.pk, response__isnull=True).update(response=response)
+    offer.response = response
+    if answered:
+        shift_pending_counters(offer=offer, delta=-1)
+        state = 'accepted' if response else 'declined'
+        transaction.on_commit(lambda: inc(OFFER_TRANSITIONS, offer.type, state))
+    return bool(answered)
+
+
+def accept_offer(offer: Offer) -> bool:
+    """
+    Answer a pending offer positively and apply it in one transaction, returns False when it has
+    been answered already.
+
+    The conditional UPDATE of `respond_to_offer` claims the offer, so concurrent answers apply it
+    once, and the counters UPDATE keeps both participant rows locked until the commit, which
+    serializes acceptances moving the same specialists. Membership rows are inserted ignoring
+    conflicts, rows written by a concurrent acceptance are not an error, and a member of another
+    team leaves it.
+    """
+    with transaction.atomic():
+        if not respond_to_offer(offer=offer, response=True):
+            return False
+        ACCEPTANCE_ACTIONS[offer.type](offer)
+    return True
+
+
+def shift_pending_counters(offer: Offer, delta: int) -> None:
+    Specialist.objects.filter(pk__in=(offer.recipient_id, offer.sender_id)).update(
+        inbox_pending_count=_shifted('inbox_pending_count', offer.recipient_id, delta),
+        outbox_pending_count=_shifted('outbox_pending_count', offer.sender_id, delta),
+    )
+
+
+@job('recount_pending_offers')
+def recount_pending_offers() -> int:
+    'Recompute every counter from the offers table, returns the number of specialists updated'
+    pending = Offer.objects.filter(response__isnull=True)
+    return Specialist.objects.update(
+        inbox_pending_count=_pending_count(pending, 'recipient'),
+        outbox_pending_count=_pending_count(pending, 'sender'),
+    )
+
+
+def _join_team(member: Specialist, project: Project) -> None:
+    SpecialistProject.objects.bulk_create(
+        [SpecialistProject(specialist=member, project=project)], ignore_conflicts=True
+    )
+    # a specialist is on one team at a time, joining another team moves the membership
+    left = ProjectTeam.objects.filter(specialist=member).exclude(project=project)
+    left_ids = list(left.values_list('project_id', flat=True))
+    if left_ids:
+        left.update(project=project)
+    ProjectTeam.objects.bulk_create(
+        [ProjectTeam(specialist=member, project=project)], ignore_conflicts=True
+    )
+    # inserts ignoring conflicts and updates skip the save signals and may change nothing
+    recount_counters(model='Specialist', ids=[member.pk])
+    recount_counters(model='Project', ids=[project.pk, *left_ids])
+    touch(Project.objects.filter(pk__in=left_ids))
+    # saved after joining, so the save signal touches the project with its new team as well
+    member.current_project = project
+    member.save(update_fields=['current_project', 'updated_at'])
+
+
+def _pass_ownership(old_owner: Specialist, new_owner: Specialist, project: Project) -> None:
+    SpecialistOwnProject.objects.filter(specialist=old_owner, own_project=project).delete()
+    SpecialistOwnProject.objects.bulk_create(
+        [SpecialistOwnProject(specialist=new_owner, own_project=project)], ignore_conflicts=True
+    )
+    # the queryset delete and the insert ignoring conflicts skip the counter signals
+    recount_counters(model='Specialist', ids=[old_owner.pk, new_owner.pk])
+    touch(Specialist.objects.filter(pk__in=(old_owner.pk, new_owner.pk)))
+
+
+ACCEPTANCE_ACTIONS = {
+    OfferType.ADD_TO_TEAM: lambda offer: _join_team(offer.recipient, offer.project),
+    OfferType.JOIN_TO_TEAM: lambda offer: _join_team(offer.sender, offer.project),
+    OfferType.GIVE_OWNERSHIP: lambda offer: _pass_ownership(
+        old_owner=offer.sender, new_owner=offer.recipient, project=offer.project
+    ),
+    OfferType.GET_OWNERSHIP: lambda offer: _pass_ownership(
+        old_owner=offer.recipient, new_owner=offer.sender, project=offer.project
+    ),
+}
+
+
+def _shifted(field: str, specialist_id: int, delta: int) -> Case:
+    return Case(
+        When(pk=specialist_id, then=Greatest(F(field) + delta, Value(0))),
+        default=F(field),
+        output_field=IntegerField(),
+    )
+
+
+def _pending_count(pending, participant: str) -> Coalesce:
+    counts = pending.filter(**{participant: OuterRef('pk')}).order_by() \
+        .values(participant).annotate(count=Count('id')).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
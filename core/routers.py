@@ -0,0 +1,117 @@
+"""
+Routing of read-only requests to replicas of the default database.
+
+Writes and migrations always go to `default`. Reads go to `default` too, unless they happen
+inside `read_from_replica(alias)`, which the replica middleware in api.replicas opens for the
+views marked with `read_from_replica = True`. Replicas are picked among the DATABASE_REPLICAS
+aliases that passed a health check in the last REPLICA_HEALTH_CHECK_INTERVAL seconds; when
+none did, requests read from `default`.
+"""
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+PRIMARY = 'default'
+
+_read_alias: ContextVar[str | None] = ContextVar('read_alias', default=None)
+
+# replica alias -> (checked at, is healthy)
+_health: dict[str, tuple[float, bool]] = {}
+_health_lock = threading.Lock()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get() or PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+def get_replicas() -> list[str]:
+    return list(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+
+@contextmanager
+def read_from_replica(alias: str | None):
+    'Route reads to the replica alias, None reads from the primary'
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def read_from_primary():
+    'Route reads to the primary, used for lookups that must see the latest writes'
+    return read_from_replica(None)
+
+
+def route_reads_to(alias: str | None) -> None:
+    'Route reads to the alias until the enclosing `read_from_replica` block ends'
+    _read_alias.set(alias)
+
+
+def choose_replica() -> str | None:
+    'A random healthy replica, None when there is none'
+    healthy = [alias for alias in get_replicas() if is_healthy(alias)]
+    return random.choice(healthy) if healthy else None
+
+
+def is_healthy(alias: str) -> bool:
+    interval = getattr(settings, 'REPLICA_HEALTH_CHECK_INTERVAL', 5)
+    checked_at, healthy = _health.get(alias, (None, False))
+    if checked_at is not None and time.monotonic() - checked_at < interval:
+        return healthy
+    with _health_lock:
+        healthy = _check(alias)
+        _health[alias] = (time.monotonic(), healthy)
+    return healthy
+
+
+def reset_replica_health() -> None:
+    _health.clear()
+
+
+def _check(alias: str) -> bool:
+    'The replica answers and has the schema, an empty SQLite file created on connect does not'
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1 FROM django_migrations LIMIT 1')
+            return cursor.fetchone() is not None
+    except DatabaseError:
+        connections[alias].close()
+        return False
+
+
+def sync_sqlite_replicas() -> list[str]:
+    """
+    Copy the primary SQLite database over every replica with the online backup API, a local
+    stand-in for replication. Returns the synced aliases.
+    """
+    source = connections[PRIMARY]
+    source.ensure_connection()
+    synced = []
+    for alias in get_replicas():
+        target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+        try:
+            source.connection.backup(target)
+        finally:
+            target.close()
+        synced.append(alias)
+    return synced
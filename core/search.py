@@ -0,0 +1,182 @@
+import re
+from dataclasses import dataclass
+from functools import reduce
+from operator import and_, or_
+
+from django.db import connections, models
+from django.db.models import Q
+
+from core.models import Project, Specialist
+
+PHRASE_OR_WORD_RE = re.compile(r'"([^"]*)"|(\S+)')
+WORD_RE = re.compile(r'\w+')
+
+_fts_tables: dict[str, set[str]] = {}
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    model: type[models.Model]
+    table: str
+    fields: tuple[str, ...]
+    weights: tuple[float, ...]
+    filters: tuple[str, ...]
+
+    @property
+    def source_table(self) -> str:
+        return self.model._meta.db_table
+
+
+SEARCH_INDEXES = {
+    'projects': SearchIndex(
+        model=Project,
+        table='core_project_fts',
+        fields=('name', 'description'),
+        weights=(10.0, 1.0),
+        filters=('type', 'is_private'),
+    ),
+    'specialists': SearchIndex(
+        model=Specialist,
+        table='core_specialist_fts',
+        fields=('nickname', 'about', 'city', 'country'),
+        weights=(10.0, 1.0, 2.0, 2.0),
+        filters=('direction', 'is_private'),
+    ),
+}
+
+
+@dataclass(frozen=True)
+class SearchTerm:
+    words: tuple[str, ...]
+    is_phrase: bool = False
+    is_prefix: bool = False
+
+
+def parse_query(query: str) -> list[SearchTerm]:
+    """
+    Split a user query into terms: `"quoted phrases"`, `prefix*` words and plain words.
+
+    Everything except word characters is dropped, so a query can never break the FTS syntax.
+    """
+    terms = []
+    for phrase, word in PHRASE_OR_WORD_RE.findall(query):
+        if phrase:
+            words = tuple(WORD_RE.findall(phrase))
+            if words:
+                terms.append(SearchTerm(words=words, is_phrase=True))
+            continue
+        words = WORD_RE.findall(word)
+        for position, single_word in enumerate(words):
+            is_last = position == len(words) - 1
+            terms.append(SearchTerm(words=(single_word,), is_prefix=is_last and word.endswith('*')))
+    return terms
+
+
+def search(index_name: str, query: str, filters: dict, limit: int,
+           after: tuple[float, int] | None = None,
+           using: str = 'default') -> list[tuple[int, float]]:
+    """
+    Return up to `limit` (id, rank) pairs matching the query, best first.
+
+    Rows are ordered by (rank, id) and `after` is the (rank, id) of the last row of the previous
+    page. SQLite uses the FTS5 index with bm25 ranking, other backends fall back to `icontains`
+    lookups with a constant rank.
+    """
+    index = SEARCH_INDEXES[index_name]
+    terms = parse_query(query)
+    if not terms:
+        return []
+    filters = {name: value for name, value in filters.items() if value is not None}
+    if set(filters) - set(index.filters):
+        raise ValueError(f'unsupported filters {set(filters) - set(index.filters)}')
+
+    if has_fts_index(index=index, using=using):
+        return _fts_search(index, terms, filters, limit, after, using)
+    return _fallback_search(index, terms, filters, limit, after, using)
+
+
+def has_fts_index(index: SearchIndex, using: str = 'default') -> bool:
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+    if using not in _fts_tables:
+        with connection.cursor() as cursor:
+            _fts_tables[using] = set(connection.introspection.table_names(cursor))
+    return index.table in _fts_tables[using]
+
+
+def install_search_triggers(connection) -> None:
+    """
+    (Re)create the triggers keeping FTS tables in sync with their source tables.
+
+    SQLite drops triggers when Django remakes a table during a migration, so this is idempotent
+    and also runs on every post_migrate.
+    """
+    _fts_tables.pop(connection.alias, None)
+    with connection.cursor() as cursor:
+        existing_tables = connection.introspection.table_names(cursor)
+        for index in SEARCH_INDEXES.values():
+            if index.table not in existing_tables:
+                continue
+            columns = ', '.join(index.fields)
+            new_values = ', '.join(f'new.{field}' for field in index.fields)
+            old_values = ', '.join(f'old.{field}' for field in index.fields)
+            insert_new = f"INSERT INTO {index.table}(rowid, {columns}) " \
+                         f"VALUES (new.id, {new_values});"
+            delete_old = f"INSERT INTO {index.table}({index.table}, rowid, {columns}) " \
+                         f"VALUES ('delete', old.id, {old_values});"
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {index.table}_ai "
+                f"AFTER INSERT ON {index.source_table} BEGIN {insert_new} END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {index.table}_ad "
+                f"AFTER DELETE ON {index.source_table} BEGIN {delete_old} END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {index.table}_au "
+                f"AFTER UPDATE OF {columns} ON {index.source_table} "
+                f"BEGIN {delete_old} {insert_new} END"
+            )
+
+
+def _fts_search(index: SearchIndex, terms: list[SearchTerm], filters: dict, limit: int,
+                after: tuple[float, int] | None, using: str) -> list[tuple[int, float]]:
+    rank = f"bm25({index.table}, {', '.join(str(weight) for weight in index.weights)})"
+    where = [f'{index.table} MATCH %s']
+    params = [_fts_expression(terms)]
+    for name, value in filters.items():
+        where.append(f'source.{name} = %s')
+        params.append(value)
+    if after is not None:
+        where.append(f'({rank} > %s OR ({rank} = %s AND source.id > %s))')
+        params.extend([after[0], after[0], after[1]])
+    params.append(limit)
+
+    sql = f"SELECT source.id, {rank} AS search_rank FROM {index.table} " \
+          f"JOIN {index.source_table} source ON source.id = {index.table}.rowid " \
+          f"WHERE {' AND '.join(where)} ORDER BY search_rank, source.id LIMIT %s"
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(row_id, row_rank) for row_id, row_rank in cursor.fetchall()]
+
+
+def _fts_expression(terms: list[SearchTerm]) -> str:
+    expressions = []
+    for term in terms:
+        expression = '"' + ' '.join(term.words) + '"'
+        expressions.append(expression + '*' if term.is_prefix else expression)
+    return ' AND '.join(expressions)
+
+
+def _fallback_search(index: SearchIndex, terms: list[SearchTerm], filters: dict, limit: int,
+                     after: tuple[float, int] | None, using: str) -> list[tuple[int, float]]:
+    condition = reduce(and_, (
+        reduce(or_, (Q(**{f'{field}__icontains': ' '.join(term.words)}) for field in index.fields))
+        for term in terms
+    ))
+    queryset = index.model.objects.using(using).filter(condition, **filters)
+    if after is not None:
+        queryset = queryset.filter(id__gt=after[1])
+    return [(row_id, 0.0) for row_id in
+            queryset.order_by('id').values_list('id', flat=True)[:limit]]
@@ -0,0 +1,218 @@
+"""
+Synthetic specialist/project/offer graph for load testing.
+
+Everything is drawn from a `random.Random(seed)` in a fixed order, so the same seed and
+configuration always produce the same graph. Rows are written with batched `bulk_create`, every
+specialist shares one password hashed once, and derived state skipped by the bulk writes is
+refreshed at the end like after `core.graph.import_graph`.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from random import Random
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from core.graph import refresh_derived_state, update_column
+from core.models import Language, Offer, Project, Specialist, Technology
+from core.models.choices import Direction, OfferType, ProjectType
+from core.models.project import ProjectLanguage, ProjectTeam, ProjectTechnology
+from core.models.specialist import (
+    SpecialistLanguage,
+    SpecialistOwnProject,
+    SpecialistProject,
+    SpecialistTechnology,
+)
+
+# offer types sent by the project owner, the other ones are sent to the owner
+OWNER_SENT_OFFERS = (OfferType.ADD_TO_TEAM, OfferType.GIVE_OWNERSHIP)
+# offer state -> Offer.response
+OFFER_RESPONSES = {'PENDING': None, 'ACCEPTED': True, 'DECLINED': False}
+
+
+@dataclass(frozen=True)
+class Distribution:
+    'Weighted choice between values'
+    weights: dict
+
+    @classmethod
+    def parse(cls, spec: str, cast=str) -> 'Distribution':
+        'Build from a `value:weight,value:weight` spec, like `0:50,1:30,2:20`'
+        weights = {}
+        for item in spec.split(','):
+            value, separator, weight = item.rpartition(':')
+            if not separator or not value:
+                raise ValueError(f'invalid distribution item {item!r}, expected value:weight')
+            weights[cast(value.strip())] = float(weight)
+        if not weights or min(weights.values()) < 0 or not sum(weights.values()):
+            raise ValueError(f'invalid distribution {spec!r}, weights must be positive')
+        return cls(weights=weights)
+
+    @classmethod
+    def uniform(cls, values) -> 'Distribution':
+        return cls(weights={value: 1 for value in values})
+
+    def sample(self, random: Random, k: int) -> list:
+        return random.choices(list(self.weights), weights=list(self.weights.values()), k=k)
+
+
+@dataclass
+class SeedConfig:
+    specialists: int = 1000
+    directions: Distribution = field(default_factory=lambda: Distribution.uniform(Direction.values))
+    projects_per_owner: Distribution = field(
+        default_factory=lambda: Distribution({0: 50, 1: 35, 2: 10, 3: 5})
+    )
+    project_types: Distribution = field(
+        default_factory=lambda: Distribution.uniform(ProjectType.values)
+    )
+    languages_per_entity: Distribution = field(
+        default_factory=lambda: Distribution({1: 35, 2: 35, 3: 20, 4: 10})
+    )
+    technologies_per_entity: Distribution = field(
+        default_factory=lambda: Distribution({0: 15, 1: 30, 2: 30, 3: 25})
+    )
+    team_size: Distribution = field(
+        default_factory=lambda: Distribution({0: 30, 1: 30, 2: 25, 3: 15})
+    )
+    offers_per_specialist: float = 0.5
+    offer_states: Distribution = field(
+        default_factory=lambda: Distribution({'PENDING': 70, 'ACCEPTED': 20, 'DECLINED': 10})
+    )
+    prefix: str = 'seed'
+    password: str = 'benchmark-password'
+    batch_size: int = 2000
+
+
+def seed_graph(config: SeedConfig, seed: int = 0) -> Counter:
+    'Create the graph in one transaction, returns the number of created rows per model'
+    random = Random(seed)
+    with transaction.atomic():
+        specialists = _seed_specialists(random, config)
+        projects = _seed_projects(random, config, specialists)
+        counts = Counter({
+            Specialist: len(specialists),
+            Token: len(specialists),
+            Project: len(projects),
+            SpecialistOwnProject: len(projects),
+        })
+        counts.update(_seed_skills(random, config, specialists, projects))
+        counts.update(_seed_teams(random, config, specialists, projects))
+        counts[Offer] = _seed_offers(random, config, specialists, projects)
+        refresh_derived_state()
+    return counts
+
+
+def _seed_specialists(random: Random, config: SeedConfig) -> list[Specialist]:
+    password = make_password(config.password)
+    directions = config.directions.sample(random, k=config.specialists)
+    specialists = _bulk_create([
+        Specialist(
+            nickname=f'{config.prefix}{index}',
+            github_nickname=f'{config.prefix}{index}',
+            password=password,
+            direction=direction,
+            rating=random.randint(0, 1000),
+            about=f'{direction.lower()} developer number {index}',
+        )
+        for index, direction in enumerate(directions)
+    ], config)
+    _bulk_create([Token(key=Token.generate_key(), user=specialist) for specialist in specialists],
+                 config)
+    return specialists
+
+
+def _seed_projects(random: Random, config: SeedConfig,
+                   specialists: list[Specialist]) -> list[Project]:
+    counts = config.projects_per_owner.sample(random, k=len(specialists))
+    owners = [owner for owner, count in zip(specialists, counts) for _ in range(count)]
+    types = config.project_types.sample(random, k=len(owners))
+    projects = _bulk_create([
+        Project(
+            name=f'{config.prefix} project {index}',
+            github_name=f'{config.prefix}-project-{index}',
+            description=f'{project_type.lower()} number {index}',
+            type=project_type,
+            rating=random.randint(0, 1000),
+            owner=owner,
+        )
+        for index, (owner, project_type) in enumerate(zip(owners, types))
+    ], config)
+    _bulk_create([
+        SpecialistOwnProject(specialist=project.owner, own_project=project) for project in projects
+    ], config)
+    return projects
+
+
+def _seed_skills(random: Random, config: SeedConfig, specialists: list[Specialist],
+                 projects: list[Project]) -> Counter:
+    language_ids = list(Language.objects.order_by('id').values_list('id', flat=True))
+    technology_ids = list(Technology.objects.order_by('id').values_list('id', flat=True))
+    through_models = (
+        (SpecialistLanguage, 'specialist', specialists, 'language_id', language_ids,
+         config.languages_per_entity),
+        (SpecialistTechnology, 'specialist', specialists, 'technology_id', technology_ids,
+         config.technologies_per_entity),
+        (ProjectLanguage, 'project', projects, 'language_id', language_ids,
+         config.languages_per_entity),
+        (ProjectTechnology, 'project', projects, 'technology_id', technology_ids,
+         config.technologies_per_entity),
+    )
+    counts = Counter()
+    for model, entity_field, entities, skill_field, skill_ids, distribution in through_models:
+        sizes = distribution.sample(random, k=len(entities))
+        rows = _bulk_create([
+            model(**{entity_field: entity, skill_field: skill_id})
+            for entity, size in zip(entities, sizes)
+            for skill_id in random.sample(skill_ids, min(size, len(skill_ids)))
+        ], config)
+        counts[model] = len(rows)
+    return counts
+
+
+def _seed_teams(random: Random, config: SeedConfig, specialists: list[Specialist],
+                projects: list[Project]) -> Counter:
+    'Every specialist is a member of one team at most, which is also the current project'
+    free_specialists = specialists.copy()
+    random.shuffle(free_specialists)
+    members = []
+    for project, size in zip(projects, config.team_size.sample(random, k=len(projects))):
+        for _ in range(min(size, len(free_specialists))):
+            member = free_specialists.pop()
+            member.current_project = project
+            members.append(member)
+
+    _bulk_create([ProjectTeam(project=member.current_project, specialist=member)
+                  for member in members], config)
+    _bulk_create([SpecialistProject(project=member.current_project, specialist=member)
+                  for member in members], config)
+    update_column(Specialist, 'current_project',
+                  [(member.pk, member.current_project_id) for member in members])
+    return Counter({ProjectTeam: len(members), SpecialistProject: len(members)})
+
+
+def _seed_offers(random: Random, config: SeedConfig, specialists: list[Specialist],
+                 projects: list[Project]) -> int:
+    count = int(len(specialists) * config.offers_per_specialist)
+    if not projects or len(specialists) < 2 or not count:
+        return 0
+    types = Distribution.uniform(OfferType.values).sample(random, k=count)
+    states = config.offer_states.sample(random, k=count)
+    offers = []
+    for offer_type, state in zip(types, states):
+        project = random.choice(projects)
+        other = random.choice(specialists)
+        while other.pk == project.owner_id:
+            other = random.choice(specialists)
+        sender, recipient = (project.owner, other) if offer_type in OWNER_SENT_OFFERS \
+            else (other, project.owner)
+        offers.append(Offer(sender=sender, recipient=recipient, project=project,
+                            type=offer_type, response=OFFER_RESPONSES[state]))
+    return len(_bulk_create(offers, config))
+
+
+def _bulk_create(objs: list, config: SeedConfig) -> list:
+    if not objs:
+        return objs
+    return type(objs[0]).objects.bulk_create(objs, batch_size=config.batch_size)
@@ -0,0 +1,278 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from core.catalog import invalidate_catalog
+from core.counters import COUNTERS, shift_counter, uncount_rows
+from core.leaderboard import peek_leaderboards
+from core.matching import THROUGH_MODELS, peek_matching_index
+from core.metrics import OFFER_TRANSITIONS, inc
+from core.models import Language, Offer, Project, Specialist, Technology
+from core.offers import shift_pending_counters
+from core.token_cache import invalidate_token, invalidate_user_tokens
+from core.versions import (
+    COLLECTIONS,
+    bump_collections,
+    projects_showing_specialist,
+    specialists_showing_project,
+    touch,
+    touch_on_commit,
+)
+
+# m2m through model -> (model declaring the field, field name)
+M2M_SOURCES = {
+    Project.languages.through: (Project, 'languages'),
+    Project.technologies.through: (Project, 'technologies'),
+    Project.team.through: (Project, 'team'),
+    Specialist.languages.through: (Specialist, 'languages'),
+    Specialist.technologies.through: (Specialist, 'technologies'),
+    Specialist.projects.through: (Specialist, 'projects'),
+    Specialist.own_projects.through: (Specialist, 'own_projects'),
+}
+
+# m2m through model -> its counter column
+THROUGH_COUNTERS = {counter.through_model(): counter for counter in COUNTERS}
+# m2m through model -> its foreign key to the counted side
+THROUGH_TARGETS = {
+    through_model: next(
+        field.name for field in through_model._meta.concrete_fields
+        if field.is_relation and field.name != counter.owner_field
+    )
+    for through_model, counter in THROUGH_COUNTERS.items()
+}
+# model -> (counter, foreign key of the through model to it) of the rows its deletion cascades to
+CASCADED_COUNTERS = defaultdict(list)
+for through_model, target_field in THROUGH_TARGETS.items():
+    CASCADED_COUNTERS[through_model._meta.get_field(target_field).related_model].append(
+        (THROUGH_COUNTERS[through_model], target_field)
+    )
+
+
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+@receiver(post_save, sender=Technology)
+@receiver(post_delete, sender=Technology)
+def invalidate_catalog_on_change(sender, **kwargs):
+    invalidate_catalog()
+    transaction.on_commit(invalidate_catalog)
+
+
+def _loaded_indexes():
+    'In-memory indexes kept up to date by the receivers below, skipped until they are built'
+    return [index for index in (peek_matching_index(), peek_leaderboards()) if index is not None]
+
+
+@receiver(m2m_changed, sender=Specialist.languages.through)
+@receiver(m2m_changed, sender=Specialist.technologies.through)
+@receiver(m2m_changed, sender=Project.languages.through)
+@receiver(m2m_changed, sender=Project.technologies.through)
+def update_indexed_skills(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    index_name, section, _, _ = THROUGH_MODELS[sender]
+    instance_id, pk_set = instance.pk, set(pk_set or ())
+
+    def update():
+        for index in _loaded_indexes():
+            entities = getattr(index, index_name)
+            with index.lock:
+                if action == 'post_clear' and not reverse:
+                    entities.clear_skills(instance_id, section)
+                elif action == 'post_clear':
+                    entities.drop_skill(section, instance_id)
+                else:
+                    pairs = [(pk, instance_id) for pk in pk_set] if reverse \
+                        else [(instance_id, pk) for pk in pk_set]
+                    update_skills = entities.add_skills if action == 'post_add' \
+                        else entities.remove_skills
+                    for entity_id, skill_id in pairs:
+                        update_skills(entity_id, section, (skill_id,))
+
+    transaction.on_commit(update)
+
+
+@receiver(post_save, sender=Specialist)
+def update_indexed_specialist(sender, instance, **kwargs):
+    specialist_id, attrs = instance.pk, {'rating': instance.rating, 'label': instance.direction}
+
+    def update():
+        for index in _loaded_indexes():
+            with index.lock:
+                index.specialists.update_entity(specialist_id, **attrs)
+
+    transaction.on_commit(update)
+
+
+@receiver(post_save, sender=Project)
+def update_indexed_project(sender, instance, **kwargs):
+    project_id, attrs = instance.pk, {
+        'rating': instance.rating,
+        'label': instance.type,
+        'is_private': instance.is_private,
+        'owner_id': instance.owner_id,
+    }
+
+    def update():
+        for index in _loaded_indexes():
+            with index.lock:
+                index.projects.update_entity(project_id, **attrs)
+
+    transaction.on_commit(update)
+
+
+@receiver(post_delete, sender=Specialist)
+@receiver(post_delete, sender=Project)
+def remove_indexed_entity(sender, instance, **kwargs):
+    index_name = 'specialists' if sender is Specialist else 'projects'
+    entity_id = instance.pk
+
+    def remove():
+        for index in _loaded_indexes():
+            with index.lock:
+                getattr(index, index_name).remove_entity(entity_id)
+
+    transaction.on_commit(remove)
+
+
+@receiver(post_delete, sender=Language)
+@receiver(post_delete, sender=Technology)
+def drop_indexed_skill(sender, instance, **kwargs):
+    section = 'languages' if sender is Language else 'technologies'
+    skill_id = instance.pk
+
+    def drop():
+        for index in _loaded_indexes():
+            with index.lock:
+                index.specialists.drop_skill(section, skill_id)
+                index.projects.drop_skill(section, skill_id)
+
+    transaction.on_commit(drop)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Specialist)
+def touch_saved_entity(sender, instance, created, **kwargs):
+    bump_collections(COLLECTIONS[sender])
+    if created:
+        return
+    if sender is Project:
+        touch(specialists_showing_project(instance.pk))
+    else:
+        touch(projects_showing_specialist(instance.pk))
+
+
+@receiver(pre_delete, sender=Project)
+def touch_specialists_of_deleted_project(sender, instance, **kwargs):
+    touch_on_commit(specialists_showing_project(instance.pk))
+
+
+@receiver(pre_delete, sender=Specialist)
+def touch_projects_of_deleted_specialist(sender, instance, **kwargs):
+    touch_on_commit(projects_showing_specialist(instance.pk))
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Specialist)
+def bump_deleted_entity_collection(sender, **kwargs):
+    bump_collections(COLLECTIONS[sender])
+
+
+@receiver(m2m_changed)
+def touch_m2m_source(sender, instance, action, reverse, pk_set, **kwargs):
+    if sender not in M2M_SOURCES:
+        return
+    model, field_name = M2M_SOURCES[sender]
+    if action in ('post_add', 'post_remove') and pk_set:
+        touch(model.objects.filter(pk__in=pk_set if reverse else {instance.pk}))
+    elif action == 'post_clear' and not reverse:
+        touch(model.objects.filter(pk=instance.pk))
+    elif action == 'pre_clear' and reverse:
+        touch(model.objects.filter(**{field_name: instance.pk}))
+
+
+@receiver(post_save, sender=Language)
+@receiver(pre_delete, sender=Language)
+@receiver(post_save, sender=Technology)
+@receiver(pre_delete, sender=Technology)
+def touch_skill_owners(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    field_name = 'languages' if sender is Language else 'technologies'
+    touch(Project.objects.filter(**{field_name: instance.pk}))
+    touch(Specialist.objects.filter(**{field_name: instance.pk}))
+
+
+@receiver(post_save, sender=Specialist)
+@receiver(post_delete, sender=Specialist)
+def invalidate_specialist_tokens(sender, instance, **kwargs):
+    user_id = instance.pk
+    invalidate_user_tokens(user_id)
+    transaction.on_commit(lambda: invalidate_user_tokens(user_id))
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+    transaction.on_commit(lambda: invalidate_token(instance.key))
+
+
+@receiver(post_save, sender=Offer)
+def count_created_offer(sender, instance, created, **kwargs):
+    if created and instance.response is None:
+        shift_pending_counters(offer=instance, delta=1)
+        transaction.on_commit(lambda: inc(OFFER_TRANSITIONS, instance.type, 'created'))
+
+
+@receiver(post_delete, sender=Offer)
+def count_deleted_offer(sender, instance, **kwargs):
+    if instance.response is None:
+        shift_pending_counters(offer=instance, delta=-1)
+
+
+def count_added_m2m_rows(sender, instance, action, reverse, pk_set, **kwargs):
+    'Manager `add` bulk creates the rows of pk_set, which skips post_save'
+    if action != 'post_add' or not pk_set:
+        return
+    # counters live on the model declaring the field, the reverse side adds one row to each
+    deltas = {pk: 1 for pk in pk_set} if reverse else {instance.pk: len(pk_set)}
+    shift_counter(THROUGH_COUNTERS[sender], deltas)
+
+
+def count_created_through_row(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counter = THROUGH_COUNTERS[sender]
+        shift_counter(counter, {getattr(instance, counter.owner_field + '_id'): 1})
+
+
+def uncount_removed_m2m_rows(sender, instance, action, reverse, pk_set, **kwargs):
+    'Manager `remove`/`clear` delete the rows with a queryset delete, which skips post_delete'
+    if action not in ('pre_remove', 'pre_clear') or (action == 'pre_remove' and not pk_set):
+        return
+    counter = THROUGH_COUNTERS[sender]
+    other_field = THROUGH_TARGETS[sender]
+    source_field, target_field = (other_field, counter.owner_field) if reverse \
+        else (counter.owner_field, other_field)
+    rows = sender.objects.filter(**{source_field: instance.pk})
+    if action == 'pre_remove':
+        rows = rows.filter(**{f'{target_field}__in': pk_set})
+    uncount_rows(counter, rows)
+
+
+def uncount_cascaded_rows(sender, instance, **kwargs):
+    'Through rows of a deleted entity or skill are fast deleted by the cascade'
+    for counter, field_name in CASCADED_COUNTERS[sender]:
+        uncount_rows(counter, counter.through_model().objects.filter(**{field_name: instance.pk}))
+
+
+# connected per through model, a receiver of every sender would turn off fast deletes of all
+# models; the through models have no delete receivers, so cascades fast delete their rows
+for through_model in THROUGH_COUNTERS:
+    m2m_changed.connect(count_added_m2m_rows, sender=through_model)
+    m2m_changed.connect(uncount_removed_m2m_rows, sender=through_model)
+    post_save.connect(count_created_through_row, sender=through_model)
+for deleted_model in CASCADED_COUNTERS:
+    pre_delete.connect(uncount_cascaded_rows, sender=deleted_model)
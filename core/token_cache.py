@@ -0,0 +1,89 @@
+"""
+Per-process cache of token -> specialist lookups.
+
+Signals in core.signals invalidate entries in the process writing the change only, the short
+TOKEN_CACHE_TTL bounds how long other processes serve a stale or revoked entry.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.authtoken.models import Token
+
+# token key -> (cached at, token with its user), least recently used first
+_tokens: OrderedDict[str, tuple[float, Token]] = OrderedDict()
+_keys_by_user: dict[int, set[str]] = {}
+_lock = threading.Lock()
+
+
+def get_cached_token(key: str) -> Token | None:
+    """
+    Return a copy of the cached token (with a copy of its user) or None on a miss.
+
+    Copies are handed out so request handlers can mutate `request.user` without leaking the
+    changes into other requests.
+    """
+    with _lock:
+        entry = _tokens.get(key)
+        if entry is None:
+            return None
+        cached_at, token = entry
+        if time.monotonic() - cached_at > _ttl():
+            _pop(key)
+            return None
+        _tokens.move_to_end(key)
+    return _copy_token(token)
+
+
+def cache_token(token: Token) -> None:
+    token = _copy_token(token)
+    with _lock:
+        _pop(token.key)
+        _tokens[token.key] = (time.monotonic(), token)
+        _keys_by_user.setdefault(token.user_id, set()).add(token.key)
+        while len(_tokens) > _max_size():
+            _pop(next(iter(_tokens)))
+
+
+def invalidate_token(key: str) -> None:
+    with _lock:
+        _pop(key)
+
+
+def invalidate_user_tokens(user_id: int) -> None:
+    with _lock:
+        for key in _keys_by_user.get(user_id, set()).copy():
+            _pop(key)
+
+
+def clear_token_cache() -> None:
+    with _lock:
+        _tokens.clear()
+        _keys_by_user.clear()
+
+
+def _pop(key: str) -> None:
+    entry = _tokens.pop(key, None)
+    if entry is None:
+        return
+    user_keys = _keys_by_user[entry[1].user_id]
+    user_keys.discard(key)
+    if not user_keys:
+        del _keys_by_user[entry[1].user_id]
+
+
+def _copy_token(token: Token) -> Token:
+    user = copy.copy(token.user)
+    token = copy.copy(token)
+    token.user = user
+    return token
+
+
+def _ttl() -> float:
+    return getattr(settings, 'TOKEN_CACHE_TTL', 5)
+
+
+def _max_size() -> int:
+    return getattr(settings, 'TOKEN_CACHE_SIZE', 10000)
@@ -0,0 +1,61 @@
+"""
+Modification tracking behind conditional GET.
+
+`updated_at` of a project/specialist changes with anything in its serialized representation,
+including nested related entities and skill names, and every such change bumps the version of
+the collection the entity belongs to. Signal handlers in core.signals call into this module.
+Entities related to a deleted one are touched once the deletion commits, with the ids read
+while the relations they are found through still exist.
+"""
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import F, Q, QuerySet
+from django.utils import timezone
+
+from core.models import CollectionVersion, Project, Specialist
+
+PROJECTS = 'projects'
+SPECIALISTS = 'specialists'
+
+COLLECTIONS = {Project: PROJECTS, Specialist: SPECIALISTS}
+
+
+def get_collection_version(name: str) -> tuple[int, datetime]:
+    row = CollectionVersion.objects.filter(name=name).values_list('version', 'updated_at').first()
+    if row is None:
+        collection_version, _ = CollectionVersion.objects.get_or_create(name=name)
+        row = collection_version.version, collection_version.updated_at
+    return row
+
+
+def bump_collections(*names: str) -> None:
+    updated = CollectionVersion.objects.filter(name__in=names) \
+        .update(version=F('version') + 1, updated_at=timezone.now())
+    if updated < len(names):
+        CollectionVersion.objects.bulk_create(
+            [CollectionVersion(name=name, version=1) for name in names], ignore_conflicts=True
+        )
+
+
+def touch(queryset: QuerySet) -> None:
+    'Mark entities of the queryset as modified'
+    if queryset.update(updated_at=timezone.now()):
+        bump_collections(COLLECTIONS[queryset.model])
+
+
+def touch_on_commit(queryset: QuerySet) -> None:
+    'Touch the entities of the queryset when the current transaction commits'
+    ids = list(queryset.values_list('pk', flat=True).distinct())
+    if ids:
+        model = queryset.model
+        transaction.on_commit(lambda: touch(model.objects.filter(pk__in=ids)))
+
+
+def projects_showing_specialist(specialist_id: int) -> QuerySet:
+    return Project.objects.filter(Q(owner_id=specialist_id) | Q(team__id=specialist_id))
+
+
+def specialists_showing_project(project_id: int) -> QuerySet:
+    shown_in = Q(current_project_id=project_id) | Q(projects__id=project_id)
+    return Specialist.objects.filter(shown_in | Q(own_projects__id=project_id))
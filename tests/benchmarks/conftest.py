@@ -0,0 +1,40 @@
+import os
+import time
+
+import pytest
+
+from core.catalog import invalidate_catalog
+from core.leaderboard import invalidate_leaderboards
+from core.matching import invalidate_matching_index
+from tests.benchmarks.dataset import clear_dataset, seed_dataset
+from tests.integration.config import logger
+
+SCALE = int(os.environ.get('BENCHMARK_SCALE', 0))
+
+requires_scale = pytest.mark.skipif(not SCALE, reason='BENCHMARK_SCALE is not set')
+
+# Latency and memory limits are measured on one machine: they are only reported, unless
+# BENCHMARK_ENFORCE_LIMITS=1 makes exceeding them fail the run on comparable hardware
+ENFORCE_LIMITS = os.environ.get('BENCHMARK_ENFORCE_LIMITS') == '1'
+
+
+def check_limit(within_limit: bool, message: str) -> None:
+    'Fail with the message when limits are enforced, log it as a warning otherwise'
+    if ENFORCE_LIMITS:
+        assert within_limit, logger.error(message)
+    elif not within_limit:
+        logger.warning(message)
+
+
+@pytest.fixture(scope='session')
+def dataset(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        started_at = time.perf_counter()
+        data = seed_dataset(specialists_count=SCALE)
+        logger.info(f'Seeded {SCALE} specialists in {time.perf_counter() - started_at:.1f}s')
+    yield data
+    with django_db_blocker.unblock():
+        clear_dataset()
+    invalidate_catalog()
+    invalidate_matching_index()
+    invalidate_leaderboards()
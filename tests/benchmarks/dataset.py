@@ -0,0 +1,164 @@
+from dataclasses import dataclass
+from random import Random
+
+from django.contrib.auth.hashers import make_password
+from rest_framework.authtoken.models import Token
+
+from core.data_migration.const import LANGUAGES, TECHNOLOGIES
+from core.models import Language, Technology, Specialist, Project, Offer
+from core.models.choices import Direction, OfferType, ProjectType
+from core.models.project import ProjectLanguage, ProjectTechnology, ProjectTeam
+from core.models.specialist import (
+    SpecialistLanguage,
+    SpecialistOwnProject,
+    SpecialistProject,
+    SpecialistTechnology,
+)
+from core.offers import recount_pending_offers
+
+PASSWORD = 'benchmark-password'
+BATCH_SIZE = 2000
+
+
+@dataclass
+class Dataset:
+    'Seeded rows that the endpoint specs point their requests at'
+    owner: Specialist
+    member: Specialist
+    project: Project
+    offer: Offer
+    tokens: dict[int, str]
+    password: str = PASSWORD
+
+
+def seed_dataset(specialists_count: int, seed: int = 0) -> Dataset:
+    """
+    Bulk-create a realistic graph: every second specialist owns a project, projects get teams
+    of up to three members, everybody gets a few languages/technologies, and there are
+    specialists_count // 2 pending offers.
+
+    Specialists 0 (owner) and 1 (member) are kept out of teams so every offer endpoint can
+    be called for them.
+    """
+    random = Random(seed)
+    password = make_password(PASSWORD)
+    language_ids = list(Language.objects.values_list('id', flat=True))
+    technology_ids = list(Technology.objects.values_list('id', flat=True))
+
+    specialists = Specialist.objects.bulk_create([
+        Specialist(
+            nickname=f'bench{index}',
+            github_nickname=f'bench{index}',
+            password=password,
+            direction=random.choice(Direction.values),
+            rating=random.randint(0, 1000),
+            about=f'{random.choice(LANGUAGES)} developer number {index}',
+            country=random.choice(('Germany', 'Poland', 'Spain', 'Japan')),
+            city=random.choice(('Berlin', 'Warsaw', 'Madrid', 'Tokyo')),
+        )
+        for index in range(specialists_count)
+    ], batch_size=BATCH_SIZE)
+    tokens = Token.objects.bulk_create(
+        [Token(key=Token.generate_key(), user=specialist) for specialist in specialists],
+        batch_size=BATCH_SIZE
+    )
+
+    owners = specialists[::2]
+    projects = Project.objects.bulk_create([
+        Project(
+            name=f'bench project {index}',
+            github_name=f'bench-project-{index}',
+            description=f'{random.choice(TECHNOLOGIES)["name"]} based project number {index}',
+            type=random.choice(ProjectType.values),
+            rating=random.randint(0, 1000),
+            is_private=random.random() < 0.1,
+            owner=owner,
+        )
+        for index, owner in enumerate(owners)
+    ], batch_size=BATCH_SIZE)
+    SpecialistOwnProject.objects.bulk_create([
+        SpecialistOwnProject(specialist=project.owner, own_project=project) for project in projects
+    ], batch_size=BATCH_SIZE)
+
+    _seed_skills(random, specialists, projects, language_ids, technology_ids)
+    _seed_teams(random, specialists, projects)
+
+    Offer.objects.bulk_create([
+        Offer(
+            sender=random.choice(specialists),
+            recipient=random.choice(specialists),
+            project=random.choice(projects),
+            type=random.choice(OfferType.values),
+        )
+        for _ in range(specialists_count // 2)
+    ], batch_size=BATCH_SIZE)
+    offer = Offer.objects.create(
+        sender=specialists[0],
+        recipient=specialists[1],
+        project=projects[0],
+        type=OfferType.ADD_TO_TEAM,
+    )
+    # bulk_create skips the signals maintaining pending counters
+    recount_pending_offers()
+
+    return Dataset(
+        owner=specialists[0],
+        member=specialists[1],
+        project=projects[0],
+        offer=offer,
+        tokens={token.user_id: token.key for token in tokens},
+    )
+
+
+def clear_dataset() -> None:
+    'Delete the graph with plain DELETE statements, skipping signals and the collector'
+    for model in (Offer, ProjectTeam, SpecialistProject, SpecialistOwnProject,
+                  SpecialistLanguage, SpecialistTechnology, ProjectLanguage, ProjectTechnology,
+                  Token):
+        model.objects.all()._raw_delete(using='default')
+    Specialist.objects.update(current_project=None)
+    Project.objects.all()._raw_delete(using='default')
+    Specialist.objects.all()._raw_delete(using='default')
+
+
+def _seed_skills(random: Random, specialists: list, projects: list,
+                 language_ids: list, technology_ids: list) -> None:
+    SpecialistLanguage.objects.bulk_create([
+        SpecialistLanguage(specialist=specialist, language_id=language_id)
+        for specialist in specialists
+        for language_id in random.sample(language_ids, random.randint(1, 4))
+    ], batch_size=BATCH_SIZE)
+    SpecialistTechnology.objects.bulk_create([
+        SpecialistTechnology(specialist=specialist, technology_id=technology_id)
+        for specialist in specialists
+        for technology_id in random.sample(technology_ids, random.randint(0, 3))
+    ], batch_size=BATCH_SIZE)
+    ProjectLanguage.objects.bulk_create([
+        ProjectLanguage(project=project, language_id=language_id)
+        for project in projects
+        for language_id in random.sample(language_ids, random.randint(1, 3))
+    ], batch_size=BATCH_SIZE)
+    ProjectTechnology.objects.bulk_create([
+        ProjectTechnology(project=project, technology_id=technology_id)
+        for project in projects
+        for technology_id in random.sample(technology_ids, random.randint(1, 3))
+    ], batch_size=BATCH_SIZE)
+
+
+def _seed_teams(random: Random, specialists: list, projects: list) -> None:
+    free_specialists = specialists[2:]
+    random.shuffle(free_specialists)
+    team_rows, member_rows = [], []
+    for project in projects:
+        for _ in range(random.randint(0, 3)):
+            if not free_specialists:
+                break
+            member = free_specialists.pop()
+            member.current_project = project
+            team_rows.append(ProjectTeam(project=project, specialist=member))
+            member_rows.append(SpecialistProject(specialist=member, project=project))
+    ProjectTeam.objects.bulk_create(team_rows, batch_size=BATCH_SIZE)
+    SpecialistProject.objects.bulk_create(member_rows, batch_size=BATCH_SIZE)
+    Specialist.objects.bulk_update(
+        [row.specialist for row in team_rows], ['current_project'], batch_size=BATCH_SIZE
+    )
@@ -0,0 +1,299 @@
+"""
+Query count, latency and memory benchmarks for every URL in api.urls.
+
+Skipped unless BENCHMARK_SCALE (number of seeded specialists) is set:
+
+    BENCHMARK_SCALE=1000 pytest tests/benchmarks
+
+Results are compared with baseline.json, BENCHMARK_UPDATE_BASELINE=1 rewrites it instead.
+Query counts always fail the run when they exceed the baseline, latency and memory only with
+BENCHMARK_ENFORCE_LIMITS=1.
+"""
+import gc
+import json
+import os
+import statistics
+import textwrap
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from django.db import connection, transaction
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.urls import URL_PATTERN_NAME
+from core.catalog import invalidate_catalog
+from core.data_migration.const import LANGUAGES
+from core.leaderboard import invalidate_leaderboards
+from core.matching import invalidate_matching_index
+from tests.benchmarks.conftest import SCALE, check_limit, requires_scale
+from tests.benchmarks.dataset import Dataset
+from tests.integration.config import logger
+
+ITERATIONS = int(os.environ.get('BENCHMARK_ITERATIONS', 20))
+LATENCY_TOLERANCE = float(os.environ.get('BENCHMARK_LATENCY_TOLERANCE', 1.0))
+MEMORY_TOLERANCE = float(os.environ.get('BENCHMARK_MEMORY_TOLERANCE', 0.5))
+UPDATE_BASELINE = os.environ.get('BENCHMARK_UPDATE_BASELINE') == '1'
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+
+
+def _owner_token(data: Dataset) -> str:
+    return data.tokens[data.owner.id]
+
+
+def _member_token(data: Dataset) -> str:
+    return data.tokens[data.member.id]
+
+
+def _owner_project(data: Dataset) -> dict:
+    return {'project_id': data.project.id}
+
+
+# URL name -> (method, url kwargs, body, token), each callable gets the seeded Dataset
+ENDPOINTS = {
+    URL_PATTERN_NAME.LANGUAGES: ('get', None, None, None),
+    URL_PATTERN_NAME.TECHNOLOGIES: ('get', None, None, None),
+
+    URL_PATTERN_NAME.SPECIALISTS: ('get', None, None, None),
+    URL_PATTERN_NAME.RETRIEVE_SPECIALIST: (
+        'get', lambda data: {'specialist_id': data.owner.id}, None, None
+    ),
+    URL_PATTERN_NAME.CREATE_SPECIALIST: (
+        'post', None,
+        lambda data: {'nickname': 'new bench', 'github_nickname': 'new bench',
+                      'password': data.password, 'direction': 'BACKEND'},
+        None,
+    ),
+    URL_PATTERN_NAME.AUTHENTICATE_SPECIALIST: (
+        'post', None,
+        lambda data: {'nickname': data.owner.nickname, 'password': data.password},
+        None,
+    ),
+    URL_PATTERN_NAME.PATCH_SPECIALIST: (
+        'patch', None, lambda data: {'about': 'updated about'}, _owner_token
+    ),
+    URL_PATTERN_NAME.CHANGE_SPECIALIST_PASSWORD: (
+        'patch', None, lambda data: {'password': 'new-benchmark-password'}, _owner_token
+    ),
+    URL_PATTERN_NAME.DELETE_SPECIALIST: ('delete', None, None, _owner_token),
+    URL_PATTERN_NAME.ADD_LANGUAGES_TO_SPECIALIST: (
+        'patch', None, lambda data: {'languages': list(LANGUAGES)}, _owner_token
+    ),
+    URL_PATTERN_NAME.REMOVE_SPECIALIST_LANGUAGES: (
+        'patch', None, lambda data: {'languages': list(LANGUAGES)}, _owner_token
+    ),
+    URL_PATTERN_NAME.ADD_TECHNOLOGIES_TO_SPECIALIST: (
+        'patch', None, lambda data: {'technologies': ['Django', 'React', 'Redis']}, _owner_token
+    ),
+    URL_PATTERN_NAME.REMOVE_SPECIALIST_TECHNOLOGIES: (
+        'patch', None, lambda data: {'technologies': ['Django', 'React', 'Redis']}, _owner_token
+    ),
+    URL_PATTERN_NAME.MATCHING_PROJECTS: (
+        'get', lambda data: {'specialist_id': data.owner.id}, None, None
+    ),
+    URL_PATTERN_NAME.SEARCH_SPECIALISTS: (
+        'get', None, lambda data: {'q': 'python developer'}, None
+    ),
+    URL_PATTERN_NAME.SPECIALISTS_LEADERBOARD: (
+        'get', None, lambda data: {'direction': 'BACKEND', 'language': 'Python'}, None
+    ),
+    URL_PATTERN_NAME.SPECIALIST_RANK: (
+        'get', lambda data: {'specialist_id': data.owner.id}, None, None
+    ),
+
+    URL_PATTERN_NAME.PROJECTS: ('get', None, None, None),
+    URL_PATTERN_NAME.RETRIEVE_PROJECT: ('get', _owner_project, None, None),
+    URL_PATTERN_NAME.CREATE_PROJECT: (
+        'post', None, lambda data: {'name': 'new bench project', 'github_name': 'new',
+                                    'type': 'SERVICE'},
+        _owner_token,
+    ),
+    URL_PATTERN_NAME.UPDATE_PROJECT: (
+        'patch', _owner_project, lambda data: {'description': 'updated'}, _owner_token
+    ),
+    URL_PATTERN_NAME.DELETE_PROJECT: ('delete', _owner_project, None, _owner_token),
+    URL_PATTERN_NAME.ADD_LANGUAGES_TO_PROJECT: (
+        'patch', _owner_project, lambda data: {'languages': list(LANGUAGES)}, _owner_token
+    ),
+    URL_PATTERN_NAME.REMOVE_PROJECT_LANGUAGES: (
+        'patch', _owner_project, lambda data: {'languages': list(LANGUAGES)}, _owner_token
+    ),
+    URL_PATTERN_NAME.ADD_TECHNOLOGIES_TO_PROJECT: (
+        'patch', _owner_project, lambda data: {'technologies': ['Django', 'Redis']}, _owner_token
+    ),
+    URL_PATTERN_NAME.REMOVE_PROJECT_TECHNOLOGIES: (
+        'patch', _owner_project, lambda data: {'technologies': ['Django', 'Redis']}, _owner_token
+    ),
+    URL_PATTERN_NAME.TAKE_PART_IN_THE_PROJECT: ('patch', _owner_project, None, _owner_token),
+    URL_PATTERN_NAME.MATCHING_SPECIALISTS: ('get', _owner_project, None, None),
+    URL_PATTERN_NAME.SEARCH_PROJECTS: ('get', None, lambda data: {'q': 'django'}, None),
+    URL_PATTERN_NAME.PROJECTS_LEADERBOARD: (
+        'get', None, lambda data: {'technology': 'Django'}, None
+    ),
+    URL_PATTERN_NAME.PROJECT_RANK: ('get', _owner_project, None, None),
+
+    URL_PATTERN_NAME.ADD_TO_TEAM: (
+        'post', None,
+        lambda data: {'recipient_id': data.member.id, 'project_id': data.project.id},
+        _owner_token,
+    ),
+    URL_PATTERN_NAME.JOIN_TO_TEAM: (
+        'post', None,
+        lambda data: {'recipient_id': data.owner.id, 'project_id': data.project.id},
+        _member_token,
+    ),
+    URL_PATTERN_NAME.GIVE_OWNERSHIP: (
+        'post', None,
+        lambda data: {'recipient_id': data.member.id, 'project_id': data.project.id},
+        _owner_token,
+    ),
+    URL_PATTERN_NAME.GET_OWNERSHIP: (
+        'post', None,
+        lambda data: {'recipient_id': data.owner.id, 'project_id': data.project.id},
+        _member_token,
+    ),
+    URL_PATTERN_NAME.RESPONSE_TO_OFFER: (
+        'patch', lambda data: {'offer_id': data.offer.id}, lambda data: {'response': True},
+        _member_token,
+    ),
+    URL_PATTERN_NAME.INBOX_OFFERS: ('get', None, None, _member_token),
+    URL_PATTERN_NAME.OUTBOX_OFFERS: (
+        'get', None, lambda data: {'state': 'pending'}, _owner_token
+    ),
+    URL_PATTERN_NAME.PENDING_OFFERS_COUNT: ('get', None, None, _member_token),
+}
+
+_results = {}
+
+
+class QueryCounter:
+    """
+    Execute wrapper counting queries, unlike queries_log it is not capped.
+
+    Savepoint statements issued by the rollback around every call are not counted.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.startswith(('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')):
+            self.count += 1
+        return execute(sql, params, many, context)
+
+
+@pytest.fixture(scope='module', autouse=True)
+def report():
+    yield
+    _report()
+
+
+def test_every_url_is_benchmarked():
+    url_names = {value for name, value in vars(URL_PATTERN_NAME).items() if name.isupper()}
+    missing = url_names - set(ENDPOINTS)
+
+    assert not missing, logger.error(textwrap.dedent(f"""
+        URL names {sorted(missing)} have no benchmark spec in ENDPOINTS
+    """))
+
+
+@requires_scale
+@pytest.mark.parametrize('url_name', sorted(ENDPOINTS))
+def test_endpoint(url_name, dataset, db):
+    method, url_kwargs, body, token = ENDPOINTS[url_name]
+    client = APIClient()
+    if token:
+        client.credentials(HTTP_AUTHORIZATION='Token ' + token(dataset))
+    url = reverse(url_name, kwargs=url_kwargs(dataset) if url_kwargs else None)
+    payload = body(dataset) if body else None
+
+    def call():
+        with transaction.atomic():
+            response = getattr(client, method)(url, data=payload)
+            transaction.set_rollback(True)
+        if method != 'get':
+            invalidate_catalog()
+            invalidate_matching_index()
+            invalidate_leaderboards()
+        return response
+
+    response = call()
+    assert response.status_code < 300, logger.error(textwrap.dedent(f"""
+        {url_name} should succeed on the seeded dataset, but returned {response.status_code}
+        {getattr(response, 'data', '')}
+    """))
+
+    queries = QueryCounter()
+    with connection.execute_wrapper(queries):
+        call()
+
+    # garbage left by earlier tests would otherwise be collected while tracing
+    gc.collect()
+    tracemalloc.start()
+    call()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(ITERATIONS):
+        started_at = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started_at) * 1000)
+    percentiles = statistics.quantiles(timings, n=20, method='inclusive')
+
+    measured = {
+        'queries': queries.count,
+        'p50_ms': round(percentiles[9], 2),
+        'p95_ms': round(percentiles[18], 2),
+        'peak_kb': round(peak_memory / 1024, 1),
+    }
+    _results[url_name] = measured
+    if not UPDATE_BASELINE:
+        _compare_with_baseline(url_name=url_name, measured=measured)
+
+
+def _compare_with_baseline(url_name: str, measured: dict) -> None:
+    baseline = _load_baseline().get(str(SCALE), {}).get(url_name)
+    if baseline is None:
+        logger.warning(f'No baseline for {url_name} at scale {SCALE}')
+        return
+
+    assert measured['queries'] <= baseline['queries'], logger.error(textwrap.dedent(f"""
+        {url_name} executed {measured['queries']} queries, baseline is {baseline['queries']}
+    """))
+
+    max_p95 = baseline['p95_ms'] * (1 + LATENCY_TOLERANCE)
+    check_limit(measured['p95_ms'] <= max_p95, textwrap.dedent(f"""
+        {url_name} p95 latency {measured['p95_ms']}ms exceeds {max_p95:.2f}ms
+        (baseline {baseline['p95_ms']}ms, tolerance {LATENCY_TOLERANCE:.0%})
+    """))
+
+    max_peak = baseline['peak_kb'] * (1 + MEMORY_TOLERANCE)
+    check_limit(measured['peak_kb'] <= max_peak, textwrap.dedent(f"""
+        {url_name} peak memory {measured['peak_kb']}KiB exceeds {max_peak:.1f}KiB
+        (baseline {baseline['peak_kb']}KiB, tolerance {MEMORY_TOLERANCE:.0%})
+    """))
+
+
+def _load_baseline() -> dict:
+    if not BASELINE_PATH.exists():
+        return {}
+    with open(BASELINE_PATH) as file:
+        return json.load(file)
+
+
+def _report() -> None:
+    lines = [f'{"url name":<32}{"queries":>8}{"p50 ms":>10}{"p95 ms":>10}{"peak KiB":>10}']
+    for url_name, measured in sorted(_results.items()):
+        lines.append(f'{url_name:<32}{measured["queries"]:>8}{measured["p50_ms"]:>10}'
+                     f'{measured["p95_ms"]:>10}{measured["peak_kb"]:>10}')
+    logger.info('\n'.join(lines))
+
+    if UPDATE_BASELINE and _results:
+        baseline = _load_baseline()
+        baseline[str(SCALE)] = dict(sorted(_results.items()))
+        with open(BASELINE_PATH, 'w') as file:
+            json.dump(baseline, file, indent=2)
+            file.write('\n')
@@ -0,0 +1,71 @@
+"""
+Latency of the facet counts of core.facets on the seeded dataset, for the filter combinations
+list clients use most.
+
+    BENCHMARK_SCALE=100000 pytest tests/benchmarks/test_facets.py
+"""
+import os
+import textwrap
+import time
+
+import pytest
+
+from core.catalog import get_catalog
+from core.facets import PROJECT_FACETS, SPECIALIST_FACETS, count_facets, filter_facets
+from core.models import Project, Specialist
+from tests.benchmarks.conftest import check_limit, requires_scale
+from tests.integration.config import logger
+
+ROUNDS = int(os.environ.get('BENCHMARK_FACETS_ROUNDS', 5))
+MAX_FACET_MS = float(os.environ.get('BENCHMARK_MAX_FACET_MS', 50))
+
+
+def _python_id() -> int:
+    return get_catalog().languages.ids_by_name['python']
+
+
+# name -> (base queryset, facets, selected values)
+COMBINATIONS = {
+    'specialists': (lambda: Specialist.objects.all(), SPECIALIST_FACETS, lambda: {}),
+    'specialists by direction': (
+        lambda: Specialist.objects.all(), SPECIALIST_FACETS, lambda: {'direction': ['BACKEND']}
+    ),
+    'specialists by direction and language': (
+        lambda: Specialist.objects.all(), SPECIALIST_FACETS,
+        lambda: {'direction': ['BACKEND'], 'language': [_python_id()]},
+    ),
+    'specialists by location': (
+        lambda: Specialist.objects.all(), SPECIALIST_FACETS,
+        lambda: {'country': ['Germany'], 'city': ['Berlin']},
+    ),
+    'projects by type and language': (
+        lambda: Project.objects.filter(is_private=False), PROJECT_FACETS,
+        lambda: {'type': ['SERVICE'], 'language': [_python_id()]},
+    ),
+}
+
+
+@requires_scale
+@pytest.mark.parametrize('name', sorted(COMBINATIONS))
+def test_facet_counts(name, dataset, db):
+    queryset, facets, selected = COMBINATIONS[name]
+    names = [facet.name for facet in facets]
+    timings = {}
+    for facet_name in names:
+        rounds = []
+        for _ in range(ROUNDS):
+            started_at = time.perf_counter()
+            count_facets(queryset(), facets, selected(), [facet_name])
+            rounds.append((time.perf_counter() - started_at) * 1000)
+        timings[facet_name] = min(rounds)
+    started_at = time.perf_counter()
+    list(filter_facets(queryset(), facets, selected()).order_by('id').values('id')[:50])
+    page_ms = (time.perf_counter() - started_at) * 1000
+    logger.info(f'{name}: page {page_ms:.1f}ms, ' + ', '.join(
+        f'{facet_name} {ms:.1f}ms' for facet_name, ms in timings.items()
+    ))
+
+    slow = {facet_name: ms for facet_name, ms in timings.items() if ms > MAX_FACET_MS}
+    check_limit(not slow, textwrap.dedent(f"""
+        Facet counts of {name} should take at most {MAX_FACET_MS}ms, but took {slow}
+    """))
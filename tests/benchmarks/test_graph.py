@@ -0,0 +1,90 @@
+"""
+Throughput and memory of the export_graph/import_graph NDJSON round trip over the seeded graph,
+about 11 rows per seeded specialist (BENCHMARK_SCALE=100000 is about 1.1M rows).
+
+    BENCHMARK_SCALE=100000 pytest tests/benchmarks/test_graph.py
+"""
+import os
+import textwrap
+import time
+import tracemalloc
+
+from rest_framework.authtoken.models import Token
+
+from core.graph import export_graph, import_graph, read_ndjson, write_ndjson
+from core.models import Offer, Project, Specialist
+from core.models.project import ProjectLanguage, ProjectTeam, ProjectTechnology
+from core.models.specialist import (
+    SpecialistLanguage,
+    SpecialistOwnProject,
+    SpecialistProject,
+    SpecialistTechnology,
+)
+from tests.benchmarks.conftest import requires_scale
+from tests.benchmarks.dataset import clear_dataset
+from tests.integration.config import logger
+
+MAX_PEAK_MB = float(os.environ.get('BENCHMARK_GRAPH_MAX_PEAK_MB', 64))
+
+GRAPH_MODELS = (
+    Specialist, Project, Offer, Token, ProjectTeam, SpecialistProject, SpecialistOwnProject,
+    SpecialistLanguage, SpecialistTechnology, ProjectLanguage, ProjectTechnology,
+)
+
+
+def _graph_rows() -> dict[str, int]:
+    return {model.__name__: model.objects.count() for model in GRAPH_MODELS}
+
+
+def _export(path) -> int:
+    with open(path, 'w', encoding='utf-8') as file:
+        return write_ndjson(export_graph(), file=file)
+
+
+def _import(path) -> None:
+    with open(path, encoding='utf-8') as file:
+        import_graph(read_ndjson(file))
+
+
+def _timed(run) -> float:
+    started_at = time.perf_counter()
+    run()
+    return time.perf_counter() - started_at
+
+
+def _peak_mb(run) -> float:
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+@requires_scale
+def test_graph_round_trip(dataset, db, tmp_path):
+    path = tmp_path / 'graph.ndjson'
+    rows = _graph_rows()
+    total = sum(rows.values())
+
+    export_s = _timed(lambda: _export(path))
+    export_peak_mb = _peak_mb(lambda: _export(path))
+    clear_dataset()
+    import_s = _timed(lambda: _import(path))
+    reimported_rows = _graph_rows()
+    clear_dataset()
+    import_peak_mb = _peak_mb(lambda: _import(path))
+
+    logger.info(
+        f'{total} rows, {path.stat().st_size / 2 ** 20:.0f}MB of NDJSON: '
+        f'export {export_s:.1f}s ({total / export_s:.0f} rows/s, peak {export_peak_mb:.1f}MB), '
+        f'import {import_s:.1f}s ({total / import_s:.0f} rows/s, peak {import_peak_mb:.1f}MB)'
+    )
+
+    assert reimported_rows == rows, logger.error(textwrap.dedent(f"""
+        Imported graph should have the exported number of rows {rows}, but has {reimported_rows}
+    """))
+    assert max(export_peak_mb, import_peak_mb) < MAX_PEAK_MB, logger.error(textwrap.dedent(f"""
+        Export and import should stay under {MAX_PEAK_MB}MB of traced memory, but peaked at
+        {export_peak_mb:.1f}MB and {import_peak_mb:.1f}MB
+    """))
@@ -0,0 +1,91 @@
+"""
+DRF serializers vs the `.values()` read path, and the camel case package renderer vs
+api.renderers, on every seeded row.
+
+    BENCHMARK_SCALE=10000 pytest tests/benchmarks/test_serialization.py
+"""
+import os
+import textwrap
+import time
+
+import pytest
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer as PackageRenderer
+from rest_framework.settings import api_settings
+
+from api.renderers import CamelCaseJSONRenderer
+from api.serializers.project import ProjectSerializer
+from api.serializers.specialist import SpecialistSerializer
+from api.serializers.values import (
+    PROJECT_VALUES,
+    SPECIALIST_VALUES,
+    serialize_projects,
+    serialize_specialists,
+)
+from core.models import Project, Specialist
+from tests.benchmarks.conftest import requires_scale
+from tests.integration.config import logger
+
+ROUNDS = int(os.environ.get('BENCHMARK_SERIALIZATION_ROUNDS', 3))
+MIN_SPEEDUP = float(os.environ.get('BENCHMARK_MIN_SPEEDUP', 2.0))
+MIN_RENDER_SPEEDUP = float(os.environ.get('BENCHMARK_MIN_RENDER_SPEEDUP', 2.0))
+
+READ_PATHS = {
+    'projects': (Project, ProjectSerializer, PROJECT_VALUES, serialize_projects),
+    'specialists': (Specialist, SpecialistSerializer, SPECIALIST_VALUES, serialize_specialists),
+}
+
+
+def _best_of(render) -> tuple[float, bytes]:
+    timings, content = [], b''
+    for _ in range(ROUNDS):
+        started_at = time.perf_counter()
+        content = render()
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return min(timings), content
+
+
+@requires_scale
+@pytest.mark.parametrize('name', sorted(READ_PATHS))
+def test_values_read_path(name, dataset, db):
+    model, serializer_class, values, serialize = READ_PATHS[name]
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    queryset = model.objects.order_by('id')
+
+    drf_ms, expected = _best_of(lambda: renderer.render(
+        serializer_class(serializer_class.setup_eager_loading(queryset), many=True).data
+    ))
+    values_ms, received = _best_of(lambda: renderer.render(
+        serialize(list(queryset.values(*values)))
+    ))
+    speedup = drf_ms / values_ms
+    logger.info(f'{name}: {queryset.count()} rows, DRF {drf_ms:.0f}ms, '
+                f'values {values_ms:.0f}ms, x{speedup:.1f}')
+
+    assert received == expected, logger.error(textwrap.dedent(f"""
+        Values based {name} serialization differs from {serializer_class.__name__}
+    """))
+    assert speedup >= MIN_SPEEDUP, logger.error(textwrap.dedent(f"""
+        Values based {name} serialization is x{speedup:.1f} faster than DRF,
+        expected at least x{MIN_SPEEDUP}
+    """))
+
+
+@requires_scale
+@pytest.mark.parametrize('name', sorted(READ_PATHS))
+def test_camel_case_renderer(name, dataset, db):
+    model, _, values, serialize = READ_PATHS[name]
+    data = serialize(list(model.objects.order_by('id').values(*values)))
+
+    package_ms, expected = _best_of(lambda: PackageRenderer().render(data))
+    precomputed_ms, received = _best_of(lambda: CamelCaseJSONRenderer().render(data))
+    speedup = package_ms / precomputed_ms
+    logger.info(f'{name}: {len(data)} rows, package renderer {package_ms:.0f}ms, '
+                f'precomputed renderer {precomputed_ms:.0f}ms, x{speedup:.1f}')
+
+    assert received == expected, logger.error(textwrap.dedent(f"""
+        {name} rendered by CamelCaseJSONRenderer differs from the camel case package output
+    """))
+    assert speedup >= MIN_RENDER_SPEEDUP, logger.error(textwrap.dedent(f"""
+        CamelCaseJSONRenderer renders {name} x{speedup:.1f} faster than the package renderer,
+        expected at least x{MIN_RENDER_SPEEDUP}
+    """))
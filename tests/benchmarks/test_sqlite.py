@@ -0,0 +1,119 @@
+"""
+Read/write throughput of concurrent connections to a file copy of the seeded database, under
+every SQLite profile of core.database.
+
+Readers page through inboxes and read counters, writers create offers and shift the pending
+counters in one transaction, like the offer endpoints do.
+
+    BENCHMARK_SCALE=10000 pytest tests/benchmarks/test_sqlite.py
+"""
+import os
+import sqlite3
+import textwrap
+import threading
+import time
+from random import Random
+
+from django.db import connection
+
+from core.database import SQLITE_PROFILES, apply_sqlite_pragmas
+from core.models import Project, Specialist
+from tests.benchmarks.conftest import requires_scale
+from tests.integration.config import logger
+
+READERS = int(os.environ.get('BENCHMARK_SQLITE_READERS', 4))
+WRITERS = int(os.environ.get('BENCHMARK_SQLITE_WRITERS', 2))
+SECONDS = float(os.environ.get('BENCHMARK_SQLITE_SECONDS', 3))
+
+READ_INBOX = '''
+    SELECT id, type, response, project_id, sender_id FROM core_offer
+    WHERE recipient_id = ? AND response IS NULL ORDER BY id DESC LIMIT 20
+'''
+READ_COUNTERS = 'SELECT inbox_pending_count, outbox_pending_count FROM core_specialist WHERE id = ?'
+CREATE_OFFER = '''
+    INSERT INTO core_offer (type, response, project_id, recipient_id, sender_id)
+    VALUES ('JOIN_TO_TEAM', NULL, ?, ?, ?)
+'''
+SHIFT_INBOX = \
+    'UPDATE core_specialist SET inbox_pending_count = inbox_pending_count + 1 WHERE id = ?'
+SHIFT_OUTBOX = \
+    'UPDATE core_specialist SET outbox_pending_count = outbox_pending_count + 1 WHERE id = ?'
+
+
+def _read(database, random: Random, specialist_ids: list, project_ids: list) -> None:
+    specialist_id = random.choice(specialist_ids)
+    database.execute(READ_INBOX, (specialist_id,)).fetchall()
+    database.execute(READ_COUNTERS, (specialist_id,)).fetchone()
+
+
+def _write(database, random: Random, specialist_ids: list, project_ids: list) -> None:
+    sender_id, recipient_id = random.sample(specialist_ids, 2)
+    with database:
+        database.execute(CREATE_OFFER, (random.choice(project_ids), recipient_id, sender_id))
+        database.execute(SHIFT_INBOX, (recipient_id,))
+        database.execute(SHIFT_OUTBOX, (sender_id,))
+
+
+def _worker(path, pragmas: dict, operation, seed: int, ids: tuple, deadline: float,
+            results: list) -> None:
+    database = sqlite3.connect(path)
+    apply_sqlite_pragmas(database, pragmas)
+    random = Random(seed)
+    done = locked = 0
+    while time.perf_counter() < deadline:
+        try:
+            operation(database, random, *ids)
+            done += 1
+        except sqlite3.OperationalError as error:
+            if 'locked' not in str(error):
+                raise
+            database.rollback()
+            locked += 1
+    database.close()
+    results.append((operation.__name__, done, locked))
+
+
+def _run(path, pragmas: dict, ids: tuple) -> dict[str, int]:
+    results = []
+    deadline = time.perf_counter() + SECONDS
+    workers = [
+        threading.Thread(target=_worker,
+                         args=(path, pragmas, operation, seed, ids, deadline, results))
+        for seed, operation in enumerate([_read] * READERS + [_write] * WRITERS)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    totals = {'_read': 0, '_write': 0, 'locked': 0}
+    for operation, done, locked in results:
+        totals[operation] += done
+        totals['locked'] += locked
+    return totals
+
+
+@requires_scale
+def test_sqlite_profiles_concurrency(dataset, db, tmp_path):
+    ids = (
+        list(Specialist.objects.values_list('id', flat=True)),
+        list(Project.objects.values_list('id', flat=True)),
+    )
+    connection.ensure_connection()
+    results = {}
+    for profile, pragmas in SQLITE_PROFILES.items():
+        path = tmp_path / f'{profile}.sqlite3'
+        copy = sqlite3.connect(path)
+        connection.connection.backup(copy)
+        copy.close()
+        results[profile] = _run(path, pragmas, ids)
+        logger.info(
+            f'{profile} profile, {READERS} readers and {WRITERS} writers: '
+            f'{results[profile]["_read"] / SECONDS:.0f} reads/s, '
+            f'{results[profile]["_write"] / SECONDS:.0f} writes/s, '
+            f'{results[profile]["locked"]} database is locked errors'
+        )
+
+    assert not results['production']['locked'], logger.error(textwrap.dedent(f"""
+        Production profile should wait for locks instead of failing, but failed
+        {results['production']['locked']} times
+    """))
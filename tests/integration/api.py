@@ -1,11 +1,29 @@
+from django.test import TestCase
 from django.urls import reverse
 from rest_framework.test import APIClient
 
 from api.urls import URL_PATTERN_NAME
 
 
+class CommittingAPIClient(APIClient):
+    """
+    Client running the on-commit callbacks of every request, as if it committed: tests run in a
+    transaction which is rolled back instead.
+    """
+
+    def request(self, **kwargs):
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            return super().request(**kwargs)
+
+
 class API:
-    client = APIClient()
+    client = CommittingAPIClient()
+
+    def get_page(self, url: str):
+        return self.client.get(url)
+
+    def get_metrics(self, headers: dict | None = None):
+        return self.client.get(reverse('metrics'), **(headers or {}))
 
     # TECHNOLOGIES API
     def get_languages(self):
@@ -15,14 +33,16 @@ class API:
         return self.client.get(reverse(URL_PATTERN_NAME.TECHNOLOGIES))
 
     # SPECIALIST API
-    def get_specialists(self):
-        return self.client.get(reverse(URL_PATTERN_NAME.SPECIALISTS))
+    def get_specialists(self, params: dict | None = None, headers: dict | None = None):
+        return self.client.get(
+            reverse(URL_PATTERN_NAME.SPECIALISTS), data=params, **(headers or {})
+        )
 
-    def get_specialist(self, id: int):
+    def get_specialist(self, id: int, params: dict | None = None, headers: dict | None = None):
         return self.client.get(reverse(
             URL_PATTERN_NAME.RETRIEVE_SPECIALIST,
             kwargs={'specialist_id': id}
-        ))
+        ), data=params, **(headers or {}))
 
     def create_specialist(self, data: dict):
         return self.client.post(reverse(URL_PATTERN_NAME.CREATE_SPECIALIST), data=data)
@@ -70,15 +90,33 @@ class API:
             data=data
         )
 
+    def search_specialists(self, params: dict):
+        return self.client.get(reverse(URL_PATTERN_NAME.SEARCH_SPECIALISTS), data=params)
+
+    def get_matching_projects(self, id: int, params: dict | None = None):
+        return self.client.get(
+            reverse(URL_PATTERN_NAME.MATCHING_PROJECTS, kwargs={'specialist_id': id}),
+            data=params
+        )
+
+    def get_specialists_leaderboard(self, params: dict | None = None):
+        return self.client.get(reverse(URL_PATTERN_NAME.SPECIALISTS_LEADERBOARD), data=params)
+
+    def get_specialist_rank(self, id: int, params: dict | None = None):
+        return self.client.get(
+            reverse(URL_PATTERN_NAME.SPECIALIST_RANK, kwargs={'specialist_id': id}),
+            data=params
+        )
+
     # PROJECT API
-    def get_projects(self):
-        return self.client.get(reverse(URL_PATTERN_NAME.PROJECTS))
+    def get_projects(self, params: dict | None = None, headers: dict | None = None):
+        return self.client.get(reverse(URL_PATTERN_NAME.PROJECTS), data=params, **(headers or {}))
 
-    def get_project(self, id: int):
+    def get_project(self, id: int, params: dict | None = None, headers: dict | None = None):
         return self.client.get(reverse(
             URL_PATTERN_NAME.RETRIEVE_PROJECT,
             kwargs={'project_id': id}
-        ))
+        ), data=params, **(headers or {}))
 
     def create_project(self, data: dict, token: str):
         self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
@@ -133,6 +171,24 @@ class API:
                     kwargs={'project_id': id})
         )
 
+    def search_projects(self, params: dict):
+        return self.client.get(reverse(URL_PATTERN_NAME.SEARCH_PROJECTS), data=params)
+
+    def get_matching_specialists(self, id: int, params: dict | None = None):
+        return self.client.get(
+            reverse(URL_PATTERN_NAME.MATCHING_SPECIALISTS, kwargs={'project_id': id}),
+            data=params
+        )
+
+    def get_projects_leaderboard(self, params: dict | None = None):
+        return self.client.get(reverse(URL_PATTERN_NAME.PROJECTS_LEADERBOARD), data=params)
+
+    def get_project_rank(self, id: int, params: dict | None = None):
+        return self.client.get(
+            reverse(URL_PATTERN_NAME.PROJECT_RANK, kwargs={'project_id': id}),
+            data=params
+        )
+
     # OFFER API
     def add_to_team(self, data: dict, token: str):
         self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
@@ -157,5 +213,17 @@ class API:
             data=data
         )
 
+    def get_inbox_offers(self, token: str, params: dict | None = None):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+        return self.client.get(reverse(URL_PATTERN_NAME.INBOX_OFFERS), data=params)
+
+    def get_outbox_offers(self, token: str, params: dict | None = None):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+        return self.client.get(reverse(URL_PATTERN_NAME.OUTBOX_OFFERS), data=params)
+
+    def get_pending_offers_count(self, token: str):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+        return self.client.get(reverse(URL_PATTERN_NAME.PENDING_OFFERS_COUNT))
+
 
 api = API()
@@ -1,5 +1,9 @@
 import pytest
 
+from core.catalog import invalidate_catalog
+from core.leaderboard import invalidate_leaderboards
+from core.matching import invalidate_matching_index
+from core.token_cache import clear_token_cache
 from tests.integration.api import api
 
 
@@ -7,3 +11,7 @@ from tests.integration.api import api
 def setup(db):
     yield
     api.client.credentials()
+    invalidate_catalog()
+    invalidate_matching_index()
+    invalidate_leaderboards()
+    clear_token_cache()
@@ -0,0 +1,192 @@
+import io
+import textwrap
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.status import HTTP_400_BAD_REQUEST
+
+from core.counters import COUNTERS, recount_counters
+from core.models import Job, Language, Project, Specialist
+from tests.integration.api import api
+from tests.integration.config import logger
+from tests.integration.utils import create_specialists, generate_project_data
+
+
+def _counters() -> dict:
+    'Counter columns of every project and specialist'
+    counters = {}
+    for model in (Project, Specialist):
+        columns = [counter.column for counter in COUNTERS if counter.model == model.__name__]
+        for row in model.objects.values('id', *columns):
+            counters[model.__name__, row.pop('id')] = row
+    return counters
+
+
+def _assert_recounted() -> None:
+    maintained = _counters()
+    recount_counters()
+    recounted = _counters()
+
+    assert maintained == recounted, logger.error(textwrap.dedent(f"""
+        Maintained counters should match the through tables, but {maintained} != {recounted}
+    """))
+
+
+def test_counters_follow_through_tables():
+    owner, member = create_specialists(count=2, projects=1)
+    project_id = owner['own_projects'][0]['id']
+    languages = api.get_languages().data[:3]
+    technologies = [technology['name'] for technology in api.get_technologies().data[:2]]
+
+    api.add_languages_to_project(id=project_id, data={'languages': languages}, token=owner['token'])
+    api.remove_project_languages(
+        id=project_id, data={'languages': languages[:1]}, token=owner['token']
+    )
+    api.add_technologies_to_specialist(
+        data={'technologies': technologies}, token=member['token']
+    )
+    offer = api.join_to_team(
+        data={'recipient_id': owner['id'], 'project_id': project_id}, token=member['token']
+    ).data
+    api.response_to_offer(id=offer['id'], data={'response': True}, token=owner['token'])
+    project = api.get_project(id=project_id).data
+    member_data = api.get_specialist(id=member['id']).data
+
+    assert (project['team_count'], project['languages_count']) == (1, 2), \
+        logger.error(textwrap.dedent(f"""
+            Project should count 1 team member and 2 languages, but counts
+            {project['team_count']} and {project['languages_count']}
+        """))
+    assert (member_data['projects_count'], member_data['technologies_count']) == (1, 2), \
+        logger.error(textwrap.dedent(f"""
+            Member should count 1 project and 2 technologies, but counts
+            {member_data['projects_count']} and {member_data['technologies_count']}
+        """))
+
+    offer = api.give_ownership(
+        data={'recipient_id': member['id'], 'project_id': project_id}, token=owner['token']
+    ).data
+    api.response_to_offer(id=offer['id'], data={'response': True}, token=member['token'])
+    owned = [
+        api.get_specialist(id=specialist['id']).data['own_projects_count']
+        for specialist in (owner, member)
+    ]
+
+    assert owned == [0, 2], logger.error(textwrap.dedent(f"""
+        Ownership should move with the project, but owner and member own {owned} projects
+    """))
+    _assert_recounted()
+
+    api.delete_project(id=project_id, token=member['token'])
+    member_data = api.get_specialist(id=member['id']).data
+
+    assert (member_data['projects_count'], member_data['own_projects_count']) == (0, 1), \
+        logger.error(textwrap.dedent(f"""
+            Deleted project rows should be uncounted, but member counts
+            {member_data['projects_count']} projects and {member_data['own_projects_count']} owned
+        """))
+    _assert_recounted()
+
+
+def test_recount_repairs_drift():
+    create_specialists(count=2, projects=2)
+    expected = _counters()
+    Project.objects.update(team_count=7, languages_count=7)
+    Specialist.objects.update(own_projects_count=7)
+
+    call_command('recount', stdout=io.StringIO())
+
+    assert _counters() == expected, logger.error(textwrap.dedent(f"""
+        Recount should repair drifted counters, but got {_counters()} instead of {expected}
+    """))
+
+    call_command('recount', '--model', 'Project', '--background', stdout=io.StringIO())
+    queued = list(Job.objects.values_list('name', 'payload'))
+
+    assert queued == [('recount_counters', {'model': 'Project'})], \
+        logger.error(textwrap.dedent(f"""
+            Background recount of projects should queue one recount_counters job, but
+            queued {queued}
+        """))
+
+
+def test_lists_order_and_filter_by_counters():
+    owners = create_specialists(count=3)
+    for count, owner in enumerate(owners):
+        for _ in range(count):
+            api.create_project(data=generate_project_data(), token=owner['token'])
+
+    response = api.get_specialists(params={'ordering': '-own_projects_count', 'page_size': 2})
+    first_page = [specialist['own_projects_count'] for specialist in response.data['results']]
+    second_page = [
+        specialist['own_projects_count']
+        for specialist in api.get_page(response.data['next']).data['results']
+    ]
+
+    assert first_page + second_page == [2, 1, 0], logger.error(textwrap.dedent(f"""
+        Specialists should be paged by owned projects descending, but got
+        {first_page} and {second_page}
+    """))
+
+    response = api.get_specialists(params={'min_own_projects_count': 1})
+    counts = sorted(specialist['own_projects_count'] for specialist in response.data['results'])
+
+    assert counts == [1, 2], logger.error(textwrap.dedent(f"""
+        Specialists with at least 1 owned project should be listed, but got {counts}
+    """))
+
+    response = api.get_projects(params={'ordering': '-team_count', 'max_team_count': 0})
+    team_counts = {project['team_count'] for project in response.data['results']}
+
+    assert len(response.data['results']) == 3 and team_counts == {0}, \
+        logger.error(textwrap.dedent(f"""
+            Every project without a team should be listed, but got {response.data['results']}
+        """))
+
+    response = api.get_projects(params={'min_team_count': '-1'})
+
+    assert response.status_code == HTTP_400_BAD_REQUEST, logger.error(textwrap.dedent(f"""
+        Negative counter bounds should be rejected, but got {response.status_code}
+    """))
+
+
+def test_counters_follow_cascades():
+    owner, member = create_specialists(count=2, projects=1)
+    project_id = owner['own_projects'][0]['id']
+    for token in (owner['token'], member['token']):
+        api.add_languages_to_specialist(data={'languages': ['Python', 'Go', 'Rust']}, token=token)
+    api.add_languages_to_project(
+        id=project_id, data={'languages': ['Python', 'Go', 'Rust']}, token=owner['token']
+    )
+    offer = api.join_to_team(
+        data={'recipient_id': owner['id'], 'project_id': project_id}, token=member['token']
+    ).data
+    api.response_to_offer(id=offer['id'], data={'response': True}, token=owner['token'])
+
+    Language.objects.get(name='Rust').delete()
+    Language.objects.get(name='Go').specialist_set.remove(owner['id'])
+    Language.objects.get(name='Python').specialist_set.clear()
+    _assert_recounted()
+
+    api.delete_specialist(token=member['token'])
+    api.client.credentials()
+    team_count = api.get_project(id=project_id).data['team_count']
+
+    assert team_count == 0, logger.error(textwrap.dedent(f"""
+        Deleted team member should be uncounted, but project counts {team_count} members
+    """))
+    _assert_recounted()
+
+    with CaptureQueriesContext(connection) as queries:
+        api.delete_project(id=project_id, token=owner['token'])
+    through_selects = [
+        query['sql'] for query in queries
+        if query['sql'].startswith('SELECT') and 'FROM "core_projectlanguage"' in query['sql']
+    ]
+
+    assert not through_selects, logger.error(textwrap.dedent(f"""
+        Languages of a deleted project should be deleted with one query, but they were
+        collected by {through_selects}
+    """))
+    _assert_recounted()
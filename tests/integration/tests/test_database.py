@@ -0,0 +1,36 @@
+import sqlite3
+import textwrap
+
+from django.db import connection
+from django.test import override_settings
+
+from core.database import apply_sqlite_pragmas, get_sqlite_pragmas
+from tests.integration.config import logger
+
+
+def _pragmas() -> dict:
+    with connection.cursor() as cursor:
+        return {
+            name: cursor.execute(f'PRAGMA {name}').fetchone()[0]
+            for name in ('synchronous', 'busy_timeout', 'cache_size', 'temp_store')
+        }
+
+
+def test_sqlite_profile_pragmas():
+    connection.ensure_connection()
+    pragmas = _pragmas()
+    expected = {'synchronous': 1, 'busy_timeout': 20000, 'cache_size': -65536, 'temp_store': 2}
+
+    assert pragmas == expected, logger.error(textwrap.dedent(f"""
+        Connections should be configured with the production profile pragmas {expected}, but
+        are configured with {pragmas}
+    """))
+
+    with override_settings(SQLITE_PRAGMAS={'busy_timeout': 1000}):
+        database = sqlite3.connect(':memory:')
+        apply_sqlite_pragmas(database, get_sqlite_pragmas())
+    busy_timeout = database.execute('PRAGMA busy_timeout').fetchone()[0]
+
+    assert busy_timeout == 1000, logger.error(textwrap.dedent(f"""
+        SQLITE_PRAGMAS should override the profile, but busy_timeout is {busy_timeout}
+    """))
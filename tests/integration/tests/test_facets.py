@@ -0,0 +1,91 @@
+import textwrap
+
+from rest_framework.status import HTTP_400_BAD_REQUEST
+
+from core.models import Specialist
+from tests.integration.api import api
+from tests.integration.config import logger
+from tests.integration.utils import create_specialists, generate_project_data
+
+
+def _facet(response, name: str) -> dict:
+    return {item['value']: item['count'] for item in response.data['facets'][name]}
+
+
+def test_specialists_facets():
+    specialists = create_specialists(count=4)
+    attributes = [
+        ('BACKEND', 'Germany', 'Berlin', 100, ['Python']),
+        ('BACKEND', 'Germany', 'Hamburg', 200, ['Go']),
+        ('FRONTEND', 'Spain', 'Madrid', 300, ['Python']),
+        ('BACKEND', 'Spain', 'Madrid', 400, []),
+    ]
+    for specialist, (direction, country, city, rating, languages) in zip(specialists, attributes):
+        Specialist.objects.filter(pk=specialist['id']) \
+            .update(direction=direction, country=country, city=city, rating=rating)
+        api.add_languages_to_specialist(data={'languages': languages}, token=specialist['token'])
+
+    response = api.get_specialists(params={
+        'direction': 'backend', 'language': 'python,go', 'facets': 'direction,language,country',
+    })
+    ids = [specialist['id'] for specialist in response.data['results']]
+
+    assert ids == [specialists[0]['id'], specialists[1]['id']], logger.error(textwrap.dedent(f"""
+        Backend specialists knowing Python or Go should be listed, but got {ids}
+    """))
+    assert _facet(response, 'direction') == {'BACKEND': 2, 'FRONTEND': 1}, \
+        logger.error(textwrap.dedent(f"""
+            Direction counts should ignore the direction filter only, but got
+            {_facet(response, 'direction')}
+        """))
+    assert _facet(response, 'language') == {'Python': 1, 'Go': 1}, \
+        logger.error(textwrap.dedent(f"""
+            Language counts of backend specialists should be Python 1 and Go 1, but got
+            {_facet(response, 'language')}
+        """))
+    assert _facet(response, 'country') == {'Germany': 2}, logger.error(textwrap.dedent(f"""
+        Country counts should follow the other filters, but got {_facet(response, 'country')}
+    """))
+
+    response = api.get_specialists(params={'city': 'Madrid', 'min_rating': 350})
+    ids = [specialist['id'] for specialist in response.data['results']]
+
+    assert ids == [specialists[3]['id']] and 'facets' not in response.data, \
+        logger.error(textwrap.dedent(f"""
+            Specialists in Madrid rated 350 or more should be listed without facets, but got
+            {response.data}
+        """))
+
+    for params in ({'direction': 'pilot'}, {'language': 'not a language'}, {'facets': 'about'}):
+        response = api.get_specialists(params=params)
+
+        assert response.status_code == HTTP_400_BAD_REQUEST, logger.error(textwrap.dedent(f"""
+            Facet params {params} should be rejected, but got {response.status_code}
+        """))
+
+
+def test_projects_facets():
+    owner, = create_specialists(count=1)
+    types = ['SERVICE', 'SERVICE', 'LIBRARY']
+    for project_type in types:
+        api.create_project(data=generate_project_data(type=project_type), token=owner['token'])
+    api.create_project(data=generate_project_data(is_private=True), token=owner['token'])
+    project_ids = [project['id'] for project in api.get_projects().data['results']]
+    api.add_technologies_to_project(
+        id=project_ids[0], data={'technologies': ['Django']}, token=owner['token']
+    )
+
+    response = api.get_projects(params={'type': 'service', 'facets': 'type,technology'})
+    listed = [project['id'] for project in response.data['results']]
+
+    assert listed == project_ids[:2], logger.error(textwrap.dedent(f"""
+        Public service projects should be listed, but got {listed}
+    """))
+    assert _facet(response, 'type') == {'SERVICE': 2, 'LIBRARY': 1}, \
+        logger.error(textwrap.dedent(f"""
+            Type counts should cover public projects only, but got {_facet(response, 'type')}
+        """))
+    assert _facet(response, 'technology') == {'Django': 1}, logger.error(textwrap.dedent(f"""
+        Technology counts of service projects should be Django 1, but got
+        {_facet(response, 'technology')}
+    """))
@@ -0,0 +1,89 @@
+import textwrap
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.status import HTTP_400_BAD_REQUEST
+
+from api.serializers.values import SPECIALIST_FIELDS
+from tests.integration.api import api
+from tests.integration.config import logger
+from tests.integration.utils import create_specialists
+
+
+def test_list_fieldsets():
+    create_specialists(count=3, projects=1)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api.get_specialists(
+            params={'fields': 'id,nickname,rating', 'ordering': '-rating', 'page_size': 2}
+        )
+    keys = {tuple(specialist) for specialist in response.data['results']}
+    sql = [query['sql'] for query in queries if 'core_specialist' in query['sql']]
+
+    assert keys == {('id', 'nickname', 'rating')}, logger.error(textwrap.dedent(f"""
+        Specialists should be rendered with the requested fields only, but got {keys}
+    """))
+    assert len(sql) == 1 and '"about"' not in sql[0], logger.error(textwrap.dedent(f"""
+        Sparse specialists list should read the requested columns in one query, but ran {sql}
+    """))
+
+    next_page = api.get_page(response.data['next']).data['results']
+
+    assert len(next_page) == 1 and tuple(next_page[0]) == ('id', 'nickname', 'rating'), \
+        logger.error(textwrap.dedent(f"""
+            Cursor should keep the fieldset, but the next page is {next_page}
+        """))
+
+    projects = api.get_projects(params={'exclude': 'team,owner,languages,technologies'}).data
+
+    keys = set(projects['results'][0])
+
+    assert not keys & {'team', 'owner', 'languages', 'technologies'} and 'name' in keys, \
+        logger.error(textwrap.dedent(f"""
+            Excluded fields should not be rendered, but got {keys}
+        """))
+
+
+def test_retrieve_fieldsets():
+    owner, = create_specialists(count=1, projects=1)
+    project_id = owner['own_projects'][0]['id']
+
+    with CaptureQueriesContext(connection) as queries:
+        project = api.get_project(id=project_id, params={'fields': 'name,teamCount'}).data
+    queries_count = len([query for query in queries if 'core_project' in query['sql']])
+
+    assert project == {'name': project['name'], 'team_count': 0}, logger.error(textwrap.dedent(f"""
+        Project should be rendered with camel case selected fields, but got {project}
+    """))
+    # updated_at of the conditional GET and the project row, no prefetches of relations
+    assert queries_count == 2, logger.error(textwrap.dedent(f"""
+        Sparse project retrieval should cost 2 queries, but cost {queries_count}
+    """))
+
+    specialist = api.get_specialist(id=owner['id'], params={'fields': 'age,own_projects'}).data
+
+    assert set(specialist) == {'age', 'own_projects'}, logger.error(textwrap.dedent(f"""
+        Specialist should be rendered with the selected fields, but got {specialist}
+    """))
+
+    leaderboard = api.get_specialists_leaderboard(params={'fields': 'nickname'}).data
+
+    assert [set(row) for row in leaderboard] == [{'rank', 'nickname'}], \
+        logger.error(textwrap.dedent(f"""
+            Leaderboard should render the rank and the selected fields, but got {leaderboard}
+        """))
+
+    all_fields = ','.join(SPECIALIST_FIELDS)
+    invalid_params = (
+        {'fields': 'password'}, {'fields': 'name', 'exclude': 'about'},
+        {'fields': ''}, {'fields': ' , '}, {'exclude': all_fields},
+    )
+    for params in invalid_params:
+        for get in (lambda: api.get_specialist(id=owner['id'], params=params),
+                    lambda: api.get_specialists(params=params)):
+            response = get()
+
+            assert response.status_code == HTTP_400_BAD_REQUEST, \
+                logger.error(textwrap.dedent(f"""
+                    Fieldset params {params} should be rejected, but got {response.status_code}
+                """))
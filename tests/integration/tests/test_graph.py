@@ -0,0 +1,97 @@
+import json
+import textwrap
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from rest_framework.authtoken.models import Token
+
+from core.models import Offer, Project, Specialist
+from tests.integration.api import api
+from tests.integration.config import logger
+from tests.integration.utils import create_specialists
+
+
+def _export() -> list[dict]:
+    output = StringIO()
+    call_command('export_graph', '--batch-size', '2', stdout=output)
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_export_and_import_graph(tmp_path):
+    owner, member, candidate = create_specialists(count=3, projects=1)
+    project_id = owner['own_projects'][0]['id']
+    api.add_languages_to_specialist(data={'languages': ['Python', 'Go']}, token=owner['token'])
+    api.add_technologies_to_project(
+        id=project_id, data={'technologies': ['Django']}, token=owner['token']
+    )
+    offer = api.add_to_team(
+        data={'recipient_id': member['id'], 'project_id': project_id}, token=owner['token']
+    ).data
+    api.response_to_offer(id=offer['id'], data={'response': True}, token=member['token'])
+    api.join_to_team(
+        data={'recipient_id': owner['id'], 'project_id': project_id}, token=candidate['token']
+    )
+
+    exported = _export()
+    models = [record['model'] for record in exported]
+
+    assert models == ['specialist'] * 3 + ['project'] * 3 + ['offer'] * 2, \
+        logger.error(textwrap.dedent(f"""
+            Export should contain 3 specialists, 3 projects and 2 offers in that order, but
+            contains {models}
+        """))
+
+    path = tmp_path / 'graph.ndjson'
+    path.write_text(''.join(json.dumps(record) + '\n' for record in exported))
+    Specialist.objects.all().delete()
+    output = StringIO()
+    call_command('import_graph', '--input', str(path), '--batch-size', '2', stdout=output)
+    reimported = _export()
+
+    assert reimported == exported, logger.error(textwrap.dedent(f"""
+        Graph exported after import should be equal to the imported one, but import output is
+        {output.getvalue()}
+    """))
+
+    counts = (Specialist.objects.count(), Project.objects.count(), Offer.objects.count())
+    tokens = Token.objects.count()
+
+    assert counts == (3, 3, 2) and tokens == 3, logger.error(textwrap.dedent(f"""
+        Import should create 3 specialists with tokens, 3 projects and 2 offers, but created
+        {counts} and {tokens} tokens
+    """))
+
+    owner_token = Token.objects.get(user__nickname=owner['nickname']).key
+    counters = api.get_pending_offers_count(token=owner_token).data
+
+    assert counters == {'inbox': 1, 'outbox': 0}, logger.error(textwrap.dedent(f"""
+        Imported pending offer should be counted in the owner inbox, but counters are {counters}
+    """))
+
+
+def test_import_graph_twice(tmp_path):
+    owner, member = create_specialists(count=2, projects=1)
+    project_id = owner['own_projects'][0]['id']
+    api.add_to_team(
+        data={'recipient_id': member['id'], 'project_id': project_id}, token=owner['token']
+    )
+    path = tmp_path / 'graph.ndjson'
+    path.write_text(''.join(json.dumps(record) + '\n' for record in _export()))
+    start_date = date(2020, 1, 1)
+    Project.objects.filter(pk=project_id).update(start_date=start_date)
+
+    for _ in range(2):
+        call_command('import_graph', '--input', str(path), stdout=StringIO())
+    offers = Offer.objects.count()
+    project_start_date = Project.objects.get(pk=project_id).start_date
+
+    assert offers == 1, logger.error(textwrap.dedent(f"""
+        Importing the same offer twice should merge it into the existing one, but there are
+        {offers} offers
+    """))
+
+    assert project_start_date == start_date, logger.error(textwrap.dedent(f"""
+        Import should keep the start date {start_date} of an existing project, but it is
+        {project_start_date}
+    """))
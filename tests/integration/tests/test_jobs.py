@@ -0,0 +1,100 @@
+import textwrap
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from core.jobs import enqueue, job, run_pending_jobs
+from core.models import Job, Language, Specialist
+from core.models.choices import JobStatus
+from tests.integration.config import logger
+from tests.integration.utils import create_specialists
+
+
+@job('tests.add_language')
+def add_language(name: str, fail: bool = False):
+    Language.objects.create(name=name)
+    if fail:
+        raise RuntimeError(f'language {name} is not welcome')
+
+
+def test_run_jobs_command():
+    sender, recipient = create_specialists(count=2)
+    Specialist.objects.update(inbox_pending_count=7)
+    enqueue('recount_pending_offers')
+    enqueue('tests.add_language', payload={'name': 'Queued'})
+    enqueue('tests.add_language', payload={'name': 'Delayed'}, delay=60)
+
+    call_command('run_jobs', '--once', '--concurrency', '1')
+    inbox_counts = set(Specialist.objects.values_list('inbox_pending_count', flat=True))
+    queued_names = list(Job.objects.values_list('payload__name', flat=True))
+
+    assert inbox_counts == {0}, logger.error(textwrap.dedent(f"""
+        Recount job should reset pending counters to 0, but they are {inbox_counts}
+    """))
+
+    assert Language.objects.filter(name='Queued').exists(), logger.error(textwrap.dedent("""
+        Language added by the due job doesn't exist
+    """))
+
+    assert queued_names == ['Delayed'], logger.error(textwrap.dedent(f"""
+        Only the delayed job should stay in the queue, but the queue contains {queued_names}
+    """))
+
+
+def test_failed_job_retries():
+    queued_job = enqueue('tests.add_language', payload={'name': 'Failing', 'fail': True})
+    run_pending_jobs()
+    queued_job.refresh_from_db()
+
+    assert queued_job.status == JobStatus.QUEUED and queued_job.attempts == 1 \
+        and queued_job.run_after > timezone.now(), logger.error(textwrap.dedent(f"""
+            Failed job should be queued for a delayed retry, but its status is
+            {queued_job.status}, attempts {queued_job.attempts}, run after {queued_job.run_after}
+        """))
+
+    assert 'is not welcome' in queued_job.last_error, logger.error(textwrap.dedent(f"""
+        Failed job should keep the error, but last error is {queued_job.last_error}
+    """))
+
+    assert not Language.objects.filter(name='Failing').exists(), logger.error(textwrap.dedent("""
+        Writes of the failed job should be rolled back
+    """))
+
+    Job.objects.filter(pk=queued_job.pk).update(run_after=timezone.now(), max_attempts=2)
+    run_pending_jobs()
+    queued_job.refresh_from_db()
+
+    assert queued_job.status == JobStatus.FAILED and queued_job.attempts == 2, \
+        logger.error(textwrap.dedent(f"""
+            Job failed on its last attempt should be FAILED, but its status is
+            {queued_job.status}, attempts {queued_job.attempts}
+        """))
+
+
+def test_abandoned_job_is_claimed_again():
+    abandoned_job = enqueue('tests.add_language', payload={'name': 'Abandoned'})
+    expired_job = enqueue('tests.add_language', payload={'name': 'Expired'})
+    locked_until = timezone.now() - timedelta(seconds=1)
+    Job.objects.filter(pk=abandoned_job.pk) \
+        .update(status=JobStatus.RUNNING, attempts=1, locked_until=locked_until)
+    Job.objects.filter(pk=expired_job.pk) \
+        .update(status=JobStatus.RUNNING, attempts=5, max_attempts=5, locked_until=locked_until)
+    enqueue('tests.add_language', payload={'name': 'Running'})
+    Job.objects.filter(payload__name='Running').update(
+        status=JobStatus.RUNNING, locked_until=timezone.now() + timedelta(seconds=60)
+    )
+
+    count = run_pending_jobs()
+    statuses = dict(Job.objects.values_list('payload__name', 'status'))
+
+    assert count == 1 and Language.objects.filter(name='Abandoned').exists(), \
+        logger.error(textwrap.dedent(f"""
+            Only the job with expired visibility timeout should run again, but {count} jobs ran
+        """))
+
+    assert statuses == {'Expired': JobStatus.FAILED, 'Running': JobStatus.RUNNING}, \
+        logger.error(textwrap.dedent(f"""
+            Abandoned job without attempts left should be FAILED and the job locked by another
+            worker should keep running, but statuses are {statuses}
+        """))
@@ -0,0 +1,129 @@
+import textwrap
+
+from django.db import transaction
+from django.test import TestCase
+from rest_framework.status import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
+
+from core.leaderboard import invalidate_leaderboards
+from core.models import Project, Specialist
+from tests.integration.api import api
+from tests.integration.config import logger
+from tests.integration.utils import create_specialists
+
+
+def _set_rating(model, id: int, rating: int, **attrs) -> None:
+    'Ratings have no endpoint, they change through model saves committed by the callbacks'
+    instance = model.objects.get(pk=id)
+    instance.rating = rating
+    for name, value in attrs.items():
+        setattr(instance, name, value)
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        instance.save()
+
+
+def _ids(response) -> list[int]:
+    return [row['id'] for row in response.data]
+
+
+def test_specialists_leaderboard():
+    first, second, third = create_specialists(count=3)
+    for specialist, rating in ((first, 10), (second, 30), (third, 20)):
+        _set_rating(Specialist, specialist['id'], rating, direction='BACKEND')
+    api.add_languages_to_specialist(data={'languages': ['Python']}, token=first['token'])
+    api.add_languages_to_specialist(data={'languages': ['Python']}, token=third['token'])
+
+    leaderboard = _ids(api.get_specialists_leaderboard())
+    expected = [second['id'], third['id'], first['id']]
+
+    assert leaderboard == expected, logger.error(textwrap.dedent(f"""
+        Specialists should be ranked by rating as {expected}, but got {leaderboard}
+    """))
+
+    _set_rating(Specialist, first['id'], 40)
+    python_backend = api.get_specialists_leaderboard(
+        params={'direction': 'backend', 'language': 'python'}
+    ).data
+    ranks = [(row['rank'], row['id']) for row in python_backend]
+    expected = [(1, first['id']), (2, third['id'])]
+
+    assert ranks == expected, logger.error(textwrap.dedent(f"""
+        Rating changes should move specialists within their boards, expected {expected},
+        but got {ranks}
+    """))
+
+    rank = api.get_specialist_rank(id=third['id'], params={'language': 'Python'}).data
+
+    assert (rank['rank'], rank['total']) == (2, 2), logger.error(textwrap.dedent(f"""
+        Third specialist should be the 2nd of 2 Python specialists, but got {rank}
+    """))
+
+    response = api.get_specialist_rank(id=second['id'], params={'language': 'Python'})
+
+    assert response.status_code == HTTP_404_NOT_FOUND, logger.error(textwrap.dedent(f"""
+        Specialist without the language should have no rank in its board, but got
+        {response.status_code}
+    """))
+
+    incremental = api.get_specialists_leaderboard(params={'limit': 2, 'offset': 1}).data
+    invalidate_leaderboards()
+    rebuilt = api.get_specialists_leaderboard(params={'limit': 2, 'offset': 1}).data
+
+    assert incremental == rebuilt, logger.error(textwrap.dedent(f"""
+        Incrementally updated leaderboard should equal a rebuilt one, but {incremental} !=
+        {rebuilt}
+    """))
+
+    response = api.get_specialists_leaderboard(params={'language': 'not a language'})
+
+    assert response.status_code == HTTP_400_BAD_REQUEST, logger.error(textwrap.dedent(f"""
+        Unknown languages should be rejected, but got {response.status_code}
+    """))
+
+
+def test_rolled_back_rating_is_not_ranked():
+    first, second = create_specialists(count=2)
+    _set_rating(Specialist, first['id'], 10)
+    _set_rating(Specialist, second['id'], 20)
+    api.get_specialists_leaderboard()
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        try:
+            with transaction.atomic():
+                specialist = Specialist.objects.get(pk=first['id'])
+                specialist.rating = 999
+                specialist.save()
+                raise RuntimeError('rolled back')
+        except RuntimeError:
+            pass
+    rank = api.get_specialist_rank(id=first['id']).data
+
+    assert rank['rank'] == 2, logger.error(textwrap.dedent(f"""
+        Rolled back rating should not move the specialist, but its rank is {rank}
+    """))
+
+
+def test_projects_leaderboard():
+    owner, = create_specialists(count=1, projects=2, private_projects=1)
+    public, other = [project['id'] for project in owner['own_projects'][:2]]
+    private = Project.objects.get(owner_id=owner['id'], is_private=True).pk
+    for project_id, rating in ((public, 5), (other, 7), (private, 9)):
+        _set_rating(Project, project_id, rating)
+
+    leaderboard = _ids(api.get_projects_leaderboard())
+
+    assert leaderboard == [other, public], logger.error(textwrap.dedent(f"""
+        Public projects should be ranked by rating, but got {leaderboard}
+    """))
+
+    response = api.get_project_rank(id=private)
+
+    assert response.status_code == HTTP_404_NOT_FOUND, logger.error(textwrap.dedent(f"""
+        Private projects should not be ranked, but got {response.status_code}
+    """))
+
+    api.update_project(id=private, data={'is_private': False}, token=owner['token'])
+    rank = api.get_project_rank(id=private).data
+
+    assert (rank['rank'], rank['total']) == (1, 3), logger.error(textwrap.dedent(f"""
+        Project made public should lead the leaderboard of 3 projects, but got {rank}
+    """))
@@ -0,0 +1,113 @@
+import json
+import os
+import textwrap
+
+from django.test import override_settings
+from rest_framework.status import HTTP_200_OK, HTTP_403_FORBIDDEN
+
+from core.metrics import REQUESTS, flush_metrics
+from tests.integration.api import api
+from tests.integration.config import logger
+from tests.integration.utils import create_specialists
+
+
+def _samples() -> dict[str, float]:
+    'Sample name with labels -> value'
+    response = api.get_metrics()
+    lines = response.content.decode().splitlines()
+    return {
+        name: float(value)
+        for name, value in (line.rsplit(' ', 1) for line in lines if not line.startswith('#'))
+    }
+
+
+def _delta(before: dict, after: dict, sample: str) -> float:
+    return after.get(sample, 0) - before.get(sample, 0)
+
+
+def test_metrics():
+    owner, member = create_specialists(count=2, projects=1)
+    before = _samples()
+
+    api.get_projects()
+    api.get_projects()
+    api.authenticate_specialist(data={'nickname': owner['nickname'], 'password': 'wrong'})
+    offer = api.add_to_team(
+        data={'recipient_id': member['id'], 'project_id': owner['own_projects'][0]['id']},
+        token=owner['token'],
+    ).data
+    api.response_to_offer(id=offer['id'], data={'response': False}, token=member['token'])
+    after = _samples()
+
+    deltas = {sample: _delta(before, after, sample) for sample in (
+        'api_requests_total{url_name="PROJECTS",method="GET",status="200"}',
+        'api_request_duration_seconds_count{url_name="PROJECTS",method="GET"}',
+        'api_request_duration_seconds_bucket{url_name="PROJECTS",method="GET",le="+Inf"}',
+        'api_response_size_bytes_count{url_name="PROJECTS",method="GET"}',
+        'api_request_queries_count{url_name="ADD_TO_TEAM",method="POST"}',
+        'api_authentications_total{method="password",outcome="failure"}',
+        'offer_transitions_total{type="ADD_TO_TEAM",state="created"}',
+        'offer_transitions_total{type="ADD_TO_TEAM",state="declined"}',
+    )}
+    expected = dict.fromkeys(deltas, 1) | {
+        'api_requests_total{url_name="PROJECTS",method="GET",status="200"}': 2,
+        'api_request_duration_seconds_count{url_name="PROJECTS",method="GET"}': 2,
+        'api_request_duration_seconds_bucket{url_name="PROJECTS",method="GET",le="+Inf"}': 2,
+        'api_response_size_bytes_count{url_name="PROJECTS",method="GET"}': 2,
+    }
+
+    assert deltas == expected, logger.error(textwrap.dedent(f"""
+        Metrics should change by {expected}, but changed by {deltas}
+    """))
+
+    token_lookups = sum(
+        _delta(before, after, f'cache_lookups_total{{cache="token",result="{result}"}}')
+        for result in ('hit', 'miss')
+    )
+    token_authentications = sum(
+        _delta(before, after, f'api_authentications_total{{method="token",outcome="{outcome}"}}')
+        for outcome in ('success', 'failure')
+    )
+
+    assert token_lookups == token_authentications > 0, logger.error(textwrap.dedent(f"""
+        Every token authentication should look up the token cache once, but there were
+        {token_authentications} authentications and {token_lookups} lookups
+    """))
+
+
+def test_metrics_of_other_processes(tmp_path):
+    requests_sample = 'api_requests_total{url_name="LANGUAGES",method="GET",status="200"}'
+    api.get_languages()
+
+    with override_settings(METRICS_DIR=tmp_path):
+        flush_metrics()
+        own = _samples()[requests_sample]
+        # an exited worker whose pid this process has reused
+        (tmp_path / f'{os.getpid()}.json').write_text(json.dumps([
+            [REQUESTS.name, ['LANGUAGES', 'GET', '200'], [5]],
+        ]))
+        flush_metrics()
+        merged = _samples()[requests_sample]
+
+    assert merged == own + 5, logger.error(textwrap.dedent(f"""
+        Metrics should add snapshots of other processes, including one with the same pid, to
+        the own ones without counting the own snapshot twice: own {own}, merged {merged}
+    """))
+
+
+def test_metrics_are_internal():
+    response = api.get_metrics(headers={'REMOTE_ADDR': '203.0.113.7'})
+
+    assert response.status_code == HTTP_403_FORBIDDEN, logger.error(textwrap.dedent(f"""
+        Metrics should be forbidden outside of INTERNAL_IPS, but status code is
+        {response.status_code}
+    """))
+
+    response = api.get_metrics()
+
+    assert response.status_code == HTTP_200_OK \
+        and response['Content-Type'].startswith('text/plain; version=0.0.4'), \
+        logger.error(textwrap.dedent(f"""
+            Metrics should be served in the text exposition format, but got
+            {response.status_code} {response['Content-Type']}
+        """))
@@ -1,12 +1,21 @@
 import textwrap
 
-from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_400_BAD_REQUEST
 
+from core.models import Offer
+from core.models.project import ProjectTeam
+from core.offers import accept_offer
 from tests.integration.api import api
 from tests.integration.config import logger
 from tests.integration.utils import create_specialists
 
 
+def _count_queries(queries: CaptureQueriesContext) -> int:
+    return len([query for query in queries if 'SAVEPOINT' not in query['sql']])
+
+
 def test_add_to_team():
     sender, recipient = create_specialists(count=2, projects=1)
     sender_project_id = sender['own_projects'][0]['id']
@@ -193,3 +202,247 @@ def test_get_ownership():
     """))
 
 # TODO write negative tests for offers
+
+
+def test_offer_queries():
+    sender, recipient = create_specialists(count=2, projects=1)
+    data = {'recipient_id': recipient['id'], 'project_id': sender['own_projects'][0]['id']}
+    api.add_to_team(data=data, token=sender['token'])
+
+    # counted right away, the queries log is reset by every request
+    with CaptureQueriesContext(connection) as queries:
+        offer = api.add_to_team(data=data, token=sender['token']).data
+    creation_queries = _count_queries(queries)
+    with CaptureQueriesContext(connection) as queries:
+        api.response_to_offer(id=offer['id'], data={'response': False}, token=recipient['token'])
+    rejection_queries = _count_queries(queries)
+
+    Offer.objects.filter(pk=offer['id']).delete()
+    offer = api.add_to_team(data=data, token=sender['token']).data
+    with CaptureQueriesContext(connection) as queries:
+        api.response_to_offer(id=offer['id'], data={'response': True}, token=recipient['token'])
+    acceptance_queries = _count_queries(queries)
+
+    # project with ownership, recipient, offer lookup
+    assert creation_queries == 3, logger.error(textwrap.dedent(f"""
+        Existing offer creation should cost 3 queries, but cost {creation_queries}
+    """))
+    # offer with its participants, response update, pending counters
+    assert rejection_queries == 3, logger.error(textwrap.dedent(f"""
+        Offer rejection should cost 3 queries, but cost {rejection_queries}
+    """))
+    # offer with its participants, response update, pending counters, previous team lookup,
+    # 2 membership inserts, 2 membership recounts, recipient update, touch of the project and
+    # 2 collection bumps
+    assert acceptance_queries == 12, logger.error(textwrap.dedent(f"""
+        Offer acceptance should cost 12 queries, but cost {acceptance_queries}
+    """))
+
+
+def test_offers_inbox_and_outbox():
+    sender, recipient = create_specialists(count=2, projects=2)
+    first_project_id, second_project_id = [project['id'] for project in sender['own_projects']]
+    add_to_team_offer = api.add_to_team(
+        data={'recipient_id': recipient['id'], 'project_id': first_project_id},
+        token=sender['token'],
+    ).data
+    give_ownership_offer = api.give_ownership(
+        data={'recipient_id': recipient['id'], 'project_id': second_project_id},
+        token=sender['token'],
+    ).data
+
+    inbox = api.get_inbox_offers(token=recipient['token']).data['results']
+    outbox = api.get_outbox_offers(token=sender['token']).data['results']
+    expected_ids = [give_ownership_offer['id'], add_to_team_offer['id']]
+
+    assert [offer['id'] for offer in inbox] == expected_ids, logger.error(textwrap.dedent(f"""
+        Recipient inbox should contain offers {expected_ids} newest first, but contains
+        {[offer['id'] for offer in inbox]}
+    """))
+
+    assert [offer['id'] for offer in outbox] == expected_ids, logger.error(textwrap.dedent(f"""
+        Sender outbox should contain offers {expected_ids} newest first, but contains
+        {[offer['id'] for offer in outbox]}
+    """))
+
+    sender_inbox = api.get_inbox_offers(token=sender['token']).data['results']
+
+    assert sender_inbox == [], logger.error(textwrap.dedent(f"""
+        Sender inbox should be empty, but contains {sender_inbox}
+    """))
+
+    filtered_by_type = api.get_inbox_offers(
+        token=recipient['token'], params={'type': 'add_to_team'}
+    ).data['results']
+    filtered_by_project = api.get_inbox_offers(
+        token=recipient['token'], params={'project': second_project_id}
+    ).data['results']
+
+    assert [offer['id'] for offer in filtered_by_type] == [add_to_team_offer['id']], \
+        logger.error(textwrap.dedent(f"""
+            Inbox filtered by type ADD_TO_TEAM should contain only offer
+            {add_to_team_offer['id']}, but contains {filtered_by_type}
+        """))
+
+    assert [offer['id'] for offer in filtered_by_project] == [give_ownership_offer['id']], \
+        logger.error(textwrap.dedent(f"""
+            Inbox filtered by project {second_project_id} should contain only offer
+            {give_ownership_offer['id']}, but contains {filtered_by_project}
+        """))
+
+    api.response_to_offer(
+        id=add_to_team_offer['id'], data={'response': False}, token=recipient['token']
+    )
+    pending = api.get_inbox_offers(token=recipient['token'], params={'state': 'pending'}).data
+    declined = api.get_inbox_offers(token=recipient['token'], params={'state': 'declined'}).data
+
+    assert [offer['id'] for offer in pending['results']] == [give_ownership_offer['id']], \
+        logger.error(textwrap.dedent(f"""
+            Pending inbox should contain only offer {give_ownership_offer['id']}, but contains
+            {pending['results']}
+        """))
+
+    assert declined['results'][0]['response'] is False, logger.error(textwrap.dedent(f"""
+        Declined inbox should contain declined offer {add_to_team_offer['id']}, but contains
+        {declined['results']}
+    """))
+
+    first_page = api.get_outbox_offers(token=sender['token'], params={'page_size': 1}).data
+    second_page = api.get_page(first_page['next']).data
+
+    assert [first_page['results'][0]['id'], second_page['results'][0]['id']] == expected_ids \
+        and second_page['next'] is None, logger.error(textwrap.dedent(f"""
+            Outbox pages of size 1 should contain offers {expected_ids}, but first page is
+            {first_page}, second page is {second_page}
+        """))
+
+    response = api.get_inbox_offers(token=recipient['token'], params={'state': 'unknown'})
+
+    assert response.status_code == HTTP_400_BAD_REQUEST, logger.error(textwrap.dedent(f"""
+        Invalid status code, should be {HTTP_400_BAD_REQUEST}, but equal {response.status_code}
+    """))
+
+
+def test_pending_offers_count():
+    sender, recipient = create_specialists(count=2, projects=2)
+    first_project_id, second_project_id = [project['id'] for project in sender['own_projects']]
+    offer = api.add_to_team(
+        data={'recipient_id': recipient['id'], 'project_id': first_project_id},
+        token=sender['token'],
+    ).data
+    api.give_ownership(
+        data={'recipient_id': recipient['id'], 'project_id': second_project_id},
+        token=sender['token'],
+    )
+
+    recipient_counters = api.get_pending_offers_count(token=recipient['token']).data
+    sender_counters = api.get_pending_offers_count(token=sender['token']).data
+
+    assert recipient_counters == {'inbox': 2, 'outbox': 0}, logger.error(textwrap.dedent(f"""
+        Recipient of 2 offers should have 2 pending inbox offers, but counters are
+        {recipient_counters}
+    """))
+
+    assert sender_counters == {'inbox': 0, 'outbox': 2}, logger.error(textwrap.dedent(f"""
+        Sender of 2 offers should have 2 pending outbox offers, but counters are {sender_counters}
+    """))
+
+    api.response_to_offer(id=offer['id'], data={'response': False}, token=recipient['token'])
+    api.response_to_offer(id=offer['id'], data={'response': False}, token=recipient['token'])
+    recipient_counters = api.get_pending_offers_count(token=recipient['token']).data
+
+    assert recipient_counters['inbox'] == 1, logger.error(textwrap.dedent(f"""
+        After declining one offer twice recipient should have 1 pending offer, but counters are
+        {recipient_counters}
+    """))
+
+    api.delete_project(id=second_project_id, token=sender['token'])
+    sender_counters = api.get_pending_offers_count(token=sender['token']).data
+
+    assert sender_counters['outbox'] == 0, logger.error(textwrap.dedent(f"""
+        After deletion of the offered project sender shouldn't have pending offers, but counters
+        are {sender_counters}
+    """))
+
+
+def test_offer_acceptance_is_applied_once():
+    sender, recipient = create_specialists(count=2, projects=1)
+    project_id = sender['own_projects'][0]['id']
+    data = {'recipient_id': recipient['id'], 'project_id': project_id}
+    offer = api.add_to_team(data=data, token=sender['token']).data
+
+    # both requests have read the offer while it was pending
+    first_read, second_read = [
+        Offer.objects.select_related('sender', 'recipient', 'project').get(pk=offer['id'])
+        for _ in range(2)
+    ]
+    ProjectTeam.objects.create(project_id=project_id, specialist_id=recipient['id'])
+    results = [accept_offer(offer=first_read), accept_offer(offer=second_read)]
+
+    assert results == [True, False], logger.error(textwrap.dedent(f"""
+        Only the first of two acceptances of the same offer should be applied, but results are
+        {results}
+    """))
+
+    team = api.get_project(id=project_id).data['team']
+    accepted = api.get_inbox_offers(token=recipient['token'], params={'state': 'accepted'}).data
+
+    assert [member['id'] for member in team] == [recipient['id']], logger.error(textwrap.dedent(f"""
+        Project team should contain recipient {recipient['id']} once, but equal {team}
+    """))
+
+    assert [offer['id'] for offer in accepted['results']] == [offer['id']], \
+        logger.error(textwrap.dedent(f"""
+            Accepted inbox should contain offer {offer['id']}, but contains {accepted['results']}
+        """))
+
+    response = api.response_to_offer(
+        id=offer['id'], data={'response': True}, token=recipient['token']
+    )
+
+    assert response.status_code == HTTP_400_BAD_REQUEST, logger.error(textwrap.dedent(f"""
+        Invalid status code of answered offer response, should be {HTTP_400_BAD_REQUEST}, but
+        equal {response.status_code}
+    """))
+
+    counters = api.get_pending_offers_count(token=recipient['token']).data
+
+    assert counters['inbox'] == 0, logger.error(textwrap.dedent(f"""
+        After acceptance recipient shouldn't have pending offers, but counters are {counters}
+    """))
+
+
+def test_accepted_offer_moves_team_member():
+    first_owner, second_owner, member = create_specialists(count=3, projects=1)
+    first_project_id = first_owner['own_projects'][0]['id']
+    second_project_id = second_owner['own_projects'][0]['id']
+    for owner, project_id in ((first_owner, first_project_id), (second_owner, second_project_id)):
+        offer = api.add_to_team(
+            data={'recipient_id': member['id'], 'project_id': project_id}, token=owner['token']
+        ).data
+        response = api.response_to_offer(
+            id=offer['id'], data={'response': True}, token=member['token']
+        )
+
+        assert response.status_code == HTTP_200_OK, logger.error(textwrap.dedent(f"""
+            Invalid status code, should be {HTTP_200_OK}, but equal {response.status_code}
+        """))
+
+    first_project = api.get_project(id=first_project_id).data
+    second_project = api.get_project(id=second_project_id).data
+    teams = {
+        project['id']: ([teammate['id'] for teammate in project['team']], project['team_count'])
+        for project in (first_project, second_project)
+    }
+    expected = {first_project_id: ([], 0), second_project_id: ([member['id']], 1)}
+
+    assert teams == expected, logger.error(textwrap.dedent(f"""
+        Member of another team should move to the new one, teams and counts should be
+        {expected}, but equal {teams}
+    """))
+
+    current_project = api.get_specialist(id=member['id']).data['current_project']
+
+    assert current_project['id'] == second_project_id, logger.error(textwrap.dedent(f"""
+        Member current project should be {second_project_id}, but equal {current_project['id']}
+    """))
@@ -0,0 +1,80 @@
+import json
+import textwrap
+
+from django.test import override_settings
+
+from tests.integration.api import API, CommittingAPIClient, api
+from tests.integration.config import logger
+from tests.integration.utils import create_specialists
+
+
+def _profiled_api() -> API:
+    'API client loading the middleware again, so it sees the overridden settings'
+    profiled_api = API()
+    profiled_api.client = CommittingAPIClient()
+    return profiled_api
+
+
+def _timings(header: str) -> dict[str, str]:
+    metrics = (metric.split(';') for metric in header.split(', '))
+    return {name: params for name, *params in metrics}
+
+
+def test_profiling_middleware(tmp_path):
+    owner, = create_specialists(count=1, projects=2)
+    log_file = tmp_path / 'profiling.log'
+
+    with override_settings(PROFILING_SAMPLE_RATE=1, PROFILING_TRACE_MEMORY=True,
+                           PROFILING_LOG_FILE=log_file):
+        profiled_api = _profiled_api()
+        projects_response = profiled_api.get_projects()
+        profiled_api.get_project(id=owner['own_projects'][0]['id'])
+
+    timings = _timings(projects_response['Server-Timing'])
+    records = [json.loads(line) for line in log_file.read_text().splitlines()]
+
+    assert timings.keys() == {'sql', 'serialize', 'render', 'total', 'alloc'}, \
+        logger.error(textwrap.dedent(f"""
+            Server-Timing should have sql, serialize, render, total and alloc metrics, but is
+            {projects_response['Server-Timing']}
+        """))
+
+    views = [(record['view'], record['status']) for record in records]
+
+    assert views == [('ProjectsListApiView', 200), ('ProjectRetrieveApiView', 200)], \
+        logger.error(textwrap.dedent(f"""
+            Profiling log should have a record of both requests, but has {records}
+        """))
+
+    sql_count = records[0]['sql_count']
+
+    assert sql_count and timings['sql'][0] == f'desc="{sql_count} queries"', \
+        logger.error(textwrap.dedent(f"""
+            Server-Timing and the log should count the same queries, but Server-Timing is
+            {timings['sql']} and the log counts {sql_count}
+        """))
+
+    assert all(record['serialize_ms'] > 0 and record['render_ms'] > 0 for record in records), \
+        logger.error(textwrap.dedent(f"""
+            Serializer and renderer time of both requests should be recorded, but records are
+            {records}
+        """))
+
+
+def test_profiling_middleware_threshold_and_sampling(tmp_path):
+    log_file = tmp_path / 'profiling.log'
+
+    with override_settings(PROFILING_SAMPLE_RATE=1, PROFILING_THRESHOLD_MS=10 ** 6,
+                           PROFILING_LOG_FILE=log_file):
+        response = _profiled_api().get_projects()
+
+    assert 'Server-Timing' in response and not log_file.read_text(), \
+        logger.error(textwrap.dedent("""
+            Requests faster than the threshold should get Server-Timing without being logged
+        """))
+
+    response = api.get_projects()
+
+    assert 'Server-Timing' not in response, logger.error(textwrap.dedent("""
+        Profiling should be off with the default settings
+    """))
@@ -1,15 +1,20 @@
 import copy
 import textwrap
 
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.status import (
     HTTP_200_OK,
     HTTP_201_CREATED,
+    HTTP_304_NOT_MODIFIED,
     HTTP_400_BAD_REQUEST,
     HTTP_403_FORBIDDEN,
     HTTP_404_NOT_FOUND,
 )
 
 from api.permissions import ERROR_MESSAGE
+from core.models import Language, Specialist
 from tests.integration.api import api
 from tests.integration.config import logger
 from tests.integration.utils import generate_project_data, create_specialists
@@ -17,7 +22,7 @@ from tests.integration.utils import generate_project_data, create_specialists
 
 def test_projects_list():
     response = api.get_projects()
-    projects_before_creation = response.data
+    projects_before_creation = response.data['results']
     response_code = response.status_code
 
     assert response_code == HTTP_200_OK, logger.error(textwrap.dedent(f"""
@@ -27,7 +32,7 @@ def test_projects_list():
     create_specialists(projects=1, private_projects=1)
 
     response = api.get_projects()
-    projects_after_creation = response.data
+    projects_after_creation = response.data['results']
     response_code = response.status_code
 
     assert response_code == HTTP_200_OK, logger.error(textwrap.dedent(f"""
@@ -41,6 +46,61 @@ def test_projects_list():
     """))
 
 
+def test_projects_list_query_count():
+    create_specialists(count=1, projects=1)
+    with CaptureQueriesContext(connection) as single_project_queries:
+        api.get_projects()
+
+    specialists = create_specialists(count=3)
+    for index, specialist in enumerate(specialists):
+        project = api.create_project(data=generate_project_data(name=f'counted {index}'),
+                                     token=specialist['token']).data
+        api.take_part(id=project['id'], token=specialist['token'])
+    with CaptureQueriesContext(connection) as many_projects_queries:
+        api.get_projects()
+
+    single_count, many_count = len(single_project_queries), len(many_projects_queries)
+
+    assert single_count == many_count, logger.error(textwrap.dedent(f"""
+        Projects list should cost a constant number of queries ({single_count}),
+        but cost {many_count} for more projects
+    """))
+
+
+def test_projects_list_pagination():
+    specialists = create_specialists(count=3)
+    for index, specialist in enumerate(specialists):
+        api.create_project(data=generate_project_data(name=f'paginated {index}'),
+                           token=specialist['token'])
+
+    for ordering in ('id', '-rating'):
+        response = api.get_projects(params={'page_size': 2, 'ordering': ordering})
+        page = response.data
+        received_ids = [project['id'] for project in page['results']]
+
+        assert len(page['results']) == 2, logger.error(textwrap.dedent(f"""
+            First page size should be 2, but equal {len(page['results'])}
+        """))
+
+        while page['next']:
+            page = api.get_page(url=page['next']).data
+            received_ids.extend(project['id'] for project in page['results'])
+
+        assert len(received_ids) == len(set(received_ids)) == 3, logger.error(textwrap.dedent(f"""
+            Walking pages with ordering {ordering} should return 3 distinct projects, but
+            received {received_ids}
+        """))
+
+
+def test_projects_list_with_invalid_cursor():
+    response = api.get_projects(params={'cursor': 'invalid'})
+    response_code = response.status_code
+
+    assert response_code == HTTP_404_NOT_FOUND, logger.error(textwrap.dedent(f"""
+        Invalid status code, should be {HTTP_404_NOT_FOUND}, but equal {response_code}
+    """))
+
+
 def test_retrieve_project():
     created_specialist = create_specialists(projects=1)[0]
     created_project_id = created_specialist['own_projects'][0]['id']
@@ -69,6 +129,81 @@ def test_retrieve_non_existent_project():
     """))
 
 
+def test_retrieve_project_conditional_get():
+    owner, member = create_specialists(count=2, projects=1)
+    project_id = owner['own_projects'][0]['id']
+    etag = api.get_project(id=project_id)['ETag']
+
+    api.client.credentials()
+    with CaptureQueriesContext(connection) as not_modified_queries:
+        response = api.get_project(id=project_id, headers={'HTTP_IF_NONE_MATCH': etag})
+
+    assert response.status_code == HTTP_304_NOT_MODIFIED, logger.error(textwrap.dedent(f"""
+        Invalid status code, should be {HTTP_304_NOT_MODIFIED}, but equal {response.status_code}
+    """))
+    assert len(not_modified_queries) == 1, logger.error(textwrap.dedent(f"""
+        Not modified project should cost 1 query, but cost {len(not_modified_queries)}
+    """))
+
+    changes = {
+        'project update': lambda: api.update_project(
+            id=project_id, data={'description': 'updated'}, token=owner['token']
+        ),
+        'languages': lambda: api.add_languages_to_project(
+            id=project_id, data={'languages': ['Python']}, token=owner['token']
+        ),
+        'owner update': lambda: api.update_specialist(
+            data={'github_nickname': 'updated owner'}, token=owner['token']
+        ),
+        'team': lambda: api.response_to_offer(
+            id=api.add_to_team(
+                data={'recipient_id': member['id'], 'project_id': project_id},
+                token=owner['token']
+            ).data['id'],
+            data={'response': True},
+            token=member['token']
+        ),
+        'team member update': lambda: api.update_specialist(
+            data={'direction': 'FRONTEND'}, token=member['token']
+        ),
+    }
+    for change, make_change in changes.items():
+        make_change()
+        response = api.get_project(id=project_id, headers={'HTTP_IF_NONE_MATCH': etag})
+
+        assert response.status_code == HTTP_200_OK, logger.error(textwrap.dedent(f"""
+            Project should be modified after {change}, but status code is {response.status_code}
+        """))
+        assert response['ETag'] != etag, logger.error(textwrap.dedent(f"""
+            Project ETag should change after {change}
+        """))
+        etag = response['ETag']
+
+
+def test_projects_list_conditional_get():
+    owner = create_specialists(projects=1)[0]
+    etag = api.get_projects()['ETag']
+    response = api.get_projects(headers={'HTTP_IF_NONE_MATCH': etag})
+
+    assert response.status_code == HTTP_304_NOT_MODIFIED, logger.error(textwrap.dedent(f"""
+        Invalid status code, should be {HTTP_304_NOT_MODIFIED}, but equal {response.status_code}
+    """))
+
+    response = api.get_projects(params={'ordering': '-id'}, headers={'HTTP_IF_NONE_MATCH': etag})
+
+    assert response.status_code == HTTP_200_OK, logger.error(textwrap.dedent(f"""
+        Projects list with other params should not match ETag {etag}
+    """))
+
+    api.create_project(data=generate_project_data(is_private=False), token=owner['token'])
+    response = api.get_projects(headers={'HTTP_IF_NONE_MATCH': etag})
+
+    assert response.status_code == HTTP_200_OK, logger.error(textwrap.dedent(f"""
+        Projects list should be modified after project creation, but status code is
+        {response.status_code}
+    """))
+
+
 def test_create_project():
     created_specialist = create_specialists()[0]
     data = generate_project_data()
@@ -170,6 +305,34 @@ def test_delete_project():
     """))
 
 
+def test_delete_project_changes_specialist_etags():
+    owner, member = create_specialists(count=2, projects=1)
+    project_id = owner['own_projects'][0]['id']
+    offer = api.join_to_team(
+        data={'recipient_id': owner['id'], 'project_id': project_id}, token=member['token']
+    ).data
+    api.response_to_offer(id=offer['id'], data={'response': True}, token=owner['token'])
+    etags = {pk: api.get_specialist(id=pk)['ETag'] for pk in (owner['id'], member['id'])}
+    list_etag = api.get_specialists()['ETag']
+
+    api.delete_project(id=project_id, token=owner['token'])
+
+    for pk, etag in etags.items():
+        response = api.get_specialist(id=pk, headers={'HTTP_IF_NONE_MATCH': etag})
+
+        assert response.status_code == HTTP_200_OK, logger.error(textwrap.dedent(f"""
+            Specialist {pk} of the deleted project should not match ETag {etag}, but
+            status code is {response.status_code}
+        """))
+
+    response = api.get_specialists(headers={'HTTP_IF_NONE_MATCH': list_etag})
+
+    assert response.status_code == HTTP_200_OK, logger.error(textwrap.dedent(f"""
+        Specialists list should not match ETag {list_etag} after project deletion, but
+        status code is {response.status_code}
+    """))
+
+
 def test_add_languages_to_project():
     created_specialist = create_specialists(projects=1)[0]
     project_id = created_specialist['own_projects'][0]['id']
@@ -349,3 +512,159 @@ def test_take_part_not_own_project():
         Error message after status code 403 should be {ERROR_MESSAGE.IS_PROJECT_OWNER}, 
         but equal {error_message}
     """))
+
+
+def test_matching_specialists():
+    owner, full_match, partial_match, no_match = create_specialists(count=4)
+    project = api.create_project(data=generate_project_data(), token=owner['token']).data
+    api.get_matching_specialists(id=project['id'])
+
+    api.add_languages_to_project(
+        id=project['id'], data={'languages': ['Python', 'Go']}, token=owner['token']
+    )
+    api.add_technologies_to_project(
+        id=project['id'], data={'technologies': ['Django']}, token=owner['token']
+    )
+    api.add_languages_to_specialist(
+        data={'languages': ['Python', 'Go']}, token=full_match['token']
+    )
+    api.add_technologies_to_specialist(
+        data={'technologies': ['Django']}, token=full_match['token']
+    )
+    api.add_languages_to_specialist(data={'languages': ['python']}, token=partial_match['token'])
+    api.add_languages_to_specialist(data={'languages': ['Rust']}, token=no_match['token'])
+
+    response = api.get_matching_specialists(id=project['id'])
+    response_code = response.status_code
+
+    assert response_code == HTTP_200_OK, logger.error(textwrap.dedent(f"""
+        Invalid status code, should be {HTTP_200_OK}, but equal {response_code}
+    """))
+
+    matches = [(specialist['id'], specialist['overlap']) for specialist in response.data]
+    expected_matches = [(full_match['id'], 3), (partial_match['id'], 1)]
+
+    assert matches == expected_matches, logger.error(textwrap.dedent(f"""
+        Matching specialists should be {expected_matches}, but equal {matches}
+    """))
+
+    api.remove_specialist_languages(data={'languages': ['Python']}, token=partial_match['token'])
+    matches = [specialist['id'] for specialist in
+               api.get_matching_specialists(id=project['id'], params={'limit': 5}).data]
+
+    assert matches == [full_match['id']], logger.error(textwrap.dedent(f"""
+        After removing the only matching language, matching specialists should be
+        {[full_match['id']]}, but equal {matches}
+    """))
+
+
+def test_matching_ignores_rolled_back_skills():
+    owner, specialist = create_specialists(count=2)
+    project = api.create_project(data=generate_project_data(), token=owner['token']).data
+    api.add_languages_to_project(
+        id=project['id'], data={'languages': ['Python']}, token=owner['token']
+    )
+    api.get_matching_specialists(id=project['id'])
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        try:
+            with transaction.atomic():
+                Specialist.objects.get(pk=specialist['id']).languages.add(
+                    Language.objects.get(name='Python')
+                )
+                raise RuntimeError('rolled back')
+        except RuntimeError:
+            pass
+    matches = api.get_matching_specialists(id=project['id']).data
+
+    assert matches == [], logger.error(textwrap.dedent(f"""
+        Rolled back languages should not match, but matching specialists are {matches}
+    """))
+
+
+def test_matching_specialists_for_non_existent_project():
+    response = api.get_matching_specialists(id=0)
+    response_code = response.status_code
+
+    assert response_code == HTTP_404_NOT_FOUND, logger.error(textwrap.dedent(f"""
+        Invalid status code, should be {HTTP_404_NOT_FOUND}, but equal {response_code}
+    """))
+
+
+def test_search_projects():
+    owner = create_specialists()[0]
+    descriptions = {
+        'search engine': 'Distributed crawler written in Rust',
+        'search ui': 'Frontend for the crawler dashboard',
+        'hidden search': 'Private crawler fork',
+        'unrelated': 'Game about dragons',
+    }
+    projects = {
+        name: api.create_project(
+            data=generate_project_data(name=name, description=description,
+                                       type='SERVICE', is_private=name == 'hidden search'),
+            token=owner['token']
+        ).data
+        for name, description in descriptions.items()
+    }
+
+    cases = (
+        ({'q': 'crawler'}, ['search engine', 'search ui']),
+        ({'q': 'crawl*'}, ['search engine', 'search ui']),
+        ({'q': '"written in rust"'}, ['search engine']),
+        ({'q': 'crawler', 'is_private': 'true'}, ['search engine', 'search ui']),
+        ({'q': 'crawler', 'type': 'library'}, []),
+        ({'q': 'dragon'}, []),
+    )
+    for params, expected_names in cases:
+        response = api.search_projects(params=params)
+        found_names = sorted(project['name'] for project in response.data['results'])
+
+        assert found_names == expected_names, logger.error(textwrap.dedent(f"""
+            Search with params {params} should find {expected_names}, but found {found_names}
+        """))
+
+    api.update_project(
+        id=projects['unrelated']['id'],
+        data={'description': 'Crawler for dragons'},
+        token=owner['token']
+    )
+    api.delete_project(id=projects['search ui']['id'], token=owner['token'])
+    found_names = sorted(project['name'] for project in
+                         api.search_projects(params={'q': 'crawler'}).data['results'])
+
+    assert found_names == ['search engine', 'unrelated'], logger.error(textwrap.dedent(f"""
+        Search after updating and deletion should find ['search engine', 'unrelated'], but found
+        {found_names}
+    """))
+
+
+def test_search_projects_pagination(monkeypatch):
+    owner = create_specialists()[0]
+    for index in range(5):
+        api.create_project(
+            data=generate_project_data(name=f'paged {index}', description='keyset search'),
+            token=owner['token']
+        )
+
+    for fts_available in (True, False):
+        monkeypatch.setattr('core.search.has_fts_index', lambda **kwargs: fts_available)
+        page = api.search_projects(params={'q': 'keyset', 'page_size': 2}).data
+        found_ids = [project['id'] for project in page['results']]
+        while page['next']:
+            page = api.get_page(url=page['next']).data
+            found_ids.extend(project['id'] for project in page['results'])
+
+        assert len(found_ids) == len(set(found_ids)) == 5, logger.error(textwrap.dedent(f"""
+            Walking search pages (fts {fts_available}) should return 5 distinct projects, but
+            returned {found_ids}
+        """))
+
+
+def test_search_projects_without_query():
+    response = api.search_projects(params={'q': '  '})
+    response_code = response.status_code
+
+    assert response_code == HTTP_400_BAD_REQUEST, logger.error(textwrap.dedent(f"""
+        Invalid status code, should be {HTTP_400_BAD_REQUEST}, but equal {response_code}
+    """))
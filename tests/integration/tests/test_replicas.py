@@ -0,0 +1,97 @@
+import textwrap
+
+import pytest
+from django.db import connections
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.replicas import _pins
+from core.models import PrimaryPin
+from core.routers import reset_replica_health, sync_sqlite_replicas
+from tests.integration.api import API
+from tests.integration.config import logger
+from tests.integration.utils import create_specialists, generate_project_data
+
+REPLICA = 'replica'
+
+
+@pytest.fixture
+def replica(tmp_path):
+    'SQLite file replica of the test database, synced by hand with sync_sqlite_replicas'
+    connections.settings[REPLICA] = {
+        **connections.settings['default'],
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    reset_replica_health()
+    with override_settings(DATABASE_REPLICAS=[REPLICA], REPLICA_HEALTH_CHECK_INTERVAL=0):
+        yield tmp_path / 'replica.sqlite3'
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+    reset_replica_health()
+
+
+def _api() -> API:
+    'API client loading the middleware again, so it sees the overridden settings'
+    replica_api = API()
+    replica_api.client = APIClient()
+    return replica_api
+
+
+def _project_names(response) -> set[str]:
+    return {project['name'] for project in response.data['results']}
+
+
+# the backup API cannot copy a database with a transaction open on the copying connection
+@pytest.mark.django_db(transaction=True)
+def test_replica_reads(replica):
+    writer_api, reader_api = _api(), _api()
+    owner, = create_specialists(count=1, projects=1)
+    replicated = owner['own_projects'][0]['name']
+    sync_sqlite_replicas()
+
+    project = writer_api.create_project(
+        data=generate_project_data(), token=owner['token']
+    ).data
+    reader_names = _project_names(reader_api.get_projects())
+
+    assert replicated in reader_names and project['name'] not in reader_names, \
+        logger.error(textwrap.dedent(f"""
+            Reads of other clients should go to the replica synced before {project['name']}
+            was created, but they got {reader_names}
+        """))
+
+    writer_names = _project_names(writer_api.get_projects())
+
+    assert project['name'] in writer_names, logger.error(textwrap.dedent(f"""
+        The client that has just written should read its writes from the primary, but got
+        {writer_names}
+    """))
+
+    reader_api.client.credentials(HTTP_AUTHORIZATION='Token ' + owner['token'])
+    # the pins of this process are not seen by the worker serving the read
+    _pins.clear()
+    token_names = _project_names(reader_api.get_projects())
+
+    assert project['name'] in token_names, logger.error(textwrap.dedent(f"""
+        A client without the pin cookie should be pinned by its token in every worker, but got
+        {token_names}
+    """))
+
+    PrimaryPin.objects.update(expires_at=timezone.now())
+    _pins.clear()
+    expired_names = _project_names(reader_api.get_projects())
+
+    assert project['name'] not in expired_names, logger.error(textwrap.dedent(f"""
+        Reads after the pin expired should go to the replica again, but got {expired_names}
+    """))
+
+    replica.unlink()
+    connections[REPLICA].close()
+    fallback_names = _project_names(_api().get_projects())
+
+    assert project['name'] in fallback_names, logger.error(textwrap.dedent(f"""
+        Reads should fall back to the primary when the replica is unhealthy, but got
+        {fallback_names}
+    """))
@@ -0,0 +1,104 @@
+import textwrap
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db.models import Count, F
+from rest_framework.status import HTTP_200_OK
+
+from core.models import Offer, Specialist
+from core.models.project import ProjectTeam
+from tests.integration.api import api
+from tests.integration.config import logger
+
+
+def _seed(prefix: str, seed: int) -> str:
+    output = StringIO()
+    call_command(
+        'seed_benchmark_data', '--specialists', '60', '--seed', str(seed), '--prefix', prefix,
+        '--directions', 'BACKEND:3,QA:1', '--projects-per-owner', '0:1,2:1',
+        '--team-size', '3:1', '--offers-per-specialist', '2', '--password', 'load-testing',
+        stdout=output,
+    )
+    return output.getvalue()
+
+
+def _shape(prefix: str) -> list[tuple]:
+    'Seeded graph without prefixes and ids, equal for equal seeds'
+    specialists = Specialist.objects.filter(nickname__startswith=prefix).order_by('id')
+    return [
+        (specialist.direction, specialist.rating,
+         sorted(specialist.languages.values_list('name', flat=True)),
+         specialist.own_projects.count(),
+         specialist.current_project and specialist.current_project.rating)
+        for specialist in specialists
+    ]
+
+
+def test_seed_benchmark_data():
+    output = _seed(prefix='first', seed=1)
+    _seed(prefix='second', seed=1)
+    _seed(prefix='third', seed=2)
+
+    assert _shape('first') == _shape('second') != _shape('third'), \
+        logger.error(textwrap.dedent("""
+            Graphs seeded with the same seed should be equal and differ from another seed
+        """))
+
+    assert 'Specialist: 60' in output and 'Offer: 120' in output, logger.error(textwrap.dedent(f"""
+        Seeding should report 60 specialists and 120 offers, but reported {output}
+    """))
+
+    directions = set(Specialist.objects.values_list('direction', flat=True))
+    projects_per_owner = set(
+        Specialist.objects.annotate(owned=Count('own_projects'))
+        .values_list('owned', flat=True)
+    )
+    largest_team = ProjectTeam.objects.values('project').annotate(size=Count('id')) \
+        .order_by('-size').values_list('size', flat=True).first()
+
+    assert directions == {'BACKEND', 'QA'}, logger.error(textwrap.dedent(f"""
+        Specialists should have only the configured directions, but have {directions}
+    """))
+
+    assert projects_per_owner == {0, 2}, logger.error(textwrap.dedent(f"""
+        Specialists should own 0 or 2 projects, but own {projects_per_owner}
+    """))
+
+    assert largest_team == 3, logger.error(textwrap.dedent(f"""
+        Teams should have up to 3 members, but the largest one has {largest_team}
+    """))
+
+    owner_sent = Offer.objects.filter(type__in=('ADD_TO_TEAM', 'GIVE_OWNERSHIP')) \
+        .exclude(sender=F('project__owner'))
+
+    assert not owner_sent.exists(), logger.error(textwrap.dedent("""
+        Adding to team and giving ownership offers should be sent by the project owner
+    """))
+
+    response = api.authenticate_specialist(data={'nickname': 'first0', 'password': 'load-testing'})
+
+    assert response.status_code == HTTP_200_OK, logger.error(textwrap.dedent(f"""
+        Seeded specialist should authenticate with the shared password, but status code is
+        {response.status_code}
+    """))
+
+    counters = api.get_pending_offers_count(token=response.data['token']).data
+    pending = Offer.objects.filter(recipient__nickname='first0', response__isnull=True).count()
+
+    assert counters['inbox'] == pending, logger.error(textwrap.dedent(f"""
+        Pending offers counter of seeded specialist should be {pending}, but counters are
+        {counters}
+    """))
+
+
+def test_seed_benchmark_data_rejects_invalid_options():
+    for options in (['--team-size', '1:x'], ['--directions', 'BACKEND'], ['--prefix', 'first']):
+        if options[1] == 'first':
+            _seed(prefix='first', seed=1)
+        try:
+            call_command('seed_benchmark_data', '--specialists', '5', *options, stdout=StringIO())
+        except CommandError:
+            continue
+        raise AssertionError(logger.error(textwrap.dedent(f"""
+            Seeding with {options} should fail with a command error
+        """)))
@@ -0,0 +1,133 @@
+import datetime
+import textwrap
+from decimal import Decimal
+
+from django.utils.translation import gettext_lazy
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer as PackageRenderer
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.settings import api_settings
+
+from api.renderers import CamelCaseJSONRenderer
+
+from api.serializers.project import ProjectSerializer
+from api.serializers.specialist import SpecialistSerializer
+from api.serializers.values import (
+    PROJECT_VALUES,
+    SPECIALIST_VALUES,
+    project_values,
+    serialize_projects,
+    serialize_specialists,
+    specialist_values,
+)
+from core.models import Project, Specialist
+from tests.integration.api import api
+from tests.integration.config import logger
+from tests.integration.utils import create_specialists, generate_creation_specialist_data
+
+
+def _create_graph() -> None:
+    owner, member, other = create_specialists(count=3, projects=2, private_projects=1)
+    api.create_specialist(data=generate_creation_specialist_data(born_date=None))
+    project_id = owner['own_projects'][0]['id']
+
+    api.add_languages_to_project(
+        id=project_id, data={'languages': ['Rust', 'C', 'Python']}, token=owner['token']
+    )
+    api.add_technologies_to_project(
+        id=project_id, data={'technologies': ['Redis', 'Django']}, token=owner['token']
+    )
+    api.add_languages_to_specialist(data={'languages': ['Go', 'C']}, token=member['token'])
+    api.add_technologies_to_specialist(data={'technologies': ['Vue']}, token=member['token'])
+
+    offer = api.add_to_team(
+        data={'recipient_id': member['id'], 'project_id': project_id}, token=owner['token']
+    ).data
+    api.response_to_offer(id=offer['id'], data={'response': True}, token=member['token'])
+    api.take_part(id=project_id, token=owner['token'])
+    api.give_ownership(
+        data={'recipient_id': other['id'], 'project_id': owner['own_projects'][1]['id']},
+        token=owner['token']
+    )
+
+
+def _render(data) -> bytes:
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return renderer.render(data)
+
+
+def test_projects_values_serialization_parity():
+    _create_graph()
+    projects = Project.objects.order_by('id')
+
+    expected = _render(ProjectSerializer(
+        ProjectSerializer.setup_eager_loading(projects), many=True
+    ).data)
+    received = _render(serialize_projects(list(projects.values(*PROJECT_VALUES))))
+
+    assert received == expected, logger.error(textwrap.dedent(f"""
+        Values based projects serialization should be {expected}, but equal {received}
+    """))
+
+
+def test_specialists_values_serialization_parity():
+    _create_graph()
+    specialists = Specialist.objects.order_by('id')
+
+    expected = _render(SpecialistSerializer(
+        SpecialistSerializer.setup_eager_loading(specialists), many=True
+    ).data)
+    received = _render(serialize_specialists(list(specialists.values(*SPECIALIST_VALUES))))
+
+    assert received == expected, logger.error(textwrap.dedent(f"""
+        Values based specialists serialization should be {expected}, but equal {received}
+    """))
+
+
+def test_sparse_fieldsets_serialization_parity():
+    _create_graph()
+    projects = Project.objects.order_by('id')
+    specialists = Specialist.objects.order_by('id')
+    cases = [
+        (ProjectSerializer, projects, serialize_projects, project_values,
+         ('id', 'name', 'rating')),
+        (ProjectSerializer, projects, serialize_projects, project_values,
+         ('start_date', 'team', 'owner', 'team_count')),
+        (SpecialistSerializer, specialists, serialize_specialists, specialist_values,
+         ('nickname', 'languages', 'current_project', 'age')),
+        (SpecialistSerializer, specialists, serialize_specialists, specialist_values,
+         ('own_projects', 'about')),
+    ]
+
+    for serializer, queryset, serialize, values, fields in cases:
+        expected = _render(serializer(
+            serializer.setup_eager_loading(queryset, fields), many=True, fields=fields
+        ).data)
+        received = _render(serialize(list(queryset.values(*values(fields))), fields))
+
+        assert received == expected, logger.error(textwrap.dedent(f"""
+            Values based serialization of {fields} should be {expected}, but equal {received}
+        """))
+
+
+def test_renderer_matches_camel_case_package():
+    _create_graph()
+    payloads = [
+        serialize_projects(list(Project.objects.order_by('id').values(*PROJECT_VALUES))),
+        serialize_specialists(list(Specialist.objects.order_by('id').values(*SPECIALIST_VALUES))),
+        {'non_field_errors': [ErrorDetail('Ünïcode\u2028 "quoted"', code='invalid')]},
+        {'detail': gettext_lazy('lazy text'), gettext_lazy('lazy_key'): (1, 2.5, None, True)},
+        {1: 'int key', 'snake_case_key': {'nested_key': Decimal('1.10')},
+         'born_date': datetime.date(2000, 1, 2),
+         'created_at': datetime.datetime(2000, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)},
+        {'big_number': 2 ** 70},
+        [],
+        None,
+    ]
+
+    for payload in payloads:
+        expected = PackageRenderer().render(payload)
+        received = CamelCaseJSONRenderer().render(payload)
+
+        assert received == expected, logger.error(textwrap.dedent(f"""
+            Rendered {payload} should be {expected}, but equal {received}
+        """))
@@ -1,25 +1,36 @@
 import copy
 import textwrap
+import time
+from datetime import timedelta
 
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
 from rest_framework.status import (
     HTTP_200_OK,
     HTTP_201_CREATED,
+    HTTP_304_NOT_MODIFIED,
     HTTP_400_BAD_REQUEST,
+    HTTP_401_UNAUTHORIZED,
     HTTP_404_NOT_FOUND,
 )
 
+from api.serializers.specialist import ages_changed_at
+from core.models import Specialist
 from tests.integration.api import api
 from tests.integration.config import logger, fake
 from tests.integration.utils import (
     generate_creation_specialist_data,
     generate_updating_specialist_data,
     create_specialists,
+    generate_project_data,
 )
 
 
 def test_specialists_list():
     response = api.get_specialists()
-    specialists_before_creation = response.data
+    specialists_before_creation = response.data['results']
     response_code = response.status_code
 
     assert response_code == HTTP_200_OK, logger.error(textwrap.dedent(f"""
@@ -27,7 +38,7 @@ def test_specialists_list():
     """))
 
     create_specialists()
-    specialists_after_creation = api.get_specialists().data
+    specialists_after_creation = api.get_specialists().data['results']
     diff = len(specialists_after_creation) - len(specialists_before_creation)
 
     assert diff == 1, logger.error(textwrap.dedent(f"""
@@ -35,6 +46,42 @@ def test_specialists_list():
     """))
 
 
+def test_specialists_list_pagination():
+    created_ids = sorted(specialist['id'] for specialist in create_specialists(count=5))
+    page = api.get_specialists(params={'page_size': 2}).data
+    received_ids = [specialist['id'] for specialist in page['results']]
+    while page['next']:
+        page = api.get_page(url=page['next']).data
+        received_ids.extend(specialist['id'] for specialist in page['results'])
+
+    assert received_ids == created_ids, logger.error(textwrap.dedent(f"""
+        Specialists received page by page should be {created_ids}, but equal {received_ids}
+    """))
+
+
+def test_specialists_list_query_count():
+    create_specialists(count=1, projects=1)
+    with CaptureQueriesContext(connection) as single_specialist_queries:
+        api.get_specialists()
+
+    specialists = create_specialists(count=3, projects=1)
+    owner, member = specialists[0], specialists[1]
+    offer = api.add_to_team(
+        data={'recipient_id': member['id'], 'project_id': owner['own_projects'][0]['id']},
+        token=owner['token']
+    ).data
+    api.response_to_offer(id=offer['id'], data={'response': True}, token=member['token'])
+    with CaptureQueriesContext(connection) as many_specialists_queries:
+        api.get_specialists()
+
+    single_count, many_count = len(single_specialist_queries), len(many_specialists_queries)
+
+    assert single_count == many_count, logger.error(textwrap.dedent(f"""
+        Specialists list should cost a constant number of queries ({single_count}),
+        but cost {many_count} for more specialists
+    """))
+
+
 def test_retrieve_specialist():
     created_specialist = create_specialists()[0]
     specialist_id = created_specialist['id']
@@ -62,6 +109,86 @@ def test_retrieve_non_existent_specialist():
     """))
 
 
+def test_retrieve_specialist_conditional_get():
+    specialist, other = create_specialists(count=2, projects=1)
+    project_id = specialist['own_projects'][0]['id']
+    etag = api.get_specialist(id=specialist['id'])['ETag']
+
+    api.client.credentials()
+    with CaptureQueriesContext(connection) as not_modified_queries:
+        response = api.get_specialist(
+            id=specialist['id'], headers={'HTTP_IF_NONE_MATCH': etag}
+        )
+
+    assert response.status_code == HTTP_304_NOT_MODIFIED, logger.error(textwrap.dedent(f"""
+        Invalid status code, should be {HTTP_304_NOT_MODIFIED}, but equal {response.status_code}
+    """))
+    assert len(not_modified_queries) == 1, logger.error(textwrap.dedent(f"""
+        Not modified specialist should cost 1 query, but cost {len(not_modified_queries)}
+    """))
+
+    changes = {
+        'specialist update': lambda: api.update_specialist(
+            data={'about': 'updated'}, token=specialist['token']
+        ),
+        'technologies': lambda: api.add_technologies_to_specialist(
+            data={'technologies': ['Django']}, token=specialist['token']
+        ),
+        'own project update': lambda: api.update_project(
+            id=project_id, data={'version': '2.0'}, token=specialist['token']
+        ),
+        'current project': lambda: api.take_part(id=project_id, token=specialist['token']),
+        'ownership': lambda: api.response_to_offer(
+            id=api.give_ownership(
+                data={'recipient_id': other['id'], 'project_id': project_id},
+                token=specialist['token']
+            ).data['id'],
+            data={'response': True},
+            token=other['token']
+        ),
+    }
+    for change, make_change in changes.items():
+        make_change()
+        response = api.get_specialist(id=specialist['id'], headers={'HTTP_IF_NONE_MATCH': etag})
+
+        assert response.status_code == HTTP_200_OK, logger.error(textwrap.dedent(f"""
+            Specialist should be modified after {change}, but status code is
+            {response.status_code}
+        """))
+        assert response['ETag'] != etag, logger.error(textwrap.dedent(f"""
+            Specialist ETag should change after {change}
+        """))
+        etag = response['ETag']
+
+
+def test_specialists_list_conditional_get(monkeypatch):
+    create_specialists()
+    etag = api.get_specialists()['ETag']
+    response = api.get_specialists(headers={'HTTP_IF_NONE_MATCH': etag})
+
+    assert response.status_code == HTTP_304_NOT_MODIFIED, logger.error(textwrap.dedent(f"""
+        Invalid status code, should be {HTTP_304_NOT_MODIFIED}, but equal {response.status_code}
+    """))
+
+    next_day = ages_changed_at() + timedelta(days=1)
+    monkeypatch.setattr('api.views.specialist.ages_changed_at', lambda: next_day)
+    response = api.get_specialists(headers={'HTTP_IF_NONE_MATCH': etag})
+
+    assert response.status_code == HTTP_200_OK, logger.error(textwrap.dedent(f"""
+        Specialists list should be modified on the next day as ages may change, but status code
+        is {response.status_code}
+    """))
+
+    etag = response['ETag']
+    create_specialists()
+    response = api.get_specialists(headers={'HTTP_IF_NONE_MATCH': etag})
+
+    assert response.status_code == HTTP_200_OK, logger.error(textwrap.dedent(f"""
+        Specialists list should be modified after specialist creation, but status code is
+        {response.status_code}
+    """))
+
+
 def test_create_specialist():
     data = generate_creation_specialist_data()
     response = api.create_specialist(data=data)
@@ -212,6 +339,58 @@ def test_delete_specialist():
     """))
 
 
+def test_cached_token_authentication():
+    created_specialist = create_specialists()[0]
+    token = created_specialist['token']
+    api.add_languages_to_specialist(data={'languages': ['Python']}, token=token)
+
+    with CaptureQueriesContext(connection) as cached_queries:
+        api.add_languages_to_specialist(data={'languages': ['Go']}, token=token)
+    token_queries = [query['sql'] for query in cached_queries if 'authtoken_token' in query['sql']]
+
+    assert not token_queries, logger.error(textwrap.dedent(f"""
+        Authentication with a cached token should not query tokens, but executed {token_queries}
+    """))
+
+
+def test_cached_token_revoked_by_another_process(monkeypatch):
+    created_specialist = create_specialists()[0]
+    token = created_specialist['token']
+    api.add_languages_to_specialist(data={'languages': ['Python']}, token=token)
+    # a raw delete sends no signals, like a deletion made by another worker process
+    Token.objects.filter(key=token)._raw_delete(Token.objects.db)
+    expired_at = time.monotonic() + settings.TOKEN_CACHE_TTL + 1
+    monkeypatch.setattr('core.token_cache.time.monotonic', lambda: expired_at)
+    response = api.add_languages_to_specialist(data={'languages': ['Go']}, token=token)
+
+    assert response.status_code == HTTP_401_UNAUTHORIZED, logger.error(textwrap.dedent(f"""
+        Token revoked by another process should be rejected after {settings.TOKEN_CACHE_TTL}
+        seconds, but returned {response.status_code}
+    """))
+
+
+def test_cached_token_after_specialist_changes():
+    created_specialist = create_specialists()[0]
+    token = created_specialist['token']
+    new_nickname = generate_creation_specialist_data()['nickname']
+
+    api.update_specialist(data={'nickname': new_nickname}, token=token)
+    response = api.create_project(data=generate_project_data(), token=token)
+
+    assert response.status_code == HTTP_201_CREATED, logger.error(textwrap.dedent(f"""
+        Authenticated specialist should be refreshed after update, but project creation returned
+        {response.status_code}
+    """))
+
+    api.delete_specialist(token=token)
+    response = api.update_specialist(data={'about': 'deleted'}, token=token)
+
+    assert response.status_code == HTTP_401_UNAUTHORIZED, logger.error(textwrap.dedent(f"""
+        Token of deleted specialist should be rejected with {HTTP_401_UNAUTHORIZED}, but
+        returned {response.status_code}
+    """))
+
+
 def test_add_languages_to_specialist():
     created_specialist = create_specialists()[0]
     languages_for_adding = api.get_languages().data
@@ -236,6 +415,39 @@ def test_add_languages_to_specialist():
     """))
 
 
+def test_add_languages_to_specialist_query_count():
+    first_specialist, second_specialist = create_specialists(count=2)
+    languages = api.get_languages().data
+
+    with CaptureQueriesContext(connection) as single_language_queries:
+        api.add_languages_to_specialist(
+            data={'languages': languages[:1]},
+            token=first_specialist['token']
+        )
+
+    bulk_languages = [language.upper() for language in languages] \
+        + [f'unknown language {index}' for index in range(300)]
+    with CaptureQueriesContext(connection) as bulk_languages_queries:
+        api.add_languages_to_specialist(
+            data={'languages': bulk_languages},
+            token=second_specialist['token']
+        )
+
+    single_count, bulk_count = len(single_language_queries), len(bulk_languages_queries)
+
+    assert single_count == bulk_count, logger.error(textwrap.dedent(f"""
+        Adding {len(bulk_languages)} languages should cost as many queries as adding one
+        ({single_count}), but cost {bulk_count}
+    """))
+
+    languages_after_adding = api.get_specialist(id=second_specialist['id']).data['languages']
+
+    assert languages_after_adding == languages, logger.error(textwrap.dedent(f"""
+        Specialist languages after case insensitive adding should be {languages}, but equal
+        {languages_after_adding}
+    """))
+
+
 def test_remove_specialist_languages():
     created_specialist = create_specialists()[0]
     auth_token = created_specialist['token']
@@ -325,3 +537,73 @@ def test_remove_specialist_technologies():
             Remaining technologies after removing should be {expected_technologies_after_removing}, 
             but remain {technologies_after_removing}     
         """))
+
+
+def test_matching_projects():
+    specialist, owner = create_specialists(count=2)
+    api.add_languages_to_specialist(data={'languages': ['Rust', 'C']}, token=specialist['token'])
+
+    projects = [
+        api.create_project(data=generate_project_data(name=f'matching {index}', is_private=False),
+                           token=owner['token']).data
+        for index in range(3)
+    ]
+    private_project = api.create_project(
+        data=generate_project_data(name='matching private', is_private=True),
+        token=owner['token']
+    ).data
+    for project, languages in zip(projects + [private_project],
+                                  (['Rust'], ['Rust', 'C'], ['Java'], ['Rust', 'C'])):
+        api.add_languages_to_project(
+            id=project['id'], data={'languages': languages}, token=owner['token']
+        )
+
+    response = api.get_matching_projects(id=specialist['id'])
+    matches = [(project['id'], project['overlap']) for project in response.data]
+    expected_matches = [(projects[1]['id'], 2), (projects[0]['id'], 1)]
+
+    assert matches == expected_matches, logger.error(textwrap.dedent(f"""
+        Matching public projects should be {expected_matches}, but equal {matches}
+    """))
+
+    response = api.get_matching_projects(id=specialist['id'], params={'type': 'unknown'})
+    response_code = response.status_code
+
+    assert response_code == HTTP_400_BAD_REQUEST, logger.error(textwrap.dedent(f"""
+        Invalid status code, should be {HTTP_400_BAD_REQUEST}, but equal {response_code}
+    """))
+
+
+def test_search_specialists():
+    first, second = create_specialists(count=2)
+    api.update_specialist(
+        data={'about': 'Embedded developer, loves microcontrollers', 'direction': 'EMBEDDED'},
+        token=first['token']
+    )
+    api.update_specialist(
+        data={'about': 'Backend developer', 'direction': 'BACKEND'}, token=second['token']
+    )
+
+    cases = (
+        ({'q': 'developer'}, sorted([first['id'], second['id']])),
+        ({'q': 'micro*'}, [first['id']]),
+        ({'q': 'developer', 'direction': 'backend'}, [second['id']]),
+        ({'q': first['nickname']}, [first['id']]),
+    )
+    for params, expected_ids in cases:
+        response = api.search_specialists(params=params)
+        found_ids = sorted(specialist['id'] for specialist in response.data['results'])
+
+        assert found_ids == expected_ids, logger.error(textwrap.dedent(f"""
+            Search with params {params} should find {expected_ids}, but found {found_ids}
+        """))
+
+    Specialist.objects.filter(pk=second['id']).update(is_private=True)
+    found_ids = [
+        specialist['id'] for specialist in
+        api.search_specialists(params={'q': 'developer', 'is_private': 'true'}).data['results']
+    ]
+
+    assert found_ids == [first['id']], logger.error(textwrap.dedent(f"""
+        Private specialists should never be found, but search found {found_ids}
+    """))
@@ -1,10 +1,13 @@
 import textwrap
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.status import HTTP_200_OK
 
 from tests.integration.api import api
 from tests.integration.config import logger
 from core.data_migration.const import LANGUAGES, TECHNOLOGIES
+from core.models import Language
 
 
 def test_languages():
@@ -31,3 +34,43 @@ def test_technologies():
     assert tuple(response.data) == TECHNOLOGIES, logger.error(textwrap.dedent(f"""
         Received technologies should be {TECHNOLOGIES}, but equal {response.data}
     """))
+
+
+def test_catalog_served_without_queries():
+    api.get_languages()
+    api.get_technologies()
+
+    with CaptureQueriesContext(connection) as queries:
+        languages_response = api.get_languages()
+        technologies_response = api.get_technologies()
+
+    assert len(queries) == 0, logger.error(textwrap.dedent(f"""
+        Cached catalog should be served without queries, but {len(queries)} were executed
+    """))
+
+    assert languages_response.json() == list(LANGUAGES), logger.error(textwrap.dedent(f"""
+        Prerendered languages should be {LANGUAGES}, but equal {languages_response.content}
+    """))
+
+    assert technologies_response.json() == list(TECHNOLOGIES), logger.error(textwrap.dedent(f"""
+        Prerendered technologies should be {TECHNOLOGIES}, but equal
+        {technologies_response.content}
+    """))
+
+
+def test_catalog_invalidation():
+    api.get_languages()
+    language = Language.objects.create(name='Zig')
+    languages_after_creation = api.get_languages().data
+
+    assert languages_after_creation[-1] == 'Zig', logger.error(textwrap.dedent(f"""
+        Created language Zig should be the last one, but languages equal
+        {languages_after_creation}
+    """))
+
+    language.delete()
+    languages_after_deletion = api.get_languages().data
+
+    assert tuple(languages_after_deletion) == LANGUAGES, logger.error(textwrap.dedent(f"""
+        Languages after deletion should be {LANGUAGES}, but equal {languages_after_deletion}
+    """))
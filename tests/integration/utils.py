@@ -6,7 +6,7 @@ from tests.integration.config import fake
 
 
 def generate_creation_specialist_data(**kwargs) -> dict:
-    nickname = fake.user_name()
+    nickname = fake.unique.user_name()
     return {
         'nickname': nickname,
         'github_nickname': nickname,
@@ -24,8 +24,8 @@ def generate_creation_specialist_data(**kwargs) -> dict:
 
 def generate_updating_specialist_data(**kwargs) -> dict:
     return {
-        'nickname': fake.user_name(),
-        'github_nickname': fake.user_name(),
+        'nickname': fake.unique.user_name(),
+        'github_nickname': fake.unique.user_name(),
         'direction': choice(Direction.values),
         'email': fake.email(),
         'born_date': fake.date(),
@@ -38,7 +38,8 @@ def generate_updating_specialist_data(**kwargs) -> dict:
 
 
 def generate_project_data(**kwargs) -> dict:
-    project_name = fake.project()
+    # project names are unique, the provider has a handful of them
+    project_name = f'{fake.project()} {fake.unique.random_int(max=10 ** 6)}'
     return {
         'name': project_name,
         'github_name': project_name,